@@ -1,12 +1,18 @@
 from django.contrib import admin
 
 from core.models import (
+    AgentRun,
     AutoSubmissionSetting,
     BlogPost,
     BlogPostTitleSuggestion,
     GeneratedBlogPost,
+    KeywordMetricsRefresh,
     Profile,
+    ProfileAgentUsage,
     Project,
+    UpstreamUsage,
+    Workflow,
+    WorkflowNode,
 )
 
 admin.site.register(Profile)
@@ -15,3 +21,78 @@ admin.site.register(Project)
 admin.site.register(BlogPostTitleSuggestion)
 admin.site.register(GeneratedBlogPost)
 admin.site.register(AutoSubmissionSetting)
+admin.site.register(KeywordMetricsRefresh)
+
+
+@admin.register(UpstreamUsage)
+class UpstreamUsageAdmin(admin.ModelAdmin):
+    list_display = (
+        "bucket_start",
+        "upstream",
+        "source",
+        "project",
+        "calls",
+        "error_rate_display",
+        "average_latency_ms",
+        "latency_p50_ms",
+        "latency_p95_ms",
+        "credits_used",
+        "input_tokens",
+        "output_tokens",
+    )
+    list_filter = ("upstream", "source")
+    search_fields = ("project__name", "profile__user__email")
+    date_hierarchy = "bucket_start"
+    list_select_related = ("project",)
+    raw_id_fields = ("project", "profile")
+
+    @admin.display(description="Error rate")
+    def error_rate_display(self, obj):
+        return f"{obj.error_rate:.1%}"
+
+
+@admin.register(AgentRun)
+class AgentRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "function_name",
+        "model_name",
+        "llm_model",
+        "project",
+        "request_tokens",
+        "response_tokens",
+        "cost",
+        "duration_ms",
+        "succeeded",
+    )
+    list_filter = ("llm_model", "model_name", "function_name", "succeeded")
+    search_fields = ("project__name", "profile__user__email")
+    date_hierarchy = "created_at"
+    list_select_related = ("project",)
+    raw_id_fields = ("project", "profile")
+
+
+@admin.register(ProfileAgentUsage)
+class ProfileAgentUsageAdmin(admin.ModelAdmin):
+    list_display = ("month", "profile", "runs", "request_tokens", "response_tokens", "cost")
+    search_fields = ("profile__user__email",)
+    date_hierarchy = "month"
+    list_select_related = ("profile__user",)
+    raw_id_fields = ("profile",)
+
+
+class WorkflowNodeInline(admin.TabularInline):
+    model = WorkflowNode
+    extra = 0
+    fields = ("key", "func", "status", "started_at", "finished_at", "lease_expires_at", "message")
+    readonly_fields = fields
+
+
+@admin.register(Workflow)
+class WorkflowAdmin(admin.ModelAdmin):
+    list_display = ("project", "kind", "status", "max_concurrency", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    search_fields = ("project__name",)
+    list_select_related = ("project",)
+    raw_id_fields = ("project",)
+    inlines = [WorkflowNodeInline]
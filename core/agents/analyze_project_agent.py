@@ -1,16 +1,13 @@
 from pydantic_ai import Agent, RunContext
 
+from core.prompts import ANALYZE_PROJECT_SYSTEM_PROMPT
 from core.schemas import ProjectDetails, WebPageContent
 
 analyze_project_agent = Agent(
     "google-gla:gemini-2.5-flash",
     output_type=ProjectDetails,
     deps_type=WebPageContent,
-    system_prompt=(
-        "You are an expert content analyzer. Based on the content provided, "
-        "extract and infer the requested information. Make reasonable inferences based "
-        "on available content, context, and industry knowledge."
-    ),
+    system_prompt=ANALYZE_PROJECT_SYSTEM_PROMPT,
     retries=2,
 )
 
@@ -22,5 +19,5 @@ def add_webpage_content(ctx: RunContext[WebPageContent]) -> str:
         f"Title: {ctx.deps.title}"
         f"Description: {ctx.deps.description}"
         f"Content: {ctx.deps.markdown_content}"
-        f"HTML Content: {ctx.deps.html_content}"
+        f"\nPage structure (from the HTML):\n{ctx.deps.html_content}"
     )
@@ -0,0 +1,23 @@
+from pydantic_ai import Agent, RunContext
+
+from core.prompts import ANALYZE_PROJECT_PAGE_SYSTEM_PROMPT
+from core.schemas import ProjectPageDetails, WebPageContent
+
+analyze_project_page_agent = Agent(
+    "google-gla:gemini-2.5-flash",
+    output_type=ProjectPageDetails,
+    deps_type=WebPageContent,
+    system_prompt=ANALYZE_PROJECT_PAGE_SYSTEM_PROMPT,
+    retries=2,
+)
+
+
+@analyze_project_page_agent.system_prompt
+def add_webpage_content(ctx: RunContext[WebPageContent]) -> str:
+    return (
+        "Web page content:"
+        f"Title: {ctx.deps.title}"
+        f"Description: {ctx.deps.description}"
+        f"Content: {ctx.deps.markdown_content}"
+        f"\nPage structure (from the HTML):\n{ctx.deps.html_content}"
+    )
@@ -0,0 +1,16 @@
+from pydantic_ai import Agent, RunContext
+
+from core.prompts import EXTRACT_COMPETITORS_SYSTEM_PROMPT
+from core.schemas import CompetitorDetails
+
+extract_competitors_agent = Agent(
+    "google-gla:gemini-2.5-flash",
+    output_type=list[CompetitorDetails],
+    system_prompt=EXTRACT_COMPETITORS_SYSTEM_PROMPT,
+    retries=2,
+)
+
+
+@extract_competitors_agent.system_prompt
+def add_competitors(ctx: RunContext[list[CompetitorDetails]]) -> str:
+    return f"Here are the competitors: {ctx.deps}"
@@ -0,0 +1,15 @@
+from pydantic_ai import Agent, RunContext
+
+from core.prompts import EXTRACT_LINKS_SYSTEM_PROMPT
+
+extract_links_agent = Agent(
+    "google-gla:gemini-2.5-flash",
+    output_type=list[str],
+    system_prompt=EXTRACT_LINKS_SYSTEM_PROMPT,
+    retries=2,
+)
+
+
+@extract_links_agent.system_prompt
+def add_links(ctx: RunContext[list[str]]) -> str:
+    return f"Links: {ctx.deps}"
@@ -0,0 +1,78 @@
+from django.conf import settings
+from pydantic_ai import Agent, RunContext
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from core.schemas import ProjectDetails
+
+find_competitors_agent = Agent(
+    OpenAIModel(
+        "sonar",
+        provider=OpenAIProvider(
+            base_url="https://api.perplexity.ai",
+            api_key=settings.PERPLEXITY_API_KEY,
+        ),
+    ),
+    deps_type=ProjectDetails,
+    output_type=str,
+    system_prompt="""
+        You are a helpful assistant that helps me find competitors for my project.
+    """,
+    retries=2,
+)
+
+
+@find_competitors_agent.system_prompt
+def add_project_details(ctx: RunContext[ProjectDetails]) -> str:
+    project = ctx.deps
+    return f"""I'm working on a project which has the following attributes:
+        Name:
+        {project.name}
+
+        Summary:
+        {project.summary}
+
+        Key Features:
+        {project.key_features}
+
+        Target Audience:
+        {project.target_audience_summary}
+
+        Pain Points Addressed:
+        {project.pain_points}
+
+        Language: {project.language}
+    """
+
+
+@find_competitors_agent.system_prompt
+def required_data() -> str:
+    return "Make sure that each competitor has a name, url, and description."
+
+
+@find_competitors_agent.system_prompt
+def number_of_competitors() -> str:
+    return "Give me a list of at least 20 competitors."
+
+
+@find_competitors_agent.system_prompt
+def language_specification(ctx: RunContext[ProjectDetails]) -> str:
+    project = ctx.deps
+    return f"""
+        IMPORTANT: Be mindful that competitors are likely to speak in
+        {project.language} language.
+    """
+
+
+@find_competitors_agent.system_prompt
+def location_specification(ctx: RunContext[ProjectDetails]) -> str:
+    project = ctx.deps
+    if project.location != "Global":
+        return f"""
+            IMPORTANT: Only return competitors whose target audience is in
+            {project.location}.
+        """
+    else:
+        return """
+            IMPORTANT: Return competitors from all over the world.
+        """
@@ -0,0 +1,19 @@
+from pydantic_ai import Agent, RunContext
+
+from core.schemas import BlogPostMetadata, BlogPostMetadataContext
+
+generate_blog_post_metadata_agent = Agent(
+    "google-gla:gemini-2.5-flash",
+    output_type=BlogPostMetadata,
+    deps_type=BlogPostMetadataContext,
+    system_prompt=(
+        "You are an SEO expert. Based on the blog post provided, write its meta description, "
+        "URL slug and tags. Use the language the post is written in."
+    ),
+    retries=2,
+)
+
+
+@generate_blog_post_metadata_agent.system_prompt
+def add_blog_post(ctx: RunContext[BlogPostMetadataContext]) -> str:
+    return f"Title: {ctx.deps.title}\nContent:\n{ctx.deps.content}"
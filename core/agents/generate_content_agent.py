@@ -0,0 +1,149 @@
+from django.utils import timezone
+from pydantic_ai import Agent, RunContext
+
+from core.choices import ContentType
+from core.prompts import GENERATE_CONTENT_SYSTEM_PROMPTS
+from core.schemas import BlogPostContent, BlogPostGenerationContext
+
+
+def create_generate_content_agent(content_type, output_type=BlogPostContent):  # noqa: C901
+    agent = Agent(
+        "google-gla:gemini-2.5-flash",
+        output_type=output_type,
+        deps_type=BlogPostGenerationContext,
+        system_prompt=GENERATE_CONTENT_SYSTEM_PROMPTS[content_type],
+        retries=2,
+        model_settings={"max_tokens": 65500, "temperature": 0.8},
+    )
+
+    @agent.system_prompt
+    def add_todays_date() -> str:
+        return f"Today's Date: {timezone.now().strftime('%Y-%m-%d')}"
+
+    @agent.system_prompt
+    def add_project_details(ctx: RunContext[BlogPostGenerationContext]) -> str:
+        project = ctx.deps.project_details
+        return f"""
+            Project Details:
+            - Project Name: {project.name}
+            - Project Type: {project.type}
+            - Project Summary: {project.summary}
+            - Blog Theme: {project.blog_theme}
+            - Founders: {project.founders}
+            - Key Features: {project.key_features}
+            - Target Audience: {project.target_audience_summary}
+            - Pain Points: {project.pain_points}
+            - Product Usage: {project.product_usage}
+        """
+
+    @agent.system_prompt
+    def add_project_pages(ctx: RunContext[BlogPostGenerationContext]) -> str:
+        pages = ctx.deps.project_pages
+        if pages:
+            instruction = """
+              Below is the list of page this project has. Can you insert them into
+              the content you are about to generate where it makes sense.\n
+            """
+            for page in pages:
+                instruction += f"""
+                  --------
+                  - Title: {page.title}
+                  - URL: {page.url}
+                  - Description: {page.description}
+                  - Summary: {page.summary}
+                  --------
+                """
+            return instruction
+        else:
+            return ""
+
+    @agent.system_prompt
+    def add_title_details(ctx: RunContext[BlogPostGenerationContext]) -> str:
+        title = ctx.deps.title_suggestion
+        return f"""
+            This is the title suggestion gnerate by AI using project information:
+            - Title: {title.title}
+            - Description: {title.description}
+            - Category: {title.category}
+            - Target Keywords: {
+            ", ".join(title.target_keywords) if title.target_keywords else "None specified"
+        }
+            - Suggested Meta Description: {
+            title.suggested_meta_description
+            if title.suggested_meta_description
+            else "None specified"
+        }
+        """
+
+    @agent.system_prompt
+    def add_language_specification(ctx: RunContext[BlogPostGenerationContext]) -> str:
+        return f"""
+            IMPORTANT: Generate the content in {ctx.deps.project_details.language} language.
+            Make sure the content is grammatically correct and culturally appropriate for
+            {ctx.deps.project_details.language}-speaking audiences.
+        """
+
+    @agent.system_prompt
+    def add_target_keywords(ctx: RunContext[BlogPostGenerationContext]) -> str:
+        if ctx.deps.project_keywords:
+            keywords_list = ", ".join(ctx.deps.project_keywords)
+            return f"""
+                Focus Keywords for SEO
+                The user wants to focus on these specific keywords in the blog post:
+                {keywords_list}
+
+                Please incorporate these keywords naturally throughout the content where appropriate.
+                Don't force them in, but use them when they fit contextually and help improve the readability and SEO value of the post.
+            """  # noqa: E501
+        else:
+            return ""
+
+    @agent.system_prompt
+    def valid_markdown_format() -> str:
+        return """
+            IMPORTANT: Generate the content in valid markdown format.
+            Make sure the content is formatted correctly with:
+              - headings
+              - paragraphs
+              - lists
+              - links
+        """
+
+    @agent.system_prompt
+    def post_structure() -> str:
+        return """
+            - Don't start with a title, header or a subheader (#, ##, ###). Instead start with a plain text as intro.
+            - Use '##' (h2 headers) for sections of the post where necessary.
+            - Don't use 3rd levle subheaders (###) or deeper. That should not be necessary for the post.
+        """  # noqa: E501
+
+    @agent.system_prompt
+    def filler_content() -> str:
+        return """
+            - Do not add content that needs to be filled in later.
+            - No placeholders either. This means no:
+              - Image Suggestion: [Image]
+              - Link Suggestion: [Link]
+              ...
+         """
+
+    if output_type is str:
+
+        @agent.system_prompt
+        def text_output() -> str:
+            return """
+                - Reply with the markdown of the post only, without any preamble or code fences.
+            """
+
+    return agent
+
+
+generate_content_agents = {
+    content_type: create_generate_content_agent(content_type) for content_type in ContentType
+}
+
+# Plain text output is streamed token by token, structured output arrives as one tool call
+generate_content_text_agents = {
+    content_type: create_generate_content_agent(content_type, output_type=str)
+    for content_type in ContentType
+}
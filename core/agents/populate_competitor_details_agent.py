@@ -0,0 +1,17 @@
+from pydantic_ai import Agent, RunContext
+
+from core.prompts import POPULATE_COMPETITOR_DETAILS_SYSTEM_PROMPT
+from core.schemas import CompetitorDetails, WebPageContent
+
+populate_competitor_details_agent = Agent(
+    "google-gla:gemini-2.5-flash",
+    output_type=CompetitorDetails,
+    deps_type=WebPageContent,
+    system_prompt=POPULATE_COMPETITOR_DETAILS_SYSTEM_PROMPT,
+    retries=2,
+)
+
+
+@populate_competitor_details_agent.system_prompt
+def add_webpage_content(ctx: RunContext[WebPageContent]) -> str:
+    return f"Web page content:Content: {ctx.deps.markdown_content}"
@@ -32,6 +32,16 @@ class ProjectScanOut(Schema):
     type: str = ""
     url: str = ""
     summary: str = ""
+    job_id: str = ""
+
+
+class JobOut(Schema):
+    id: str
+    kind: str
+    status: str
+    stage: str = ""
+    message: str = ""
+    result: dict = {}
 
 
 class GenerateTitleSuggestionsIn(Schema):
@@ -82,6 +92,13 @@ class UpdateArchiveStatusIn(Schema):
     archived: bool
 
 
+class TitleSuggestionsPageOut(Schema):
+    status: str
+    html: str = ""
+    next_after_id: int | None = None
+    message: str = ""
+
+
 class AddPricingPageIn(Schema):
     project_id: int
     url: str
@@ -117,6 +134,7 @@ class CompetitorAnalysisOut(Schema):
     key_features: str | None = None
     key_benefits: str | None = None
     key_drawbacks: str | None = None
+    job_id: str | None = None
 
 
 class SubmitFeedbackIn(Schema):
@@ -142,6 +160,13 @@ class KeywordMetricsOut(Schema):
     trend_data: list[dict] | None = None
 
 
+class KeywordsPageOut(Schema):
+    status: str
+    html: str = ""
+    next_cursor: str | None = None
+    message: str = ""
+
+
 class AddKeywordOut(Schema):
     status: str
     message: str | None = None
@@ -1,7 +1,13 @@
-from django.http import HttpRequest
+import json
+import threading
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.http import Http404, HttpRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.utils import timezone
+from django_q.tasks import async_chain, async_task
 from ninja import NinjaAPI
 
 from core.api.auth import session_auth, superuser_api_auth
@@ -19,11 +25,14 @@ from core.api.schemas import (
     GenerateTitleSuggestionOut,
     GenerateTitleSuggestionsIn,
     GenerateTitleSuggestionsOut,
+    JobOut,
+    KeywordsPageOut,
     PostGeneratedBlogPostIn,
     PostGeneratedBlogPostOut,
     ProjectScanIn,
     ProjectScanOut,
     SubmitFeedbackIn,
+    TitleSuggestionsPageOut,
     ToggleAutoSubmissionOut,
     ToggleProjectKeywordUseIn,
     ToggleProjectKeywordUseOut,
@@ -31,8 +40,10 @@ from core.api.schemas import (
     UpdateTitleScoreIn,
     UserSettingsOut,
 )
-from core.choices import ContentType, ProjectPageType
+from core.choices import ContentType, JobStatus, ProjectPageType
 from core.models import (
+    PROJECT_KEYWORD_SORT_FIELDS,
+    AutoSubmissionSetting,
     BlogPost,
     BlogPostTitleSuggestion,
     Competitor,
@@ -43,13 +54,44 @@ from core.models import (
     ProjectKeyword,
     ProjectPage,
 )
-from core.utils import get_or_create_project
+from core.utils import (
+    attribute_upstream_usage,
+    create_job,
+    decode_page_cursor,
+    encode_page_cursor,
+    get_job,
+    get_or_create_project,
+)
 from tuxseo.utils import get_tuxseo_logger
 
 logger = get_tuxseo_logger(__name__)
 
 api = NinjaAPI(docs_url=None)
 
+# Each stream holds a gunicorn thread until the article is written, so only a few may run at once
+# and the remaining threads stay free for regular requests
+blog_content_stream_slots = threading.BoundedSemaphore(settings.BLOG_CONTENT_MAX_STREAMS)
+
+
+class StreamSlotHolder:
+    """Streams an iterator and frees its slot when the response is closed, even if unread."""
+
+    def __init__(self, iterator, slots):
+        self.iterator = iterator
+        self.slots = slots
+        self.released = False
+
+    def __iter__(self):
+        return iter(self.iterator)
+
+    def close(self):
+        try:
+            self.iterator.close()
+        finally:
+            if not self.released:
+                self.released = True
+                self.slots.release()
+
 
 @api.post("/scan", response=ProjectScanOut, auth=[session_auth])
 def scan_project(request: HttpRequest, data: ProjectScanIn):
@@ -72,41 +114,24 @@ def scan_project(request: HttpRequest, data: ProjectScanIn):
         }
 
     project = get_or_create_project(profile.id, data.url, source="scan_project")
+    job_id = create_job(profile.id, kind="scan_project", stage="queued")
+    async_task("core.tasks.scan_project", project.id, job_id, timeout=180)
 
-    got_content = project.get_page_content()
+    return {
+        "status": JobStatus.PENDING,
+        "project_id": project.id,
+        "job_id": job_id,
+        "url": project.url,
+    }
 
-    analyzed_project = False
-    if got_content:
-        analyzed_project = project.analyze_content()
-    else:
-        project.delete()
-        return {
-            "status": "error",
-            "message": "Failed to get page content",
-        }
 
-    if analyzed_project:
-        return {
-            "status": "success",
-            "project_id": project.id,
-            "name": project.name,
-            "type": project.get_type_display(),
-            "url": project.url,
-            "summary": project.summary,
-        }
-    else:
-        logger.error(
-            "[Scan Project] Project has no content",
-            got_content=got_content,
-            analyzed_project=analyzed_project,
-            project_id=project.id if project else None,
-            url=data.url,
-        )
-        project.delete()
-        return {
-            "status": "error",
-            "message": "Failed to analyze project",
-        }
+@api.get("/jobs/{job_id}", response=JobOut, auth=[session_auth])
+def get_job_status(request: HttpRequest, job_id: str):
+    job = get_job(job_id, request.auth.id)
+    if job is None:
+        raise Http404("Job not found")
+
+    return job
 
 
 @api.post("/generate-title-suggestions", response=GenerateTitleSuggestionsOut, auth=[session_auth])
@@ -135,9 +160,10 @@ def generate_title_suggestions(request: HttpRequest, data: GenerateTitleSuggesti
             "message": "Title generation limit reached. Consider <a class='underline' href='/pricing'>upgrading</a>?",  # noqa: E501
         }
 
-    suggestions = project.generate_title_suggestions(
-        content_type=content_type, num_titles=data.num_titles
-    )
+    with attribute_upstream_usage(project):
+        suggestions = project.generate_title_suggestions(
+            content_type=content_type, num_titles=data.num_titles
+        )
 
     # Render HTML for each suggestion using the Django template
     suggestions_html = []
@@ -175,9 +201,10 @@ def generate_title_from_idea(request: HttpRequest, data: GenerateTitleSuggestion
         except KeyError:
             return {"status": "error", "message": f"Invalid content type: {data.content_type}"}
 
-        suggestions = project.generate_title_suggestions(
-            content_type=content_type, num_titles=1, user_prompt=data.user_prompt
-        )
+        with attribute_upstream_usage(project):
+            suggestions = project.generate_title_suggestions(
+                content_type=content_type, num_titles=1, user_prompt=data.user_prompt
+            )
 
         if not suggestions:
             return {"status": "error", "message": "No suggestions were generated"}
@@ -232,7 +259,8 @@ def generate_blog_content(request: HttpRequest, suggestion_id: int):
         }
 
     try:
-        blog_post = suggestion.generate_content(content_type=suggestion.content_type)
+        with attribute_upstream_usage(suggestion.project):
+            blog_post = suggestion.generate_content(content_type=suggestion.content_type)
 
         if not blog_post or not blog_post.content:
             return {"status": "error", "message": "Failed to generate content. Please try again."}
@@ -268,6 +296,69 @@ def generate_blog_content(request: HttpRequest, suggestion_id: int):
         }
 
 
+@api.post("/generate-blog-content/{suggestion_id}/stream", auth=[session_auth])
+def stream_blog_content(request: HttpRequest, suggestion_id: int):
+    profile = request.auth
+    suggestion = get_object_or_404(
+        BlogPostTitleSuggestion, id=suggestion_id, project__profile=profile
+    )
+
+    if profile.reached_content_generation_limit:
+        return {
+            "status": "error",
+            "message": "Content generation limit reached. Consider <a class='underline' href='/pricing'>upgrading</a>?",  # noqa: E501
+        }
+
+    if not blog_content_stream_slots.acquire(blocking=False):
+        logger.warning(
+            "[Stream Blog Content] Too many streams in progress",
+            suggestion_id=suggestion_id,
+            profile_id=profile.id,
+        )
+        return api.create_response(
+            request,
+            {
+                "status": "error",
+                "message": "Too many posts are being generated right now. Please try again in a minute.",  # noqa: E501
+            },
+            status=429,
+        )
+
+    def event_stream():
+        with attribute_upstream_usage(suggestion.project):
+            for event, payload in suggestion.stream_content(content_type=suggestion.content_type):
+                if event == "ping":
+                    yield ": ping\n\n"
+                    continue
+
+                if event == "content":
+                    data = {"content": payload}
+                elif event == "done":
+                    data = {
+                        "status": "success",
+                        "id": payload.id,
+                        "content": payload.content,
+                        "slug": payload.slug,
+                        "tags": payload.tags,
+                        "description": payload.description,
+                    }
+                else:
+                    data = {
+                        "status": "error",
+                        "message": "Failed to generate content. Please try again.",
+                    }
+
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    response = StreamingHttpResponse(
+        StreamSlotHolder(event_stream(), blog_content_stream_slots),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @api.post("/projects/{project_id}/update", response={200: dict}, auth=[session_auth])
 def update_project(request: HttpRequest, project_id: int):
     profile = request.auth
@@ -299,7 +390,15 @@ def toggle_auto_submission(request: HttpRequest, project_id: int):
     project = get_object_or_404(Project, id=project_id, profile=profile)
 
     project.enable_automatic_post_submission = not project.enable_automatic_post_submission
-    project.save(update_fields=["enable_automatic_post_submission"])
+    project.next_auto_post_at = None
+    project.next_auto_post_generate_at = None
+    project.save(
+        update_fields=[
+            "enable_automatic_post_submission",
+            "next_auto_post_at",
+            "next_auto_post_generate_at",
+        ]
+    )
 
     return {"status": "success", "enabled": project.enable_automatic_post_submission}
 
@@ -330,6 +429,44 @@ def update_title_score(request: HttpRequest, suggestion_id: int, data: UpdateTit
         return {"status": "error", "message": f"Failed to update score: {str(e)}"}
 
 
+@api.get(
+    "/projects/{project_id}/title-suggestions",
+    response=TitleSuggestionsPageOut,
+    auth=[session_auth],
+)
+def list_title_suggestions(
+    request: HttpRequest, project_id: int, status: str = "active", after_id: int = 0
+):
+    profile = request.auth
+    project = get_object_or_404(
+        Project.objects.annotate(
+            auto_submission_setting_exists=Exists(
+                AutoSubmissionSetting.objects.filter(project=OuterRef("pk"))
+            )
+        ),
+        id=project_id,
+        profile=profile,
+    )
+
+    if status not in ("active", "posted", "archived"):
+        return {"status": "error", "message": f"Invalid status: {status}"}
+
+    suggestions, next_after_id = project.get_title_suggestions_page(status, after_id=after_id)
+
+    context = {
+        "has_pro_subscription": profile.has_active_subscription,
+        "has_auto_submission_setting": project.auto_submission_setting_exists,
+    }
+    html = "".join(
+        render_to_string(
+            "components/blog_post_suggestion_card.html", {**context, "suggestion": suggestion}
+        )
+        for suggestion in suggestions
+    )
+
+    return {"status": "success", "html": html, "next_after_id": next_after_id}
+
+
 @api.post("/suggestions/{suggestion_id}/archive-status", response={200: dict}, auth=[session_auth])
 def update_archive_status(request: HttpRequest, suggestion_id: int, data: UpdateArchiveStatusIn):
     profile = request.auth
@@ -360,10 +497,19 @@ def add_pricing_page(request: HttpRequest, data: AddPricingPageIn):
         project=project, url=data.url, type=ProjectPageType.PRICING
     )
 
-    project_page.get_page_content()
-    project_page.analyze_content()
+    job_id = create_job(profile.id, kind="add_pricing_page", stage="queued")
+    async_chain(
+        [
+            ("core.tasks.fetch_added_project_page_content", (project_page.id, job_id), {}),
+            ("core.tasks.analyze_added_project_page", (project_page.id, job_id), {}),
+        ]
+    )
 
-    return {"status": "success", "message": "Pricing page added successfully"}
+    return {
+        "status": JobStatus.PENDING,
+        "message": "Pricing page is being analyzed",
+        "job_id": job_id,
+    }
 
 
 @api.post("/add-competitor", response=CompetitorAnalysisOut, auth=[session_auth])
@@ -384,38 +530,21 @@ def add_competitor(request: HttpRequest, data: AddCompetitorIn):
             else "",
         )
 
-        got_content = competitor.get_page_content()
-        got_name_and_description = competitor.populate_name_description()
-
-        if not got_content or not got_name_and_description:
-            competitor.delete()
-            return {
-                "status": "error",
-                "message": "Failed to get page content for this competitor URL",
-            }
-
-        analyzed = competitor.analyze_competitor()
-
-        if not analyzed:
-            competitor.delete()
-            return {"status": "error", "message": "Failed to analyze this competitor"}
+        job_id = create_job(profile.id, kind="add_competitor", stage="queued")
+        async_chain(
+            [
+                ("core.tasks.fetch_added_competitor_content", (competitor.id, job_id), {}),
+                ("core.tasks.populate_added_competitor_details", (competitor.id, job_id), {}),
+                ("core.tasks.analyze_added_competitor", (competitor.id, job_id), {}),
+            ]
+        )
 
         return {
-            "status": "success",
+            "status": JobStatus.PENDING,
             "competitor_id": competitor.id,
+            "job_id": job_id,
             "name": competitor.name,
             "url": competitor.url,
-            "description": competitor.description,
-            "summary": competitor.summary,
-            "competitor_analysis": competitor.competitor_analysis,
-            "key_differences": competitor.key_differences,
-            "strengths": competitor.strengths,
-            "weaknesses": competitor.weaknesses,
-            "opportunities": competitor.opportunities,
-            "threats": competitor.threats,
-            "key_features": competitor.key_features,
-            "key_benefits": competitor.key_benefits,
-            "key_drawbacks": competitor.key_drawbacks,
         }
 
     except Exception as e:
@@ -485,7 +614,8 @@ def add_keyword_to_project(request: HttpRequest, data: AddKeywordIn):
         )
 
         if created:
-            metrics_fetched = keyword.fetch_and_update_metrics()
+            with attribute_upstream_usage(project):
+                metrics_fetched = keyword.fetch_and_update_metrics()
             if not metrics_fetched:
                 logger.warning(
                     "[AddKeyword] Failed to fetch metrics for keyword.",
@@ -509,10 +639,7 @@ def add_keyword_to_project(request: HttpRequest, data: AddKeywordIn):
             "last_fetched_at": keyword.last_fetched_at.isoformat()
             if keyword.last_fetched_at
             else None,
-            "trend_data": [
-                {"value": trend.value, "month": trend.month, "year": trend.year}
-                for trend in keyword.trends.all()
-            ],
+            "trend_data": keyword.trend_data,
         }
 
         return {
@@ -532,6 +659,53 @@ def add_keyword_to_project(request: HttpRequest, data: AddKeywordIn):
         return {"status": "error", "message": f"An unexpected error occurred: {str(e)}"}
 
 
+@api.get("/projects/{project_id}/keywords", response=KeywordsPageOut, auth=[session_auth])
+def list_project_keywords(
+    request: HttpRequest,
+    project_id: int,
+    sort: str = "volume",
+    direction: str = "desc",
+    segment: str = "",
+    use: bool | None = None,
+    search: str = "",
+    cursor: str = "",
+):
+    profile = request.auth
+    project = get_object_or_404(Project, id=project_id, profile=profile)
+
+    if sort not in PROJECT_KEYWORD_SORT_FIELDS:
+        return {"status": "error", "message": f"Invalid sort column: {sort}"}
+
+    has_volume_by_segment = {"": None, "with-volume": True, "zero-volume": False}
+    if segment not in has_volume_by_segment:
+        return {"status": "error", "message": f"Invalid segment: {segment}"}
+
+    try:
+        after = decode_page_cursor(cursor) if cursor else None
+    except ValueError:
+        return {"status": "error", "message": "Invalid cursor"}
+
+    project_keywords, next_position = project.get_keywords_page(
+        sort=sort,
+        descending=direction != "asc",
+        has_volume=has_volume_by_segment[segment],
+        use=use,
+        search=search.strip().lower(),
+        after=after,
+    )
+
+    html = "".join(
+        render_to_string("components/keyword_row.html", {"project_keyword": project_keyword})
+        for project_keyword in project_keywords
+    )
+
+    return {
+        "status": "success",
+        "html": html,
+        "next_cursor": encode_page_cursor(next_position) if next_position else None,
+    }
+
+
 @api.post("/keywords/toggle-use", response=ToggleProjectKeywordUseOut, auth=[session_auth])
 def toggle_project_keyword_use(request: HttpRequest, data: ToggleProjectKeywordUseIn):
     profile = request.auth
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
-from django_q.tasks import async_task
 
 from core.models import Project
+from core.utils import enqueue_once
 
 
 class Command(BaseCommand):
@@ -30,7 +30,16 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Queuing {count} projects for analysis...")
 
+        queued = 0
         for project in projects.iterator():
-            async_task(project.analyze_content, group="backfill_project_analysis")
-
-        self.stdout.write(self.style.SUCCESS(f"Queued {count} projects"))
+            if enqueue_once(
+                f"analyze_project:{project.id}",
+                project.analyze_content,
+                group="backfill_project_analysis",
+                cluster="backfill",
+            ):
+                queued += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Queued {queued} projects, {count - queued} already queued")
+        )
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
-from django_q.tasks import async_task
 
 from core.models import Project
+from core.utils import enqueue_once
 
 
 class Command(BaseCommand):
@@ -30,7 +30,16 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Queuing {count} projects for content scraping...")
 
+        queued = 0
         for project in projects.iterator():
-            async_task(project.get_page_content, group="backfill_project_markdown_content")
-
-        self.stdout.write(self.style.SUCCESS(f"Queued {count} projects"))
+            if enqueue_once(
+                f"get_project_page_content:{project.id}",
+                project.get_page_content,
+                group="backfill_project_markdown_content",
+                cluster="backfill",
+            ):
+                queued += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Queued {queued} projects, {count - queued} already queued")
+        )
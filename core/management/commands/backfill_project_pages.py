@@ -1,8 +1,8 @@
 from django.core.management.base import BaseCommand, CommandError
-from django_q.tasks import async_task
 
 from core.models import Project, ProjectPage
 from core.tasks import schedule_project_page_analysis
+from core.utils import enqueue_once
 
 
 class Command(BaseCommand):
@@ -38,7 +38,19 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Queuing {count} projects for page analysis...")
 
+        queued = 0
         for project in projects.iterator():
-            async_task(schedule_project_page_analysis, project.id, group="backfill_project_pages")
-
-        self.stdout.write(self.style.SUCCESS(f"Queued {count} projects for page analysis"))
+            if enqueue_once(
+                f"schedule_project_page_analysis:{project.id}",
+                schedule_project_page_analysis,
+                project.id,
+                group="backfill_project_pages",
+                cluster="backfill",
+            ):
+                queued += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Queued {queued} projects for page analysis, {count - queued} already queued"
+            )
+        )
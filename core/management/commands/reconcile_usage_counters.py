@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Recounts the denormalized usage counters on profiles and fixes the ones that drifted"
+
+    def handle(self, *args, **options):
+        updated_count = Profile.reconcile_usage_counters()
+
+        if not updated_count:
+            self.stdout.write(self.style.SUCCESS("All usage counters are up to date"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Fixed usage counters for {updated_count} profiles"))
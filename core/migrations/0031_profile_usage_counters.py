@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_usage_counters(apps, schema_editor):
+    Profile = apps.get_model("core", "Profile")
+    GeneratedBlogPost = apps.get_model("core", "GeneratedBlogPost")
+    BlogPostTitleSuggestion = apps.get_model("core", "BlogPostTitleSuggestion")
+
+    def count_per_profile(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(project__profile=OuterRef("pk"))
+                .values("project__profile")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+
+    Profile.objects.update(
+        generated_blog_posts_count=count_per_profile(GeneratedBlogPost),
+        title_suggestions_count=count_per_profile(BlogPostTitleSuggestion),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_keyword_got_people_also_search_for_keywords_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='generated_blog_posts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='title_suggestions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_usage_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_profile_usage_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogposttitlesuggestion',
+            index=models.Index(fields=['project', 'archived'], name='core_blogpo_project_f666f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='generatedblogpost',
+            index=models.Index(fields=['title', 'posted'], name='core_genera_title_i_4a6239_idx'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:57
+
+import calendar
+from datetime import date
+from itertools import groupby
+
+from django.db import migrations, models
+
+TREND_SERIES_LENGTH = 12
+
+
+# Copied from core.model_utils so this migration keeps working if the helpers change
+def get_month_number(month):
+    """Month number (1-12) for a name, abbreviation or number, None if it isn't one."""
+    month = str(month).strip().lower()
+    if month.isdigit():
+        return int(month) if 1 <= int(month) <= 12 else None
+
+    for number in range(1, 13):
+        if month in (calendar.month_name[number].lower(), calendar.month_abbr[number].lower()):
+            return number
+    return None
+
+
+def build_trend_series(trend_items, length):
+    """
+    Compact a keyword's monthly trend into the values of its `length` most recent months,
+    oldest first. Months missing inside that window count as zero.
+    """
+    values_by_month = {}
+    for year, month, value in trend_items:
+        month_number = get_month_number(month)
+        if month_number is not None:
+            values_by_month[int(year) * 12 + month_number - 1] = int(value)
+
+    if not values_by_month:
+        return None, []
+
+    last_month = max(values_by_month)
+    first_month = max(min(values_by_month), last_month - length + 1)
+    series = [values_by_month.get(month, 0) for month in range(first_month, last_month + 1)]
+
+    return date(first_month // 12, first_month % 12 + 1, 1), series
+
+
+def backfill_trend_series(apps, schema_editor):
+    Keyword = apps.get_model("core", "Keyword")
+    KeywordTrend = apps.get_model("core", "KeywordTrend")
+
+    trends = (
+        KeywordTrend.objects.order_by("keyword_id")
+        .values_list("keyword_id", "year", "month", "value")
+        .iterator(chunk_size=5000)
+    )
+
+    keywords_to_update = []
+    for keyword_id, keyword_trends in groupby(trends, key=lambda trend: trend[0]):
+        start, series = build_trend_series(
+            [trend[1:] for trend in keyword_trends], TREND_SERIES_LENGTH
+        )
+        keywords_to_update.append(
+            Keyword(id=keyword_id, trend_series=series, trend_series_start=start)
+        )
+
+    Keyword.objects.bulk_update(
+        keywords_to_update, ["trend_series", "trend_series_start"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_title_suggestion_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='keyword',
+            name='trend_series',
+            field=models.JSONField(blank=True, default=list, help_text='Search volume for the most recent trend months, oldest first'),
+        ),
+        migrations.AddField(
+            model_name='keyword',
+            name='trend_series_start',
+            field=models.DateField(blank=True, help_text='First month of the trend series', null=True),
+        ),
+        migrations.RunPython(backfill_trend_series, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:20
+
+import calendar
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+# Copied from core.model_utils so this migration keeps working if the helpers change
+def get_month_number(month):
+    """Month number (1-12) for a name, abbreviation or number, None if it isn't one."""
+    month = str(month).strip().lower()
+    if month.isdigit():
+        return int(month) if 1 <= int(month) <= 12 else None
+
+    for number in range(1, 13):
+        if month in (calendar.month_name[number].lower(), calendar.month_abbr[number].lower()):
+            return number
+    return None
+
+
+def convert_month_names(apps, schema_editor):
+    KeywordTrend = apps.get_model("core", "KeywordTrend")
+
+    # Only a handful of distinct month spellings exist, so convert them one update each.
+    # The month becomes required in the next migration, so rows whose month cannot be read
+    # are deleted and reported.
+    month_names = KeywordTrend.objects.values_list("month", flat=True).distinct()
+    for month_name in list(month_names):
+        month_number = get_month_number(month_name)
+        if month_number is None:
+            deleted_count, _ = KeywordTrend.objects.filter(month=month_name).delete()
+            logger.warning(
+                "Deleted %s keyword trends with an unreadable month %r", deleted_count, month_name
+            )
+        else:
+            KeywordTrend.objects.filter(month=month_name).update(month_number=month_number)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_keyword_trend_series'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='keywordtrend',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='keywordtrend',
+            name='month_number',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(convert_month_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:20
+
+import logging
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+logger = logging.getLogger(__name__)
+
+
+def delete_duplicate_months(apps, schema_editor):
+    """Keep one trend per keyword and month before the month becomes unique.
+
+    0034 mapped every spelling of a month ("Jan", "January", "1") to the same number, so a
+    keyword may now have several rows for one month. The most recently written one is kept.
+    """
+    KeywordTrend = apps.get_model("core", "KeywordTrend")
+
+    duplicate_months = (
+        KeywordTrend.objects.values("keyword_id", "year", "month_number")
+        .annotate(row_count=Count("id"), kept_id=Max("id"))
+        .filter(row_count__gt=1)
+    )
+    deleted_count = 0
+    for duplicate_month in list(duplicate_months):
+        deleted, _ = (
+            KeywordTrend.objects.filter(
+                keyword_id=duplicate_month["keyword_id"],
+                year=duplicate_month["year"],
+                month_number=duplicate_month["month_number"],
+            )
+            .exclude(id=duplicate_month["kept_id"])
+            .delete()
+        )
+        deleted_count += deleted
+
+    if deleted_count:
+        logger.warning("Deleted %s keyword trends duplicating a month", deleted_count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_keywordtrend_month_number'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_months, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='keywordtrend',
+            name='month',
+        ),
+        migrations.RenameField(
+            model_name='keywordtrend',
+            old_name='month_number',
+            new_name='month',
+        ),
+        migrations.AlterField(
+            model_name='keywordtrend',
+            name='month',
+            field=models.PositiveSmallIntegerField(help_text='The month of this volume (1-12)'),
+        ),
+        migrations.AlterField(
+            model_name='keywordtrend',
+            name='year',
+            field=models.PositiveSmallIntegerField(help_text='The year of this volume (e.g., 2019)'),
+        ),
+        migrations.RemoveField(
+            model_name='keywordtrend',
+            name='uuid',
+        ),
+        migrations.RemoveField(
+            model_name='keywordtrend',
+            name='created_at',
+        ),
+        migrations.RemoveField(
+            model_name='keywordtrend',
+            name='updated_at',
+        ),
+        migrations.AlterUniqueTogether(
+            name='keywordtrend',
+            unique_together={('keyword', 'year', 'month')},
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:10
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_compact_keyword_trends'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeywordMetricsRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('keywords_requested', models.PositiveIntegerField(default=0)),
+                ('keywords_updated', models.PositiveIntegerField(default=0)),
+                ('credits_used', models.PositiveIntegerField(default=0)),
+                ('credit_budget', models.PositiveIntegerField(default=0, help_text='Credits that were left for the day when the run started')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='keyword',
+            name='last_fetched_at',
+            field=models.DateTimeField(blank=True, help_text='Timestamp of when the metrics were last requested', null=True),
+        ),
+    ]
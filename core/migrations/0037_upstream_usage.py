@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_keyword_metrics_refresh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UpstreamUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField(help_text='Start of the hour the calls were made in')),
+                ('upstream', models.CharField(help_text='HTTP client name, or llm:<model> for agent runs', max_length=100)),
+                ('source', models.CharField(blank=True, default='', help_text='Task or view that made the calls', max_length=255)),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('errors', models.PositiveIntegerField(default=0)),
+                ('total_latency_ms', models.PositiveBigIntegerField(default=0)),
+                ('latency_histogram', models.JSONField(default=list, help_text='Call counts per UPSTREAM_LATENCY_BOUNDS_MS bucket')),
+                ('credits_used', models.PositiveIntegerField(default=0)),
+                ('input_tokens', models.PositiveBigIntegerField(default=0)),
+                ('output_tokens', models.PositiveBigIntegerField(default=0)),
+                ('profile', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upstream_usage', to='core.profile')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upstream_usage', to='core.project')),
+            ],
+            options={
+                'ordering': ['-bucket_start', 'upstream'],
+                'constraints': [models.UniqueConstraint(fields=('bucket_start', 'upstream', 'source', 'project', 'profile'), name='unique_upstream_usage_bucket', nulls_distinct=False)],
+            },
+        ),
+    ]
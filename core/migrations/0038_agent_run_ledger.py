@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_upstream_usage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgentRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('function_name', models.CharField(blank=True, default='', max_length=255)),
+                ('model_name', models.CharField(blank=True, default='', help_text='Model the agent was run for', max_length=255)),
+                ('llm_model', models.CharField(max_length=255)),
+                ('request_tokens', models.PositiveIntegerField(default=0)),
+                ('response_tokens', models.PositiveIntegerField(default=0)),
+                ('total_tokens', models.PositiveIntegerField(default=0)),
+                ('cost', models.DecimalField(decimal_places=6, default=0, help_text='USD', max_digits=12)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('succeeded', models.BooleanField(default=True)),
+                ('profile', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='agent_runs', to='core.profile')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='agent_runs', to='core.project')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['project', 'created_at'], name='core_agentr_project_a90da1_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfileAgentUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('request_tokens', models.PositiveBigIntegerField(default=0)),
+                ('response_tokens', models.PositiveBigIntegerField(default=0)),
+                ('cost', models.DecimalField(decimal_places=6, default=0, help_text='USD', max_digits=12)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='agent_usage', to='core.profile')),
+            ],
+            options={
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(fields=('profile', 'month'), name='unique_profile_agent_month')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:25
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_agent_run_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Workflow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('onboarding', 'Onboarding')], max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('success', 'Success'), ('error', 'Error')], default='running', max_length=20)),
+                ('max_concurrency', models.PositiveSmallIntegerField(default=2)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workflows', to='core.project')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkflowNode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=500)),
+                ('func', models.CharField(help_text='Dotted path of the task function', max_length=255)),
+                ('args', models.JSONField(blank=True, default=list)),
+                ('kwargs', models.JSONField(blank=True, default=dict)),
+                ('depends_on', models.JSONField(blank=True, default=list, help_text='Keys of earlier nodes')),
+                ('timeout', models.PositiveIntegerField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('queued', 'Queued'), ('running', 'Running'), ('success', 'Success'), ('error', 'Error')], default='pending', max_length=20)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('message', models.TextField(blank=True, default='')),
+                ('workflow', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nodes', to='core.workflow')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('workflow', 'key'), name='unique_workflow_node_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_workflows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='next_auto_post_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='next_auto_post_generate_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['next_auto_post_generate_at'], name='core_projec_next_au_fc20ab_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:17
+
+from django.db import migrations
+
+REFRESH_STALE_KEYWORD_METRICS = "core.tasks.refresh_stale_keyword_metrics"
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+
+    # The task spends at most a day's worth of refresh credits per run
+    Schedule.objects.get_or_create(
+        func=REFRESH_STALE_KEYWORD_METRICS,
+        defaults={
+            "name": "Refresh stale keyword metrics",
+            "schedule_type": "D",
+            "repeats": -1,
+            "cluster": "periodic",
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(func=REFRESH_STALE_KEYWORD_METRICS).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_auto_post_calendar'),
+        ('django_q', '0018_task_success_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:22
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def lease_nodes_in_flight(apps, schema_editor):
+    WorkflowNode = apps.get_model("core", "WorkflowNode")
+
+    # Nodes already queued or running have no lease yet, give them time to report back
+    WorkflowNode.objects.filter(status__in=["queued", "running"]).update(
+        lease_expires_at=timezone.now() + timedelta(hours=1)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_refresh_keyword_metrics_schedule'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='workflownode',
+            name='depends_on',
+        ),
+        migrations.AddField(
+            model_name='workflownode',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, help_text='A queued or running node still unfinished by then is presumed lost', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='workflownode',
+            index=models.Index(fields=['status', 'lease_expires_at'], name='core_workfl_status_6420bc_idx'),
+        ),
+        migrations.RunPython(lease_nodes_in_flight, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:29
+
+from django.db import migrations
+
+# Created with a cluster by 0041, so it was never moved here
+REFRESH_STALE_KEYWORD_METRICS = "core.tasks.refresh_stale_keyword_metrics"
+
+
+def move_schedules_to_periodic_cluster(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+
+    # This app's schedules without a cluster run on the interactive queue, where they compete
+    # with scans. Schedules of other apps are left where their owners put them.
+    Schedule.objects.filter(cluster__isnull=True, func__startswith="core.").update(
+        cluster="periodic"
+    )
+
+
+def move_schedules_back(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(cluster="periodic", func__startswith="core.").exclude(
+        func=REFRESH_STALE_KEYWORD_METRICS
+    ).update(cluster=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0042_workflow_node_leases'),
+        ('django_q', '0018_task_success_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_schedules_to_periodic_cluster, move_schedules_back),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:52
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+
+# Copied from core.utils so this migration keeps working if the helper changes
+def normalize_keyword_text(keyword_text):
+    return " ".join(keyword_text.split()).lower()
+
+
+def merge_keyword_group(Keyword, ProjectKeyword, normalized_text, keyword_ids):
+    """Merge one keyword's spellings into a single row and return how many were removed."""
+    # Most recently fetched first, never-fetched last, oldest row wins ties
+    keywords = sorted(Keyword.objects.filter(id__in=keyword_ids), key=lambda k: k.id)
+    keywords.sort(
+        key=lambda k: (k.last_fetched_at is not None, k.last_fetched_at or datetime.min),
+        reverse=True,
+    )
+    canonical, duplicates = keywords[0], keywords[1:]
+    duplicate_ids = [keyword.id for keyword in duplicates]
+
+    linked_projects = {
+        project_keyword.project_id: project_keyword
+        for project_keyword in ProjectKeyword.objects.filter(keyword=canonical)
+    }
+    for project_keyword in ProjectKeyword.objects.filter(keyword_id__in=duplicate_ids):
+        existing = linked_projects.get(project_keyword.project_id)
+        if existing is None:
+            project_keyword.keyword = canonical
+            project_keyword.save(update_fields=["keyword"])
+            linked_projects[project_keyword.project_id] = project_keyword
+        else:
+            if project_keyword.use and not existing.use:
+                existing.use = True
+                existing.save(update_fields=["use"])
+            project_keyword.delete()
+
+    canonical.got_related_keywords = any(k.got_related_keywords for k in keywords)
+    canonical.got_people_also_search_for_keywords = any(
+        k.got_people_also_search_for_keywords for k in keywords
+    )
+    canonical.keyword_text = normalized_text
+
+    # A duplicate may hold the normalized text already, so it goes before the rename
+    Keyword.objects.filter(id__in=duplicate_ids).delete()
+    canonical.save()
+    return len(duplicate_ids)
+
+
+def merge_keyword_case_duplicates(apps, schema_editor):
+    """Fold keywords saved before normalization into a single lowercase row.
+
+    save_keywords only looks up normalized text, so rows such as "Email Marketing" were never
+    matched and were created (and paid for) again as "email marketing". Every spelling of a
+    keyword is merged into the most recently fetched row, which keeps its metrics.
+    """
+    Keyword = apps.get_model("core", "Keyword")
+    ProjectKeyword = apps.get_model("core", "ProjectKeyword")
+
+    groups = defaultdict(set)
+    keyword_rows = Keyword.objects.values_list("id", "keyword_text", "country", "data_source")
+    for keyword_id, keyword_text, country, data_source in keyword_rows.iterator(chunk_size=5000):
+        normalized_text = normalize_keyword_text(keyword_text)
+        if normalized_text != keyword_text:
+            groups[(normalized_text, country, data_source)].add(keyword_id)
+
+    if not groups:
+        return
+
+    # Rows already stored in normalized form belong to the same group
+    normalized_texts = iter({normalized_text for normalized_text, _, _ in groups})
+    while chunk := list(islice(normalized_texts, 1000)):
+        for keyword_id, keyword_text, country, data_source in Keyword.objects.filter(
+            keyword_text__in=chunk
+        ).values_list("id", "keyword_text", "country", "data_source"):
+            if (keyword_text, country, data_source) in groups:
+                groups[(keyword_text, country, data_source)].add(keyword_id)
+
+    merged_count = 0
+    for (normalized_text, _, _), keyword_ids in groups.items():
+        merged_count += merge_keyword_group(Keyword, ProjectKeyword, normalized_text, keyword_ids)
+
+    logger.info(
+        "Normalized %s keyword spellings and merged %s duplicates", len(groups), merged_count
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0043_periodic_cluster_schedules'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_keyword_case_duplicates, migrations.RunPython.noop),
+    ]
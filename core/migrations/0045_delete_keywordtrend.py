@@ -0,0 +1,64 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:02
+
+from datetime import date
+from itertools import groupby
+
+from django.db import migrations
+
+TREND_SERIES_LENGTH = 12
+
+
+# Copied from core.model_utils so this migration keeps working if the helpers change
+def build_trend_series(trend_items, length):
+    values_by_month = {}
+    for year, month, value in trend_items:
+        values_by_month[int(year) * 12 + month - 1] = int(value)
+
+    if not values_by_month:
+        return None, []
+
+    last_month = max(values_by_month)
+    first_month = max(min(values_by_month), last_month - length + 1)
+    series = [values_by_month.get(month, 0) for month in range(first_month, last_month + 1)]
+
+    return date(first_month // 12, first_month % 12 + 1, 1), series
+
+
+def backfill_missing_trend_series(apps, schema_editor):
+    """Build the trend series of keywords that only have trend rows before the rows go away."""
+    Keyword = apps.get_model("core", "Keyword")
+    KeywordTrend = apps.get_model("core", "KeywordTrend")
+
+    trends = (
+        KeywordTrend.objects.filter(keyword__trend_series_start__isnull=True)
+        .order_by("keyword_id")
+        .values_list("keyword_id", "year", "month", "value")
+        .iterator(chunk_size=5000)
+    )
+
+    keywords_to_update = []
+    for keyword_id, keyword_trends in groupby(trends, key=lambda trend: trend[0]):
+        start, series = build_trend_series(
+            [trend[1:] for trend in keyword_trends], TREND_SERIES_LENGTH
+        )
+        keywords_to_update.append(
+            Keyword(id=keyword_id, trend_series=series, trend_series_start=start)
+        )
+
+    Keyword.objects.bulk_update(
+        keywords_to_update, ["trend_series", "trend_series_start"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0044_merge_keyword_case_duplicates'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_missing_trend_series, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='KeywordTrend',
+        ),
+    ]
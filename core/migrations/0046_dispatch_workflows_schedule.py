@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:09
+
+from django.db import migrations
+
+DISPATCH_WORKFLOWS = "core.tasks.dispatch_workflows"
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+
+    # Node leases last several minutes, so a stuck workflow is picked up within a minute of
+    # its lease expiring
+    Schedule.objects.get_or_create(
+        func=DISPATCH_WORKFLOWS,
+        defaults={
+            "name": "Dispatch workflows",
+            "schedule_type": "I",
+            "minutes": 1,
+            "repeats": -1,
+            "cluster": "periodic",
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(func=DISPATCH_WORKFLOWS).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0045_delete_keywordtrend'),
+        ('django_q', '0018_task_success_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
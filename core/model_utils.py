@@ -1,8 +1,30 @@
+import asyncio
+import bisect
+import calendar
+import contextvars
+import hashlib
+import json
+import os
 import random
 import string
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from html.parser import HTMLParser
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
 
 import requests
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.utils import timezone
+from pydantic import TypeAdapter, ValidationError
 from pydantic_ai import capture_run_messages
+from pydantic_core import to_jsonable_python
+from redis.exceptions import RedisError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from tuxseo import settings
 from tuxseo.utils import get_tuxseo_logger
@@ -15,46 +37,164 @@ def generate_random_key():
     return "".join(random.choice(characters) for _ in range(10))
 
 
-def run_agent_synchronously(agent, input_string, deps=None, function_name="", model_name=""):
+_agent_loop = None
+_agent_loop_pid = None
+_agent_loop_lock = threading.Lock()
+_agent_run_slots = None
+
+
+def get_agent_event_loop():
     """
-    Run a PydanticAI agent synchronously.
+    Return the long-lived event loop that runs all agent coroutines for this process.
+
+    The loop lives in a daemon thread so many `agent.run` calls can be in flight at once
+    instead of each caller blocking its own short-lived loop. The owning pid is tracked
+    because gunicorn and django-q fork workers, and a loop thread does not survive a fork.
+    """
+    global _agent_loop, _agent_loop_pid, _agent_run_slots
+
+    with _agent_loop_lock:
+        if _agent_loop is None or _agent_loop.is_closed() or _agent_loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="agent-event-loop", daemon=True)
+            thread.start()
+            _agent_loop = loop
+            _agent_loop_pid = os.getpid()
+            _agent_run_slots = asyncio.Semaphore(settings.AGENT_MAX_IN_FLIGHT)
+
+    return _agent_loop
+
+
+def get_agent_run_slots():
+    """
+    Semaphore bounding the agent runs in flight on this process's loop to
+    AGENT_MAX_IN_FLIGHT, so a wide fan-out queues on the loop instead of flooding the model
+    provider.
+    """
+    get_agent_event_loop()
+    return _agent_run_slots
+
+
+@dataclass
+class AgentRunOutput:
+    """
+    Stand-in for pydantic_ai's AgentRunResult when only the output is at hand, either
+    because it came from the cache or because the run was streamed.
+    """
+
+    output: Any
+
+    @property
+    def data(self):
+        return self.output
+
+
+def get_agent_run_cache_key(name, agent, input_string, deps=None, system_prompt=""):
+    """
+    Hash everything that shapes an agent's answer into a stable cache key for `run_agent`.
+
+    `system_prompt` is the agent's static system prompt from core.prompts, so editing it
+    invalidates the cached answers. Only for deterministic agents whose dynamic prompts
+    render nothing but `deps` (no dates, randomness or database reads). `name` tells the
+    cached agents apart; bump the "agent_results" cache version when the template of a
+    dynamic prompt changes.
+    """
+    payload = {
+        "name": name,
+        "system_prompt": system_prompt,
+        "model": str(getattr(agent.model, "model_name", agent.model)),
+        "output_type": repr(agent.output_type),
+        "model_settings": agent.model_settings,
+        "input_string": input_string,
+        "deps": to_jsonable_python(deps),
+    }
+    serialized_payload = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized_payload.encode()).hexdigest()
+
+
+async def get_cached_agent_run(agent, cache_key):
+    try:
+        cached_output = await caches["agent_results"].aget(cache_key)
+    except RedisError as e:
+        logger.warning("[Agent Cache] Failed to read from cache", error=str(e), key=cache_key)
+        return None
+
+    if cached_output is None:
+        return None
+
+    try:
+        output = TypeAdapter(agent.output_type).validate_python(cached_output)
+    except ValidationError as e:
+        # Cached before the output schema changed, run the agent again
+        logger.warning(
+            "[Agent Cache] Discarding invalid cached output", error=str(e), key=cache_key
+        )
+        return None
+
+    return AgentRunOutput(output=output)
+
+
+async def set_cached_agent_run(cache_key, result):
+    try:
+        await caches["agent_results"].aset(cache_key, to_jsonable_python(result.output))
+    except RedisError as e:
+        logger.warning("[Agent Cache] Failed to write to cache", error=str(e), key=cache_key)
+
+
+async def run_agent(
+    agent, input_string, deps=None, function_name="", model_name="", cache_key=None
+):
+    """
+    Run a PydanticAI agent natively on the current event loop.
 
     Args:
         agent: The PydanticAI agent to run
         input_string: The input string to pass to the agent
         deps: Optional dependencies to pass to the agent
+        cache_key: Reuse the output of a previous run with the same key, from
+            `get_agent_run_cache_key`. Only meant for deterministic extraction/analysis
+            steps, not creative generation.
 
     Returns:
-        The result of the agent run
-
-    Raises:
-        RuntimeError: If the agent execution fails
+        The result of the agent run, or None if the execution failed
     """
-    import asyncio
-
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    if cache_key:
+        cached_result = await get_cached_agent_run(agent, cache_key)
+        if cached_result is not None:
+            logger.info(
+                "[Run Agent] Using cached agent output",
+                cache_key=cache_key,
+                function_name=function_name,
+                model_name=model_name,
+            )
+            return cached_result
 
+    started_at = time.monotonic()
     with capture_run_messages() as messages:
         try:
             logger.info(
-                "[Run Agent Synchronously] Running agent",
+                "[Run Agent] Running agent",
                 messages=messages,
                 input_string=input_string,
                 deps=deps,
                 function_name=function_name,
                 model_name=model_name,
             )
-            if deps is not None:
-                result = loop.run_until_complete(agent.run(input_string, deps=deps))
-            else:
-                result = loop.run_until_complete(agent.run(input_string))
+            async with get_agent_run_slots():
+                if deps is not None:
+                    result = await agent.run(input_string, deps=deps)
+                else:
+                    result = await agent.run(input_string)
+            record_agent_usage(
+                agent,
+                started_at,
+                result.usage(),
+                function_name=function_name,
+                model_name=model_name,
+            )
 
             logger.info(
-                "[Run Agent Synchronously] Agent run successfully",
+                "[Run Agent] Agent run successfully",
                 messages=messages,
                 input_string=input_string,
                 deps=deps,
@@ -62,51 +202,856 @@ def run_agent_synchronously(agent, input_string, deps=None, function_name="", mo
                 function_name=function_name,
                 model_name=model_name,
             )
-            return result
         except Exception as e:
+            record_agent_usage(
+                agent, started_at, function_name=function_name, model_name=model_name
+            )
             logger.error(
-                "[Run Agent Synchronously] Failed execution",
+                "[Run Agent] Failed execution",
                 messages=messages,
                 exc_info=e,
                 error=str(e),
                 function_name=function_name,
                 model_name=model_name,
             )
+            return None
+
+    if cache_key:
+        await set_cached_agent_run(cache_key, result)
+
+    return result
+
+
+async def run_agent_streamed(
+    agent, input_string, deps=None, on_text_delta=None, function_name="", model_name=""
+):
+    """
+    Run a PydanticAI agent with plain text output, streaming the text as it is generated.
+
+    Args:
+        agent: The PydanticAI agent to run, its output_type must be str
+        input_string: The input string to pass to the agent
+        deps: Optional dependencies to pass to the agent
+        on_text_delta: Called with each new piece of text as tokens arrive
+
+    Returns:
+        The result of the agent run, or None if the execution failed
+    """
+    started_at = time.monotonic()
+    with capture_run_messages() as messages:
+        try:
+            logger.info(
+                "[Run Agent Streamed] Running agent",
+                input_string=input_string,
+                deps=deps,
+                function_name=function_name,
+                model_name=model_name,
+            )
+            async with agent.run_stream(input_string, deps=deps) as result:
+                async for text_delta in result.stream_text(delta=True, debounce_by=0.1):
+                    if on_text_delta:
+                        on_text_delta(text_delta)
+
+                output = await result.get_output()
+
+            record_agent_usage(
+                agent,
+                started_at,
+                result.usage(),
+                function_name=function_name,
+                model_name=model_name,
+            )
+            logger.info(
+                "[Run Agent Streamed] Agent run successfully",
+                messages=messages,
+                usage=result.usage(),
+                function_name=function_name,
+                model_name=model_name,
+            )
+        except Exception as e:
+            record_agent_usage(
+                agent, started_at, function_name=function_name, model_name=model_name
+            )
+            logger.error(
+                "[Run Agent Streamed] Failed execution",
+                messages=messages,
+                exc_info=e,
+                error=str(e),
+                function_name=function_name,
+                model_name=model_name,
+            )
+            return None
+
+    return AgentRunOutput(output=output)
+
+
+def schedule_on_agent_loop(coroutine):
+    """
+    Start a coroutine on the shared agent event loop without waiting for it.
+
+    The coroutine keeps running even if the caller goes away, which is what lets a
+    streamed generation finish after its HTTP client disconnects.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, get_agent_event_loop())
+
+
+def _submit_to_agent_loop(coroutine):
+    loop = get_agent_event_loop()
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is loop:
+        coroutine.close()
+        raise RuntimeError(
+            "Cannot block on the agent event loop from inside it, await run_agent instead."
+        )
+
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+
+def run_agent_synchronously(
+    agent, input_string, deps=None, function_name="", model_name="", cache_key=None
+):
+    """
+    Run a PydanticAI agent synchronously.
+
+    The coroutine is scheduled on the shared agent event loop, so concurrent callers
+    (gunicorn threads, django-q workers) multiplex their LLM calls on a single loop.
+
+    Args:
+        agent: The PydanticAI agent to run
+        input_string: The input string to pass to the agent
+        deps: Optional dependencies to pass to the agent
+        cache_key: Reuse the output of a previous run with the same key
+
+    Returns:
+        The result of the agent run, or None if the execution failed
+    """
+    return _submit_to_agent_loop(
+        run_agent(
+            agent,
+            input_string,
+            deps=deps,
+            function_name=function_name,
+            model_name=model_name,
+            cache_key=cache_key,
+        )
+    )
+
+
+def run_agents_concurrently(agent_runs):
+    """
+    Run several PydanticAI agents at the same time and wait for all of them.
+
+    Args:
+        agent_runs: List of dicts with the keyword arguments accepted by `run_agent`
+
+    Returns:
+        List of results in the same order as `agent_runs`. Failed runs are None.
+    """
+
+    async def gather_runs():
+        return await asyncio.gather(*(run_agent(**agent_run) for agent_run in agent_runs))
+
+    return _submit_to_agent_loop(gather_runs())
+
+
+# Upper bounds of the latency histogram kept per upstream usage bucket, the last bucket is open
+UPSTREAM_LATENCY_BOUNDS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_usage_attribution = contextvars.ContextVar("usage_attribution", default=(None, None))
+_usage_source = contextvars.ContextVar("usage_source", default="")
+_usage_buffer = {}
+_usage_buffer_pid = None
+_agent_run_buffer = []
+_agent_run_buffer_pid = None
+_usage_buffer_lock = threading.Lock()
+
+
+def set_usage_attribution(project_id, profile_id):
+    """
+    Attribute upstream calls made from the current context to a project and profile.
+
+    Agent runs inherit the context they were scheduled from; threads started with
+    `contextvars.copy_context().run` do too. Returns a token for `reset_usage_attribution`.
+    """
+    return _usage_attribution.set((project_id, profile_id))
+
+
+def reset_usage_attribution(token):
+    _usage_attribution.reset(token)
+
+
+def set_usage_source(source):
+    """Name the task or view that upstream calls made from the current context belong to."""
+    _usage_source.set(source)
+
+
+def record_upstream_call(
+    upstream, started_at, failed=False, credits_used=0, input_tokens=0, output_tokens=0
+):
+    """
+    Count one call to `upstream` that started at `started_at` (time.monotonic) in this
+    process's usage buffer, under the current hour, source and attribution.
+
+    Nothing is written to the database here, so it is safe from any thread and from the
+    agent event loop. UpstreamUsage.save_buffered moves the buffer into hourly rows.
+    """
+    global _usage_buffer, _usage_buffer_pid
+
+    latency_ms = int((time.monotonic() - started_at) * 1000)
+    project_id, profile_id = _usage_attribution.get()
+    bucket_start = timezone.now().replace(minute=0, second=0, microsecond=0)
+    key = (bucket_start, upstream, _usage_source.get(), project_id, profile_id)
+
+    with _usage_buffer_lock:
+        if _usage_buffer_pid != os.getpid():
+            _usage_buffer = {}
+            _usage_buffer_pid = os.getpid()
+
+        if key not in _usage_buffer:
+            _usage_buffer[key] = {
+                "calls": 0,
+                "errors": 0,
+                "total_latency_ms": 0,
+                "credits_used": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "latency_histogram": [0] * (len(UPSTREAM_LATENCY_BOUNDS_MS) + 1),
+            }
+
+        usage = _usage_buffer[key]
+        usage["calls"] += 1
+        usage["errors"] += int(failed)
+        usage["total_latency_ms"] += latency_ms
+        usage["credits_used"] += credits_used
+        usage["input_tokens"] += input_tokens
+        usage["output_tokens"] += output_tokens
+        usage["latency_histogram"][bisect.bisect_left(UPSTREAM_LATENCY_BOUNDS_MS, latency_ms)] += 1
+
+
+def pop_buffered_upstream_usage():
+    """Take everything counted by `record_upstream_call` in this process so far."""
+    global _usage_buffer
+
+    with _usage_buffer_lock:
+        if _usage_buffer_pid != os.getpid():
+            return {}
+
+        buffered_usage, _usage_buffer = _usage_buffer, {}
+
+    return buffered_usage
+
+
+def record_agent_usage(agent, started_at, usage=None, function_name="", model_name=""):
+    """
+    Count one agent run against its model and buffer it for the AgentRun ledger. Runs
+    without `usage` are counted as failed.
+    """
+    global _agent_run_buffer, _agent_run_buffer_pid
+
+    llm_model = str(getattr(agent.model, "model_name", agent.model))
+    request_tokens = (usage.request_tokens or 0) if usage else 0
+    response_tokens = (usage.response_tokens or 0) if usage else 0
+    record_upstream_call(
+        f"llm:{llm_model}",
+        started_at,
+        failed=usage is None,
+        input_tokens=request_tokens,
+        output_tokens=response_tokens,
+    )
+
+    project_id, profile_id = _usage_attribution.get()
+    agent_run = {
+        "created_at": timezone.now(),
+        "project_id": project_id,
+        "profile_id": profile_id,
+        "function_name": function_name,
+        "model_name": model_name,
+        "llm_model": llm_model,
+        "request_tokens": request_tokens,
+        "response_tokens": response_tokens,
+        "total_tokens": (usage.total_tokens or request_tokens + response_tokens) if usage else 0,
+        "duration_ms": int((time.monotonic() - started_at) * 1000),
+        "succeeded": usage is not None,
+    }
+
+    with _usage_buffer_lock:
+        if _agent_run_buffer_pid != os.getpid():
+            _agent_run_buffer = []
+            _agent_run_buffer_pid = os.getpid()
+
+        _agent_run_buffer.append(agent_run)
+
+
+def pop_buffered_agent_runs():
+    """Take the agent runs recorded by `record_agent_usage` in this process so far."""
+    global _agent_run_buffer
+
+    with _usage_buffer_lock:
+        if _agent_run_buffer_pid != os.getpid():
+            return []
+
+        agent_runs, _agent_run_buffer = _agent_run_buffer, []
+
+    return agent_runs
+
+
+def estimate_latency_percentile(latency_histogram, percentile):
+    """
+    Upper bound in ms of the histogram bucket holding the given percentile (0-100), None
+    when the histogram is empty or the percentile falls in the open-ended last bucket.
+    """
+    total = sum(latency_histogram)
+    if not total:
+        return None
+
+    threshold = total * percentile / 100
+    seen = 0
+    for bound, count in zip(UPSTREAM_LATENCY_BOUNDS_MS, latency_histogram, strict=False):
+        seen += count
+        if seen >= threshold:
+            return bound
+
+    return None
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    pass
+
+
+# Token bucket holding up to one second of requests, refilled continuously. Redis' clock is
+# used so that every worker agrees on the refill. Returns the seconds to wait for the next
+# token, 0 when one was taken.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+_local_token_buckets = {}
+_local_token_buckets_lock = threading.Lock()
+
+
+def take_rate_limit_token(upstream, requests_per_second):
+    """
+    Take one token from the bucket of `upstream` and return 0, or return the seconds until
+    the next token is available.
+
+    The bucket lives in the "rate_limits" cache when it is Redis, so every worker process
+    shares it. Other cache backends (tests, local development) get a bucket per process.
+    """
+    cache = caches["rate_limits"]
+    key = cache.make_and_validate_key(f"bucket:{upstream}")
+    capacity = max(requests_per_second, 1)
+
+    if isinstance(cache, RedisCache):
+        # The cache API has no atomic read-modify-write, so the script runs on its client
+        client = cache._cache.get_client(key, write=True)
+        token_bucket = client.register_script(TOKEN_BUCKET_SCRIPT)
+        return float(token_bucket(keys=[key], args=[requests_per_second, capacity]))
+
+    with _local_token_buckets_lock:
+        now = time.monotonic()
+        tokens, updated_at = _local_token_buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * requests_per_second)
+        if tokens >= 1:
+            _local_token_buckets[key] = (tokens - 1, now)
+            return 0
+
+        _local_token_buckets[key] = (tokens, now)
+        return (1 - tokens) / requests_per_second
+
+
+def acquire_rate_limit(upstream, requests_per_second, max_wait=30):
+    """
+    Take one request from the budget of `upstream`, waiting until a token is available.
+
+    The budget is a token bucket (see `take_rate_limit_token`) refilled at
+    `requests_per_second`, so requests are spread evenly instead of bursting at the start of
+    every second. Raises RateLimitExceeded after `max_wait` seconds; if the cache is
+    unreachable the request is let through.
+    """
+    deadline = time.monotonic() + max_wait
+
+    while True:
+        try:
+            wait = take_rate_limit_token(upstream, requests_per_second)
+        except RedisError as e:
+            logger.warning("[Rate Limit] Cache unavailable, not limiting", error=str(e))
+            return
+
+        if wait <= 0:
+            return
+
+        if time.monotonic() + wait > deadline:
+            raise RateLimitExceeded(f"Rate limit for {upstream} exhausted for {max_wait}s")
+
+        # Jitter keeps waiting workers from all retrying at the same instant
+        time.sleep(wait + random.uniform(0, 0.05))
+
+
+class RateLimitedRetry(Retry):
+    """Retry that takes a rate limit token before every replayed attempt."""
+
+    def __init__(self, *args, upstream="default", rate_limit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upstream = upstream
+        self.rate_limit = rate_limit
+
+    def new(self, **kwargs):
+        kwargs.setdefault("upstream", self.upstream)
+        kwargs.setdefault("rate_limit", self.rate_limit)
+        return super().new(**kwargs)
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limit:
+            acquire_rate_limit(self.upstream, self.rate_limit)
+
+
+class HTTPClient(requests.Session):
+    """
+    Session with a pooled, retrying adapter and a default timeout for one upstream.
+
+    Cookies are never stored: clients are shared across projects and users, so nothing
+    set by one endpoint may leak into a request made on behalf of someone else.
+    Upstreams with a `rate_limit` (requests per second) share that budget across workers,
+    and every attempt, retries and redirects included, takes a token from it.
+    `retry_statuses` and `read_retries` narrow retries for upstreams that bill requests
+    they may already have processed.
+    Every call is counted in the upstream usage buffer; `usage_field` is the dotted path of
+    the credits an upstream reports in its JSON responses.
+    """
+
+    def __init__(
+        self,
+        upstream="default",
+        timeout=30,
+        pool_connections=10,
+        pool_maxsize=10,
+        retries=0,
+        backoff_factor=0,
+        retry_methods=("GET",),
+        retry_statuses=(429, 500, 502, 503, 504),
+        read_retries=None,
+        rate_limit=None,
+        usage_field=None,
+    ):
+        super().__init__()
+        self.upstream = upstream
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+        self.usage_field = usage_field
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=RateLimitedRetry(
+                upstream=upstream,
+                rate_limit=rate_limit,
+                total=retries,
+                read=read_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=tuple(retry_statuses),
+                allowed_methods=frozenset(retry_methods),
+                raise_on_status=False,
+            ),
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        started_at = time.monotonic()
+        try:
+            response = super().request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            record_upstream_call(self.upstream, started_at, failed=True)
+            raise
+
+        record_upstream_call(
+            self.upstream,
+            started_at,
+            failed=response.status_code >= 400,
+            credits_used=self.get_credits_used(response),
+        )
+        return response
+
+    def send(self, request, **kwargs):
+        # Called once per request and once per redirect; urllib3 retries go through
+        # RateLimitedRetry instead
+        if self.rate_limit:
+            acquire_rate_limit(self.upstream, self.rate_limit)
+
+        return super().send(request, **kwargs)
+
+    def get_credits_used(self, response):
+        if not self.usage_field or response.status_code >= 400:
+            return 0
+
+        try:
+            value = response.json()
+            for key in self.usage_field.split("."):
+                value = value.get(key, {})
+            return int(value)
+        except (ValueError, TypeError, AttributeError):
+            return 0
+
+
+_http_clients = {}
+_http_clients_pid = None
+_http_clients_lock = threading.Lock()
+
+
+def get_http_client(upstream="default"):
+    """
+    Return the process-wide HTTP client for an upstream configured in `HTTP_CLIENTS`.
+
+    Pooled connections are not shared across forks, so clients are rebuilt when the pid
+    changes.
+    """
+    global _http_clients, _http_clients_pid
+
+    with _http_clients_lock:
+        if _http_clients_pid != os.getpid():
+            _http_clients = {}
+            _http_clients_pid = os.getpid()
+
+        if upstream not in _http_clients:
+            client_settings = settings.HTTP_CLIENTS.get(upstream, settings.HTTP_CLIENTS["default"])
+            _http_clients[upstream] = HTTPClient(upstream=upstream, **client_settings)
+
+    return _http_clients[upstream]
+
+
+def get_scrape_cache_key(kind, url):
+    return f"{kind}:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+def get_scraped_page(cache_key):
+    try:
+        return caches["scraped_pages"].get(cache_key)
+    except RedisError as e:
+        logger.warning("[Scrape Cache] Failed to read from cache", error=str(e), key=cache_key)
+        return None
+
+
+def save_scraped_page(cache_key, scraped_page):
+    try:
+        caches["scraped_pages"].set(cache_key, scraped_page)
+    except RedisError as e:
+        logger.warning("[Scrape Cache] Failed to write to cache", error=str(e), key=cache_key)
+
+
+def is_scraped_page_fresh(scraped_page):
+    return time.time() - scraped_page["fetched_at"] < settings.SCRAPE_CACHE_FRESHNESS
+
+
+def get_revalidation_headers(scraped_page):
+    if not scraped_page:
+        return {}
+
+    headers = {}
+    if scraped_page.get("etag"):
+        headers["If-None-Match"] = scraped_page["etag"]
+    if scraped_page.get("last_modified"):
+        headers["If-Modified-Since"] = scraped_page["last_modified"]
+
+    return headers
+
+
+def build_scraped_page(response, content, title="", description=""):
+    return {
+        "fetched_at": time.time(),
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+        "title": title,
+        "description": description,
+        "content": content,
+    }
+
+
+# Bounds of the HTML summary sent to the analysis agents
+HTML_SUMMARY_MAX_INPUT_CHARS = 2_000_000
+HTML_SUMMARY_MAX_CHARS = 12000
+HTML_SUMMARY_MAX_ITEMS = 40
+HTML_SUMMARY_MAX_TEXT = 200
+HTML_SUMMARY_MAX_STRUCTURED_DATA = 3000
+HTML_SUMMARY_MAX_STRUCTURED_BLOCKS = 3
+
+HTML_SUMMARY_META_NAMES = {"description", "keywords", "author", "application-name", "generator"}
+HTML_SUMMARY_META_PREFIXES = ("og:", "twitter:", "article:", "product:")
+HTML_SUMMARY_SKIPPED_TAGS = {"script", "style", "noscript", "svg", "template", "iframe"}
+
+
+class HTMLSummaryParser(HTMLParser):
+    """
+    Incremental parser that keeps only what the analysis agents use from a page's HTML:
+    language, title, meta tags, headings, navigation and footer links and JSON-LD.
+
+    Feed it chunks as they arrive; every section is capped, so memory stays bounded no
+    matter how large the page or how much inline script and CSS it carries.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.language = ""
+        self.title = ""
+        self.canonical_url = ""
+        self.meta = []
+        self.headings = []
+        self.links = {"nav": [], "footer": []}
+        self.structured_data = []
+
+        self._skipped_depth = 0
+        self._section_depth = {"nav": 0, "footer": 0}
+        self._capture = None
+        self._captured_text = []
+        self._link_href = ""
+        self._in_structured_data = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+
+        if tag == "html":
+            self.language = self.language or (attrs.get("lang") or "")[:20]
+        elif tag == "meta":
+            self._add_meta(attrs)
+        elif tag == "link" and "canonical" in (attrs.get("rel") or "").lower():
+            self.canonical_url = (attrs.get("href") or "")[:HTML_SUMMARY_MAX_TEXT]
+        elif tag in self._section_depth:
+            self._section_depth[tag] += 1
+        elif tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self._in_structured_data = (
+                len(self.structured_data) < HTML_SUMMARY_MAX_STRUCTURED_BLOCKS
+            )
+            self._start_capture("structured_data")
+            return
+
+        if tag in HTML_SUMMARY_SKIPPED_TAGS:
+            self._skipped_depth += 1
+        elif tag == "title" and not self.title:
+            self._start_capture("title")
+        elif tag in ("h1", "h2", "h3"):
+            self._start_capture(tag)
+        elif tag == "a" and self._section:
+            self._link_href = attrs.get("href") or ""
+            self._start_capture("a")
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags never open a section or a capture
+        if tag in ("meta", "link", "html"):
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in self._section_depth:
+            self._section_depth[tag] = max(self._section_depth[tag] - 1, 0)
+        elif tag == "script" and self._capture == "structured_data":
+            if self._in_structured_data:
+                data = " ".join("".join(self._captured_text).split())
+                if data:
+                    self.structured_data.append(data[:HTML_SUMMARY_MAX_STRUCTURED_DATA])
+            self._in_structured_data = False
+            self._capture = None
+            return
+
+        if tag in HTML_SUMMARY_SKIPPED_TAGS:
+            self._skipped_depth = max(self._skipped_depth - 1, 0)
+        elif tag == self._capture:
+            self._end_capture()
+
+    def handle_data(self, data):
+        if self._capture == "structured_data":
+            if self._in_structured_data:
+                self._captured_text.append(data)
+        elif self._capture and not self._skipped_depth:
+            self._captured_text.append(data)
+
+    @property
+    def _section(self):
+        if self._section_depth["nav"]:
+            return "nav"
+        if self._section_depth["footer"]:
+            return "footer"
+        return None
+
+    def _add_meta(self, attrs):
+        name = (attrs.get("name") or attrs.get("property") or "").lower()
+        content = " ".join((attrs.get("content") or "").split())
+        if not name or not content or len(self.meta) >= HTML_SUMMARY_MAX_ITEMS:
+            return
+
+        if name in HTML_SUMMARY_META_NAMES or name.startswith(HTML_SUMMARY_META_PREFIXES):
+            self.meta.append((name, content[:HTML_SUMMARY_MAX_TEXT]))
+
+    def _start_capture(self, capture):
+        self._capture = capture
+        self._captured_text = []
+
+    def _end_capture(self):
+        text = " ".join("".join(self._captured_text).split())[:HTML_SUMMARY_MAX_TEXT]
+        capture, self._capture, self._captured_text = self._capture, None, []
+        if not text:
+            return
+
+        if capture == "title":
+            self.title = text
+        elif capture == "a":
+            links = self.links[self._section or "nav"]
+            if len(links) < HTML_SUMMARY_MAX_ITEMS:
+                links.append((text, self._link_href[:HTML_SUMMARY_MAX_TEXT]))
+        elif len(self.headings) < HTML_SUMMARY_MAX_ITEMS:
+            self.headings.append((capture, text))
 
+    def get_summary(self):
+        lines = []
+        if self.language:
+            lines.append(f"Language: {self.language}")
+        if self.title:
+            lines.append(f"Title: {self.title}")
+        if self.canonical_url:
+            lines.append(f"Canonical URL: {self.canonical_url}")
+        if self.meta:
+            lines.append("Meta tags:")
+            lines.extend(f"- {name}: {content}" for name, content in self.meta)
+        if self.headings:
+            lines.append("Headings:")
+            lines.extend(f"- {level}: {text}" for level, text in self.headings)
+        for section, label in (("nav", "Navigation links"), ("footer", "Footer links")):
+            if self.links[section]:
+                lines.append(f"{label}:")
+                lines.extend(f"- {text} ({href})" for text, href in self.links[section])
+        if self.structured_data:
+            lines.append("Structured data (JSON-LD):")
+            lines.extend(self.structured_data)
 
-def get_html_content(url):
-    html_content = ""
+        return "\n".join(lines)[:HTML_SUMMARY_MAX_CHARS]
+
+
+def iter_response_text(response, max_chars, chunk_size=64 * 1024):
+    """Decoded text of a streamed response in chunks, stopping after about `max_chars`."""
+    chars_left = max_chars
+    for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+        yield chunk
+        chars_left -= len(chunk)
+        if chars_left <= 0:
+            break
+
+
+def summarize_html(html_chunks):
+    """Summarize HTML given as an iterable of text chunks, see HTMLSummaryParser."""
+    parser = HTMLSummaryParser()
+    for chunk in html_chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.get_summary()
+
+
+def get_html_summary(url, force_refresh=False):
+    """
+    Fetch a url and return the bounded summary of its HTML built by HTMLSummaryParser.
+
+    The body is streamed into the parser, so the raw page is never held in memory, and
+    reading stops after HTML_SUMMARY_MAX_INPUT_CHARS. Summaries are cached like other
+    scraped pages and revalidated with a conditional request once they go stale, or right
+    away with `force_refresh` (e.g. when a user asks for a scan).
+    """
+    cache_key = get_scrape_cache_key("html_summary", url)
+    cached_page = get_scraped_page(cache_key)
+    if cached_page and not force_refresh and is_scraped_page_fresh(cached_page):
+        return cached_page["content"]
+
+    html_summary = ""
     try:
-        html_response = requests.get(url, timeout=30)
-        html_response.raise_for_status()
-        html_content = html_response.text
+        with get_http_client("scraper").get(
+            url, headers=get_revalidation_headers(cached_page), stream=True
+        ) as html_response:
+            if html_response.status_code == 304 and cached_page:
+                cached_page["fetched_at"] = time.time()
+                save_scraped_page(cache_key, cached_page)
+                return cached_page["content"]
+
+            html_response.raise_for_status()
+            if html_response.encoding is None:
+                html_response.encoding = "utf-8"
+
+            html_summary = summarize_html(
+                iter_response_text(html_response, HTML_SUMMARY_MAX_INPUT_CHARS)
+            )
+
+        if html_summary:
+            save_scraped_page(cache_key, build_scraped_page(html_response, html_summary))
     except requests.exceptions.RequestException as e:
         logger.warning(
-            "[Get HTML Content] Could not fetch HTML content",
+            "[Get HTML Summary] Could not fetch HTML content",
             exc_info=e,
             error=str(e),
             url=url,
+            has_stale_copy=bool(cached_page),
         )
+        if cached_page:
+            html_summary = cached_page["content"]
     except Exception as e:
         logger.warning(
-            "[Get HTML Content] Unexpected error",
+            "[Get HTML Summary] Unexpected error",
             exc_info=e,
             error=str(e),
             url=url,
         )
 
-    return html_content
+    return html_summary
 
 
-def get_markdown_content(url):
+def get_markdown_content(url, force_refresh=False):
+    """
+    Fetch title, description and markdown for a url via Jina Reader.
+
+    Results are cached per url, so the same page scraped for several projects (shared
+    competitors, backfills) only costs one Jina call per freshness window. Scans a user
+    asks for pass `force_refresh` to revalidate the cached copy regardless of its age.
+    """
+    cache_key = get_scrape_cache_key("markdown", url)
+    cached_page = get_scraped_page(cache_key)
+    if cached_page and not force_refresh and is_scraped_page_fresh(cached_page):
+        return cached_page["title"], cached_page["description"], cached_page["content"]
+
     jina_url = f"https://r.jina.ai/{url}"
     headers = {
         "Accept": "application/json",
         "Authorization": f"Bearer {settings.JINA_READER_API_KEY}",
+        **get_revalidation_headers(cached_page),
     }
 
     try:
-        response = requests.get(jina_url, headers=headers, timeout=30)
+        response = get_http_client("jina_reader").get(jina_url, headers=headers)
+
+        if response.status_code == 304 and cached_page:
+            cached_page["fetched_at"] = time.time()
+            save_scraped_page(cache_key, cached_page)
+            return cached_page["title"], cached_page["description"], cached_page["content"]
+
         response.raise_for_status()
 
         data = response.json().get("data", {})
@@ -117,16 +1062,66 @@ def get_markdown_content(url):
             url=url,
         )
 
-        return (
-            data.get("title", "")[:500],
-            data.get("description", ""),
-            data.get("content", ""),
-        )
+        title = data.get("title", "")[:500]
+        description = data.get("description", "")
+        markdown_content = data.get("content", "")
+
+        if markdown_content:
+            save_scraped_page(
+                cache_key,
+                build_scraped_page(response, markdown_content, title, description),
+            )
+
+        return title, description, markdown_content
 
     except requests.exceptions.RequestException as e:
+        if cached_page:
+            logger.warning(
+                "Error fetching content from Jina Reader, using stale copy",
+                error=str(e),
+                url=url,
+            )
+            return cached_page["title"], cached_page["description"], cached_page["content"]
+
         logger.error(
             "Error fetching content from Jina Reader",
             error=str(e),
             url=url,
         )
         raise e
+
+
+def get_month_number(month):
+    """Month number (1-12) for a name, abbreviation or number, None if it isn't one."""
+    month = str(month).strip().lower()
+    if month.isdigit():
+        return int(month) if 1 <= int(month) <= 12 else None
+
+    for number in range(1, 13):
+        if month in (calendar.month_name[number].lower(), calendar.month_abbr[number].lower()):
+            return number
+    return None
+
+
+def build_trend_series(trend_items, length):
+    """
+    Compact a keyword's monthly trend into the values of its `length` most recent months,
+    oldest first. Months missing inside that window count as zero.
+
+    `trend_items` are (year, month, value) tuples in any order. Returns the first day of the
+    first month in the series (or None) and the list of values.
+    """
+    values_by_month = {}
+    for year, month, value in trend_items:
+        month_number = get_month_number(month)
+        if month_number is not None:
+            values_by_month[int(year) * 12 + month_number - 1] = int(value)
+
+    if not values_by_month:
+        return None, []
+
+    last_month = max(values_by_month)
+    first_month = max(min(values_by_month), last_month - length + 1)
+    series = [values_by_month.get(month, 0) for month in range(first_month, last_month + 1)]
+
+    return date(first_month // 12, first_month % 12 + 1, 1), series
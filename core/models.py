@@ -1,56 +1,113 @@
+import calendar
+import contextvars
+import queue
+import random
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
 from decimal import Decimal, InvalidOperation
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import requests
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models, transaction
+from django.core.cache import caches
+from django.db import DatabaseError, models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.text import slugify
 from django_q.tasks import async_task
-from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
+from redis.exceptions import RedisError
 
 from core.base_models import BaseModel
 from core.choices import (
     BlogPostStatus,
     Category,
     ContentType,
+    JobStatus,
     KeywordDataSource,
     Language,
     ProfileStates,
     ProjectPageType,
     ProjectStyle,
     ProjectType,
+    WorkflowKind,
+    WorkflowNodeStatus,
 )
 from core.model_utils import (
+    UPSTREAM_LATENCY_BOUNDS_MS,
+    build_trend_series,
+    estimate_latency_percentile,
     generate_random_key,
-    get_html_content,
+    get_agent_run_cache_key,
+    get_html_summary,
+    get_http_client,
     get_markdown_content,
+    pop_buffered_agent_runs,
+    pop_buffered_upstream_usage,
+    run_agent,
+    run_agent_streamed,
     run_agent_synchronously,
+    run_agents_concurrently,
+    schedule_on_agent_loop,
 )
 from core.prompts import (
-    GENERATE_CONTENT_SYSTEM_PROMPTS,
-    TITLE_SUGGESTION_SYSTEM_PROMPTS,
+    ANALYZE_PROJECT_PAGE_SYSTEM_PROMPT,
+    ANALYZE_PROJECT_SYSTEM_PROMPT,
+    EXTRACT_COMPETITORS_SYSTEM_PROMPT,
+    EXTRACT_LINKS_SYSTEM_PROMPT,
+    POPULATE_COMPETITOR_DETAILS_SYSTEM_PROMPT,
 )
 from core.schemas import (
-    BlogPostContent,
     BlogPostGenerationContext,
-    CompetitorAnalysis,
+    BlogPostMetadata,
+    BlogPostMetadataContext,
     CompetitorAnalysisContext,
     CompetitorDetails,
     ProjectDetails,
     ProjectPageContext,
-    ProjectPageDetails,
     TitleSuggestion,
     TitleSuggestionContext,
-    TitleSuggestions,
     WebPageContent,
 )
 from tuxseo.utils import get_tuxseo_logger
 
 logger = get_tuxseo_logger(__name__)
 
+KEYWORDS_EVERYWHERE_BATCH_SIZE = 100
+KEYWORD_TREND_SERIES_LENGTH = 12
+
+# How old a keyword's metrics may get, per refresh tier (see KeywordQuerySet.due_for_refresh)
+KEYWORD_REFRESH_MAX_AGE_BY_TIER = {
+    1: timedelta(days=7),
+    2: timedelta(days=30),
+    3: timedelta(days=90),
+}
+
+# Sortable keyword table columns: the field to sort on and the value used when it is missing
+PROJECT_KEYWORD_SORT_FIELDS = {
+    "keyword": ("keyword__keyword_text", Value("")),
+    "volume": ("keyword__volume", Value(0)),
+    "cpc": ("keyword__cpc_value", Value(Decimal("0.00"))),
+    "competition": ("keyword__competition", Value(0.0)),
+}
+
 
 class Profile(BaseModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -89,9 +146,76 @@ class Profile(BaseModel):
         help_text="The current state of the user's profile",
     )
 
+    # Denormalized usage counters behind the free plan quotas. They are kept in sync by
+    # core.signals and can be repaired with the reconcile_usage_counters command.
+    generated_blog_posts_count = models.PositiveIntegerField(default=0)
+    title_suggestions_count = models.PositiveIntegerField(default=0)
+
+    USAGE_COUNTER_FIELDS = ("generated_blog_posts_count", "title_suggestions_count")
+
     def __str__(self):
         return f"{self.user.username}"
 
+    def save(self, *args, **kwargs):
+        # Counters only change through atomic F() updates, so a full save of a stale
+        # instance (e.g. on every User save) must not write old values back.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.USAGE_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def update_usage_counters(project_id, **deltas):
+        """
+        Atomically add `deltas` (counter field -> change) to the profile owning a project.
+        """
+        Profile.objects.filter(projects__id=project_id).update(
+            **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+        )
+
+    @classmethod
+    def reconcile_usage_counters(cls):
+        """
+        Recount usage counters from the source tables and fix the ones that drifted.
+        Returns the number of profiles that were updated.
+        """
+        profiles = cls.objects.annotate(
+            actual_generated_blog_posts_count=Coalesce(
+                Subquery(
+                    GeneratedBlogPost.objects.filter(project__profile=OuterRef("pk"))
+                    .values("project__profile")
+                    .annotate(count=Count("id"))
+                    .values("count")
+                ),
+                0,
+            ),
+            actual_title_suggestions_count=Coalesce(
+                Subquery(
+                    BlogPostTitleSuggestion.objects.filter(project__profile=OuterRef("pk"))
+                    .values("project__profile")
+                    .annotate(count=Count("id"))
+                    .values("count")
+                ),
+                0,
+            ),
+        ).exclude(
+            generated_blog_posts_count=F("actual_generated_blog_posts_count"),
+            title_suggestions_count=F("actual_title_suggestions_count"),
+        )
+
+        drifted_profiles = []
+        for profile in profiles:
+            profile.generated_blog_posts_count = profile.actual_generated_blog_posts_count
+            profile.title_suggestions_count = profile.actual_title_suggestions_count
+            drifted_profiles.append(profile)
+
+        cls.objects.bulk_update(drifted_profiles, cls.USAGE_COUNTER_FIELDS, batch_size=500)
+
+        return len(drifted_profiles)
+
     def track_state_change(self, to_state, metadata=None):
         async_task(
             "core.tasks.track_state_change",
@@ -103,12 +227,48 @@ class Profile(BaseModel):
             group="Track State Change",
         )
 
+    @property
+    def entitlement_cache_key(self):
+        return f"profile:{self.id}"
+
+    @cached_property
+    def entitlement(self):
+        """
+        Subscription state resolved once per instance and shared across requests through the
+        "entitlements" cache. Refreshed with `refresh_entitlement` whenever it changes.
+        """
+        try:
+            entitlement = caches["entitlements"].get(self.entitlement_cache_key)
+        except RedisError as e:
+            logger.warning("[Entitlement] Failed to read from cache", error=str(e), id=self.id)
+            entitlement = None
+
+        if entitlement is None:
+            latest_state = (
+                self.state_transitions.order_by("-created_at")
+                .values_list("to_state", flat=True)
+                .first()
+            )
+            entitlement = {"current_state": latest_state or ProfileStates.STRANGER}
+            try:
+                caches["entitlements"].set(self.entitlement_cache_key, entitlement)
+            except RedisError as e:
+                logger.warning("[Entitlement] Failed to write to cache", error=str(e), id=self.id)
+
+        return entitlement
+
+    def refresh_entitlement(self):
+        self.__dict__.pop("entitlement", None)
+        try:
+            caches["entitlements"].delete(self.entitlement_cache_key)
+        except RedisError as e:
+            logger.warning("[Entitlement] Failed to clear cache", error=str(e), id=self.id)
+
+        return self.entitlement
+
     @property
     def current_state(self):
-        if not self.state_transitions.all().exists():
-            return ProfileStates.STRANGER
-        latest_transition = self.state_transitions.latest("created_at")
-        return latest_transition.to_state
+        return self.entitlement["current_state"]
 
     @property
     def has_active_subscription(self):
@@ -118,12 +278,13 @@ class Profile(BaseModel):
                 ProfileStates.SUBSCRIBED,
                 ProfileStates.CANCELLED,
             ]
+            # Read from the user rather than cached, so admin changes apply immediately
             or self.user.is_superuser
         )
 
     @property
     def has_product_or_subscription(self):
-        return self.product is not None or self.subscription is not None
+        return self.product_id is not None or self.subscription_id is not None
 
     @property
     def number_of_active_projects(self):
@@ -131,13 +292,18 @@ class Profile(BaseModel):
 
     @property
     def number_of_generated_blog_posts(self):
-        projects = self.projects.all()
-        return sum(project.generated_blog_posts.count() for project in projects)
+        return self.generated_blog_posts_count
 
     @property
     def number_of_title_suggestions(self):
-        projects = self.projects.all()
-        return sum(project.blog_post_title_suggestions.count() for project in projects)
+        return self.title_suggestions_count
+
+    @property
+    def agent_spend_this_month(self):
+        """USD spent on agent runs this calendar month, from the monthly rollup."""
+        month = timezone.localdate().replace(day=1)
+        cost = self.agent_usage.filter(month=month).values_list("cost", flat=True).first()
+        return cost or Decimal(0)
 
     @property
     def reached_content_generation_limit(self):
@@ -180,6 +346,53 @@ class BlogPost(BaseModel):
         return reverse("blog_post", kwargs={"slug": self.slug})
 
 
+class ProjectQuerySet(models.QuerySet):
+    def with_auto_submission_schedule(self):
+        """
+        Projects that post blog posts automatically, with what `next_auto_post_at` needs
+        annotated from their latest AutoSubmissionSetting and last posted blog post.
+        """
+        latest_setting = AutoSubmissionSetting.objects.filter(project=OuterRef("pk")).order_by(
+            "-created_at"
+        )
+        last_posted = GeneratedBlogPost.objects.filter(
+            project=OuterRef("pk"), posted=True, date_posted__isnull=False
+        ).order_by("-date_posted")
+
+        return (
+            self.filter(enable_automatic_post_submission=True, profile__experimental_features=True)
+            .only("id", "name")
+            .annotate(
+                posts_per_month=Subquery(latest_setting.values("posts_per_month")[:1]),
+                preferred_time=Subquery(latest_setting.values("preferred_time")[:1]),
+                preferred_timezone=Subquery(latest_setting.values("preferred_timezone")[:1]),
+                auto_submission_since=Subquery(latest_setting.values("created_at")[:1]),
+                last_posted_at=Subquery(last_posted.values("date_posted")[:1]),
+            )
+            .filter(posts_per_month__gt=0)
+        )
+
+    def due_for_auto_post(self, now):
+        """
+        Projects whose next automatic post should be generated or posted by `now`, leaving
+        out those that already have a post generated and waiting for its slot.
+        """
+        return (
+            self.filter(
+                enable_automatic_post_submission=True,
+                profile__experimental_features=True,
+                next_auto_post_generate_at__lte=now,
+            )
+            .only("id", "name", "next_auto_post_at")
+            .annotate(
+                has_post_ready=Exists(
+                    GeneratedBlogPost.objects.filter(project=OuterRef("pk"), posted=False)
+                )
+            )
+            .filter(Q(next_auto_post_at__lte=now) | Q(has_post_ready=False))
+        )
+
+
 class Project(BaseModel):
     profile = models.ForeignKey(
         Profile, null=True, blank=True, on_delete=models.CASCADE, related_name="projects"
@@ -215,6 +428,15 @@ class Project(BaseModel):
     )
     proposed_keywords = models.TextField(blank=True)
     location = models.CharField(max_length=50, default="Global")
+    # Calendar of automatic posts, filled in by `fill_auto_post_calendar` and cleared when
+    # the settings or the last posted post change
+    next_auto_post_at = models.DateTimeField(null=True, blank=True)
+    next_auto_post_generate_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["next_auto_post_generate_at"])]
 
     def __str__(self):
         return self.name
@@ -276,12 +498,157 @@ class Project(BaseModel):
     def has_auto_submission_setting(self):
         return self.auto_submission_settings.exists()
 
-    def get_page_content(self):
+    def get_next_auto_post_at(self):
+        """
+        When the next blog post is due, on projects from `with_auto_submission_schedule`.
+
+        Posts are spread evenly over the current month, `posts_per_month` at a time, and the
+        first one is due as soon as automatic submission is set up. Either way the post
+        waits for the preferred time of day.
+        """
+        if self.last_posted_at is None:
+            earliest = self.auto_submission_since
+        else:
+            days_in_month = calendar.monthrange(timezone.now().year, timezone.now().month)[1]
+            earliest = self.last_posted_at + timedelta(days=days_in_month) / self.posts_per_month
+
+        return AutoSubmissionSetting.next_post_at(
+            earliest, self.preferred_time, self.preferred_timezone
+        )
+
+    @classmethod
+    def fill_auto_post_calendar(cls):
+        """
+        Work out the next post of projects that post automatically and have none scheduled.
+
+        Each post is generated at a random time in the AUTO_POST_PREGENERATION_HOURS before
+        its slot, so generation is spread over the day rather than bunched on popular
+        preferred times, and posting at the slot is just a submission.
+        """
+        projects = list(
+            cls.objects.with_auto_submission_schedule().filter(next_auto_post_at__isnull=True)
+        )
+        for project in projects:
+            project.next_auto_post_at = project.get_next_auto_post_at()
+            project.next_auto_post_generate_at = project.next_auto_post_at - timedelta(
+                hours=random.uniform(1, settings.AUTO_POST_PREGENERATION_HOURS)
+            )
+
+        cls.objects.bulk_update(
+            projects, ["next_auto_post_at", "next_auto_post_generate_at"], batch_size=500
+        )
+        return len(projects)
+
+    @staticmethod
+    def clear_auto_post_calendar(project_id):
+        """Have the next automatic post of a project worked out again on the next run."""
+        Project.objects.filter(id=project_id).update(
+            next_auto_post_at=None, next_auto_post_generate_at=None
+        )
+
+    def get_keywords_page(
+        self,
+        sort="volume",
+        descending=True,
+        has_volume=None,
+        use=None,
+        search="",
+        after=None,
+        page_size=50,
+    ):
+        """
+        One page of the project's keywords, sorted and filtered in the database.
+
+        Pages are keyed on the (sort value, id) of the last row seen, passed back in as
+        `after`. Missing metrics sort as zero. Returns the project keywords and the key to
+        continue from, or None on the last page.
+        """
+        sort_field, missing_value = PROJECT_KEYWORD_SORT_FIELDS[sort]
+
+        project_keywords = self.project_keywords.select_related("keyword").annotate(
+            sort_value=Coalesce(sort_field, missing_value)
+        )
+
+        if has_volume is True:
+            project_keywords = project_keywords.filter(keyword__volume__gt=0)
+        elif has_volume is False:
+            project_keywords = project_keywords.filter(
+                Q(keyword__volume__isnull=True) | Q(keyword__volume=0)
+            )
+        if use is not None:
+            project_keywords = project_keywords.filter(use=use)
+        if search:
+            project_keywords = project_keywords.filter(keyword__keyword_text__icontains=search)
+
+        if after is not None:
+            after_value, after_id = after
+            if descending:
+                project_keywords = project_keywords.filter(
+                    Q(sort_value__lt=after_value) | Q(sort_value=after_value, id__lt=after_id)
+                )
+            else:
+                project_keywords = project_keywords.filter(
+                    Q(sort_value__gt=after_value) | Q(sort_value=after_value, id__gt=after_id)
+                )
+
+        ordering = ("-sort_value", "-id") if descending else ("sort_value", "id")
+        project_keywords = list(project_keywords.order_by(*ordering)[: page_size + 1])
+
+        if len(project_keywords) > page_size:
+            project_keywords = project_keywords[:page_size]
+            last = project_keywords[-1]
+            return project_keywords, (last.sort_value, last.id)
+        return project_keywords, None
+
+    @property
+    def onboarding_workflow(self):
+        return self.workflows.filter(kind=WorkflowKind.ONBOARDING).order_by("-id").first()
+
+    def get_monthly_agent_spend(self, months=12):
+        """
+        Agent runs, tokens and USD cost per calendar month over the last `months` months,
+        oldest first.
+        """
+        start = timezone.localdate().replace(day=1)
+        for _ in range(months - 1):
+            start = (start - timedelta(days=1)).replace(day=1)
+
+        return list(
+            self.agent_runs.filter(
+                created_at__gte=timezone.make_aware(datetime.combine(start, time.min))
+            )
+            .annotate(month=TruncMonth("created_at"))
+            .values("month")
+            .annotate(runs=Count("id"), total_tokens=Sum("total_tokens"), cost=Sum("cost"))
+            .order_by("month")
+        )
+
+    def get_title_suggestions_page(self, status, after_id=0, page_size=20):
+        """
+        One page of the suggestions shown under `status` on the project page, keyed on the
+        last seen id so cards moved between lists don't shift the following pages.
+
+        Returns the suggestions and the id to continue from, or None on the last page.
+        """
+        suggestions = list(
+            self.blog_post_title_suggestions.with_generated_posts_overview()
+            .with_list_status(status)
+            .filter(id__gt=after_id)
+            .order_by("id")[: page_size + 1]
+        )
+        if len(suggestions) > page_size:
+            suggestions = suggestions[:page_size]
+            return suggestions, suggestions[-1].id
+        return suggestions, None
+
+    def get_page_content(self, page_content=None):
         """
         Fetch page content using Jina Reader API and update the project.
         Returns the content if successful, raises ValueError otherwise.
+
+        `page_content` takes an already fetched (title, description, markdown) tuple.
         """
-        title, description, markdown_content = get_markdown_content(self.url)
+        title, description, markdown_content = page_content or get_markdown_content(self.url)
 
         if not markdown_content:
             logger.error(
@@ -306,28 +673,42 @@ class Project(BaseModel):
 
         return True
 
-    def analyze_content(self):
+    def analyze_content(self, html_content=None):
         """
         Analyze the page content using PydanticAI and update project details.
-        Should be called after get_page_content().
+        Should be called after get_page_content(). `html_content` is the page's HTML
+        summary (see get_html_summary), fetched here when not given.
         """
         from core.agents.analyze_project_agent import analyze_project_agent
 
-        html_content = get_html_content(self.url)
+        if html_content is None:
+            html_content = get_html_summary(self.url)
 
+        prompt = "Please analyze this web page content and extract the key information."
+        deps = WebPageContent(
+            title=self.title,
+            description=self.description,
+            markdown_content=self.markdown_content,
+            html_content=html_content,
+        )
         result = run_agent_synchronously(
             analyze_project_agent,
-            "Please analyze this web page content and extract the key information.",
-            deps=WebPageContent(
-                title=self.title,
-                description=self.description,
-                markdown_content=self.markdown_content,
-                html_content=html_content,
-            ),
+            prompt,
+            deps=deps,
             function_name="analyze_content",
             model_name="Project",
+            cache_key=get_agent_run_cache_key(
+                "Project.analyze_content",
+                analyze_project_agent,
+                prompt,
+                deps,
+                system_prompt=ANALYZE_PROJECT_SYSTEM_PROMPT,
+            ),
         )
 
+        if not result:
+            return False
+
         self.name = result.data.name
         self.type = result.data.type
         self.summary = result.data.summary
@@ -344,120 +725,13 @@ class Project(BaseModel):
         self.date_analyzed = timezone.now()
         self.save()
 
-        async_task("core.tasks.generate_blog_post_suggestions", self.id)
-        async_task("core.tasks.process_project_keywords", self.id)
-        async_task("core.tasks.schedule_project_page_analysis", self.id)
-        async_task("core.tasks.schedule_project_competitor_analysis", self.id, timeout=180)
+        Workflow.start_onboarding(self)
 
         return True
 
-    def generate_title_suggestions(  # noqa: C901
-        self, content_type=ContentType.SHARING, num_titles=3, user_prompt=""
-    ):
-        agent = Agent(
-            "google-gla:gemini-2.5-flash",
-            output_type=TitleSuggestions,
-            deps_type=TitleSuggestionContext,
-            system_prompt=TITLE_SUGGESTION_SYSTEM_PROMPTS[content_type],
-            retries=2,
-            model_settings={"temperature": 0.9},
-        )
-
-        @agent.system_prompt
-        def add_todays_date() -> str:
-            return f"Today's Date: {timezone.now().strftime('%Y-%m-%d')}"
-
-        @agent.system_prompt
-        def add_project_details(ctx: RunContext[TitleSuggestionContext]) -> str:
-            project = ctx.deps.project_details
-            return f"""
-                Project Details:
-                - Project Name: {project.name}
-                - Project Type: {project.type}
-                - Project Summary: {project.summary}
-                - Blog Theme: {project.blog_theme}
-                - Founders: {project.founders}
-                - Key Features: {project.key_features}
-                - Target Audience: {project.target_audience_summary}
-                - Pain Points: {project.pain_points}
-                - Product Usage: {project.product_usage}
-            """
-
-        @agent.system_prompt
-        def add_number_of_titles_to_generate(ctx: RunContext[TitleSuggestionContext]) -> str:
-            return f"""IMPORTANT: Generate only {ctx.deps.num_titles} titles."""
-
-        @agent.system_prompt
-        def add_language_specification(ctx: RunContext[TitleSuggestionContext]) -> str:
-            project = ctx.deps.project_details
-            return f"""
-                IMPORTANT: Generate all titles in {project.language} language.
-                Make sure the titles are grammatically correct and culturally
-                appropriate for {project.language}-speaking audiences.
-            """
-
-        @agent.system_prompt
-        def add_user_prompt(ctx: RunContext[TitleSuggestionContext]) -> str:
-            if not ctx.deps.user_prompt:
-                return ""
-
-            return f"""
-                IMPORTANT USER REQUEST: The user has specifically requested the following:
-                "{ctx.deps.user_prompt}"
-
-                This is a high-priority requirement. Make sure to incorporate this guidance
-                when generating titles while still maintaining SEO best practices and readability.
-            """
-
-        @agent.system_prompt
-        def add_feedback_history(ctx: RunContext[TitleSuggestionContext]) -> str:
-            # Build the feedback sections only if they exist
-            feedback_sections = []
-
-            if ctx.deps.neutral_suggestions:
-                neutral = "\n".join(f"- {title}" for title in ctx.deps.neutral_suggestions)
-                feedback_sections.append(
-                    f"""
-                    Title Suggestions that users have not yet liked or disliked:
-                    {neutral}
-                """
-                )
-
-            if ctx.deps.liked_suggestions:
-                liked = "\n".join(f"- {title}" for title in ctx.deps.liked_suggestions)
-                feedback_sections.append(
-                    f"""
-                    Liked Title Suggestions:
-                    {liked}
-                """
-                )
-
-            if ctx.deps.disliked_suggestions:
-                disliked = "\n".join(f"- {title}" for title in ctx.deps.disliked_suggestions)
-                feedback_sections.append(
-                    f"""
-                    Disliked Title Suggestions:
-                    {disliked}
-                """
-                )
-
-            # Add guidance only if we have any feedback
-            if feedback_sections:
-                feedback_sections.append(
-                    """
-                    Use this feedback to guide your title generation.
-                    Create titles that are thematically similar to the "Liked" titles,
-                    and avoid any stylistic or thematic patterns from the "Disliked" titles.
-
-                    IMPORTANT!
-                    You must generate completely new and unique titles.
-                    Do not repeat or create minor variations of any titles listed above in the
-                    "Previously Generated", "Liked", or "Disliked" sections.
-                    Your primary goal is originality.
-                    """
-                )
-
-            return "\n".join(feedback_sections)
+    def get_title_suggestions_agent_run(self, content_type, num_titles=3, user_prompt=""):
+        """Keyword arguments of `run_agent` for one batch of title suggestions."""
+        from core.agents.title_suggestions_agent import title_suggestions_agents
 
         deps = TitleSuggestionContext(
             project_details=self.project_details,
@@ -470,14 +744,50 @@ class Project(BaseModel):
             neutral_suggestions=[suggestion.title for suggestion in self.neutral_title_suggestions],
         )
 
+        return {
+            "agent": title_suggestions_agents[content_type],
+            "input_string": (
+                "Please generate blog post title suggestions based on the project details."
+            ),
+            "deps": deps,
+            "function_name": "generate_title_suggestions",
+            "model_name": "Project",
+        }
+
+    def generate_title_suggestions(
+        self, content_type=ContentType.SHARING, num_titles=3, user_prompt=""
+    ):
         result = run_agent_synchronously(
-            agent,
-            "Please generate blog post title suggestions based on the project details.",
-            deps=deps,
-            function_name="generate_title_suggestions",
-            model_name="Project",
+            **self.get_title_suggestions_agent_run(content_type, num_titles, user_prompt)
+        )
+        return self.save_title_suggestions(result, content_type, user_prompt)
+
+    def generate_title_suggestions_concurrently(self, content_types, num_titles=3):
+        """
+        Generate title suggestions for several content types at once, one agent run each.
+        Content types whose run failed are skipped.
+        """
+        results = run_agents_concurrently(
+            [
+                self.get_title_suggestions_agent_run(content_type, num_titles)
+                for content_type in content_types
+            ]
         )
 
+        suggestions = []
+        for content_type, result in zip(content_types, results, strict=True):
+            if result is None:
+                logger.warning(
+                    "[Generate Title Suggestions] Agent run failed",
+                    project_id=self.id,
+                    content_type=content_type,
+                )
+                continue
+            suggestions.extend(self.save_title_suggestions(result, content_type))
+
+        return suggestions
+
+    def save_title_suggestions(self, result, content_type, user_prompt=""):
         with transaction.atomic():
             suggestions = []
             for title in result.data.titles:
@@ -493,104 +803,40 @@ class Project(BaseModel):
                 )
                 suggestions.append(suggestion)
 
-            return BlogPostTitleSuggestion.objects.bulk_create(suggestions)
+            suggestions = BlogPostTitleSuggestion.objects.bulk_create(suggestions)
 
-    def get_a_list_of_links(self):
-        agent = Agent(
-            "google-gla:gemini-2.5-flash",
-            output_type=list[str],
-            system_prompt="""
-                You are an expert link extractor.
-                Extract all the links from the text provided.
-            """,
-            retries=2,
-        )
+            # bulk_create skips the post_save signal that maintains the counter
+            Profile.update_usage_counters(self.id, title_suggestions_count=len(suggestions))
 
-        @agent.system_prompt
-        def add_links(ctx: RunContext[list[str]]) -> str:
-            return f"Links: {ctx.deps}"
+            return suggestions
+
+    def get_a_list_of_links(self):
+        from core.agents.extract_links_agent import extract_links_agent
 
+        prompt = "Please extract all the links from the text provided."
+        deps = self.links
         result = run_agent_synchronously(
-            agent,
-            "Please extract all the links from the text provided.",
-            deps=self.links,
+            extract_links_agent,
+            prompt,
+            deps=deps,
             function_name="get_a_list_of_links",
             model_name="Project",
+            cache_key=get_agent_run_cache_key(
+                "Project.get_a_list_of_links",
+                extract_links_agent,
+                prompt,
+                deps,
+                system_prompt=EXTRACT_LINKS_SYSTEM_PROMPT,
+            ),
         )
 
         return result.data
 
     def find_competitors(self):
-        model = OpenAIModel(
-            "sonar",
-            provider=OpenAIProvider(
-                base_url="https://api.perplexity.ai",
-                api_key=settings.PERPLEXITY_API_KEY,
-            ),
-        )
-        agent = Agent(
-            model,
-            deps_type=ProjectDetails,
-            output_type=str,
-            system_prompt="""
-                You are a helpful assistant that helps me find competitors for my project.
-            """,
-            retries=2,
-        )
-
-        @agent.system_prompt
-        def add_project_details(ctx: RunContext[ProjectDetails]) -> str:
-            project = ctx.deps
-            return f"""I'm working on a project which has the following attributes:
-                Name:
-                {project.name}
-
-                Summary:
-                {project.summary}
-
-                Key Features:
-                {project.key_features}
-
-                Target Audience:
-                {project.target_audience_summary}
-
-                Pain Points Addressed:
-                {project.pain_points}
-
-                Language: {project.language}
-            """
-
-        @agent.system_prompt
-        def required_data() -> str:
-            return "Make sure that each competitor has a name, url, and description."
-
-        @agent.system_prompt
-        def number_of_competitors() -> str:
-            return "Give me a list of at least 20 competitors."
-
-        @agent.system_prompt
-        def language_specification(ctx: RunContext[ProjectDetails]) -> str:
-            project = ctx.deps
-            return f"""
-                IMPORTANT: Be mindful that competitors are likely to speak in
-                {project.language} language.
-            """
-
-        @agent.system_prompt
-        def location_specification(ctx: RunContext[ProjectDetails]) -> str:
-            project = ctx.deps
-            if project.location != "Global":
-                return f"""
-                    IMPORTANT: Only return competitors whose target audience is in
-                    {project.location}.
-                """
-            else:
-                return """
-                    IMPORTANT: Return competitors from all over the world.
-                """
+        from core.agents.find_competitors_agent import find_competitors_agent
 
         result = run_agent_synchronously(
-            agent,
+            find_competitors_agent,
             "Give me a list of sites that might be considered my competition.",
             deps=self.project_details,
             function_name="find_competitors",
@@ -603,26 +849,23 @@ class Project(BaseModel):
         return result.data
 
     def get_and_save_list_of_competitors(self):
-        agent = Agent(
-            "google-gla:gemini-2.5-flash",
-            output_type=list[CompetitorDetails],
-            system_prompt="""
-                You are an expert data extractor.
-                Extract all the data from the text provided.
-            """,
-            retries=2,
-        )
-
-        @agent.system_prompt
-        def add_competitors(ctx: RunContext[list[CompetitorDetails]]) -> str:
-            return f"Here are the competitors: {ctx.deps}"
+        from core.agents.extract_competitors_agent import extract_competitors_agent
 
+        prompt = "Please extract all the competitors from the text provided."
+        deps = self.competitors_list
         result = run_agent_synchronously(
-            agent,
-            "Please extract all the competitors from the text provided.",
-            deps=self.competitors_list,
+            extract_competitors_agent,
+            prompt,
+            deps=deps,
             function_name="get_and_save_list_of_competitors",
             model_name="Project",
+            cache_key=get_agent_run_cache_key(
+                "Project.get_and_save_list_of_competitors",
+                extract_competitors_agent,
+                prompt,
+                deps,
+                system_prompt=EXTRACT_COMPETITORS_SYSTEM_PROMPT,
+            ),
         )
 
         competitors = []
@@ -641,6 +884,39 @@ class Project(BaseModel):
         return competitors
 
 
+class BlogPostTitleSuggestionQuerySet(models.QuerySet):
+    def with_generated_posts_overview(self):
+        """
+        Flag suggestions that have a published post and prefetch their generated posts
+        without the article bodies.
+        """
+        return self.annotate(
+            has_posted_post=Exists(
+                GeneratedBlogPost.objects.filter(title=OuterRef("pk"), posted=True)
+            )
+        ).prefetch_related(
+            Prefetch(
+                "generated_blog_posts",
+                queryset=GeneratedBlogPost.objects.overview(),
+                to_attr="generated_posts_overview",
+            )
+        )
+
+    def with_list_status(self, status):
+        """
+        Filter to one of the lists shown on the project page: "posted" ideas have a published
+        post, the rest are split into "archived" and "active".
+        Expects `with_generated_posts_overview` to have been applied.
+        """
+        if status == "posted":
+            return self.filter(has_posted_post=True)
+        if status == "archived":
+            return self.filter(has_posted_post=False, archived=True)
+        if status == "active":
+            return self.filter(has_posted_post=False, archived=False)
+        raise ValueError(f"Unknown suggestion list status: {status}")
+
+
 class BlogPostTitleSuggestion(BaseModel):
     project = models.ForeignKey(
         Project,
@@ -674,9 +950,24 @@ class BlogPostTitleSuggestion(BaseModel):
 
     archived = models.BooleanField(default=False)
 
+    objects = BlogPostTitleSuggestionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["project", "archived"])]
+
     def __str__(self):
         return f"{self.project.name}: {self.title}"
 
+    @cached_property
+    def first_generated_post(self):
+        """
+        First post generated for this suggestion, loaded without its content. Uses the
+        prefetch from `with_generated_posts_overview` when it was applied.
+        """
+        if hasattr(self, "generated_posts_overview"):
+            return next(iter(self.generated_posts_overview), None)
+        return self.generated_blog_posts.overview().first()
+
     @property
     def title_suggestion(self):
         return TitleSuggestion(
@@ -687,127 +978,7 @@ class BlogPostTitleSuggestion(BaseModel):
             suggested_meta_description=self.suggested_meta_description,
         )
 
-    def generate_content(self, content_type=ContentType.SHARING):
-        agent = Agent(
-            "google-gla:gemini-2.5-flash",
-            output_type=BlogPostContent,
-            deps_type=BlogPostGenerationContext,
-            system_prompt=GENERATE_CONTENT_SYSTEM_PROMPTS[content_type],
-            retries=2,
-            model_settings={"max_tokens": 65500, "temperature": 0.8},
-        )
-
-        @agent.system_prompt
-        def add_todays_date() -> str:
-            return f"Today's Date: {timezone.now().strftime('%Y-%m-%d')}"
-
-        @agent.system_prompt
-        def add_project_details(ctx: RunContext[BlogPostGenerationContext]) -> str:
-            project = ctx.deps.project_details
-            return f"""
-                Project Details:
-                - Project Name: {project.name}
-                - Project Type: {project.type}
-                - Project Summary: {project.summary}
-                - Blog Theme: {project.blog_theme}
-                - Founders: {project.founders}
-                - Key Features: {project.key_features}
-                - Target Audience: {project.target_audience_summary}
-                - Pain Points: {project.pain_points}
-                - Product Usage: {project.product_usage}
-            """
-
-        @agent.system_prompt
-        def add_project_pages(ctx: RunContext[BlogPostGenerationContext]) -> str:
-            pages = ctx.deps.project_pages
-            if pages:
-                instruction = """
-                  Below is the list of page this project has. Can you insert them into
-                  the content you are about to generate where it makes sense.\n
-                """
-                for page in pages:
-                    instruction += f"""
-                      --------
-                      - Title: {page.title}
-                      - URL: {page.url}
-                      - Description: {page.description}
-                      - Summary: {page.summary}
-                      --------
-                    """
-                return instruction
-            else:
-                return ""
-
-        @agent.system_prompt
-        def add_title_details(ctx: RunContext[BlogPostGenerationContext]) -> str:
-            title = ctx.deps.title_suggestion
-            return f"""
-                This is the title suggestion gnerate by AI using project information:
-                - Title: {title.title}
-                - Description: {title.description}
-                - Category: {title.category}
-                - Target Keywords: {
-                ", ".join(title.target_keywords) if title.target_keywords else "None specified"
-            }
-                - Suggested Meta Description: {
-                title.suggested_meta_description
-                if title.suggested_meta_description
-                else "None specified"
-            }
-            """
-
-        @agent.system_prompt
-        def add_language_specification(ctx: RunContext[BlogPostGenerationContext]) -> str:
-            return f"""
-                IMPORTANT: Generate the content in {ctx.deps.project_details.language} language.
-                Make sure the content is grammatically correct and culturally appropriate for
-                {ctx.deps.project_details.language}-speaking audiences.
-            """
-
-        @agent.system_prompt
-        def add_target_keywords(ctx: RunContext[BlogPostGenerationContext]) -> str:
-            if ctx.deps.project_keywords:
-                keywords_list = ", ".join(ctx.deps.project_keywords)
-                return f"""
-                    Focus Keywords for SEO
-                    The user wants to focus on these specific keywords in the blog post:
-                    {keywords_list}
-
-                    Please incorporate these keywords naturally throughout the content where appropriate.
-                    Don't force them in, but use them when they fit contextually and help improve the readability and SEO value of the post.
-                """  # noqa: E501
-            else:
-                return ""
-
-        @agent.system_prompt
-        def valid_markdown_format() -> str:
-            return """
-                IMPORTANT: Generate the content in valid markdown format.
-                Make sure the content is formatted correctly with:
-                  - headings
-                  - paragraphs
-                  - lists
-                  - links
-            """
-
-        @agent.system_prompt
-        def post_structure() -> str:
-            return """
-                - Don't start with a title, header or a subheader (#, ##, ###). Instead start with a plain text as intro.
-                - Use '##' (h2 headers) for sections of the post where necessary.
-                - Don't use 3rd levle subheaders (###) or deeper. That should not be necessary for the post.
-            """  # noqa: E501
-
-        @agent.system_prompt
-        def filler_content() -> str:
-            return """
-                - Do not add content that needs to be filled in later.
-                - No placeholders either. This means no:
-                  - Image Suggestion: [Image]
-                  - Link Suggestion: [Link]
-                  ...
-             """
-
+    def get_blog_post_generation_context(self, content_type=ContentType.SHARING):
         project_pages = [
             ProjectPageContext(
                 url=page.url,
@@ -823,7 +994,7 @@ class BlogPostTitleSuggestion(BaseModel):
             for pk in self.project.project_keywords.filter(use=True).select_related("keyword")
         ]
 
-        deps = BlogPostGenerationContext(
+        return BlogPostGenerationContext(
             project_details=self.project.project_details,
             title_suggestion=self.title_suggestion,
             project_pages=project_pages,
@@ -831,10 +1002,13 @@ class BlogPostTitleSuggestion(BaseModel):
             project_keywords=project_keywords,
         )
 
+    def generate_content(self, content_type=ContentType.SHARING):
+        from core.agents.generate_content_agent import generate_content_agents
+
         result = run_agent_synchronously(
-            agent,
+            generate_content_agents[content_type],
             "Please generate an article based on the project details and title suggestions.",
-            deps=deps,
+            deps=self.get_blog_post_generation_context(content_type),
             function_name="generate_content",
             model_name="BlogPostTitleSuggestion",
         )
@@ -848,6 +1022,97 @@ class BlogPostTitleSuggestion(BaseModel):
             content=result.data.content,
         )
 
+    async def agenerate_content_metadata(self, content):
+        """
+        Description, slug and tags for generated content. Falls back to the ones this
+        suggestion already has if the model call fails, so a finished article is never lost.
+        """
+        from core.agents.generate_blog_post_metadata_agent import (
+            generate_blog_post_metadata_agent,
+        )
+
+        result = await run_agent(
+            generate_blog_post_metadata_agent,
+            "Please write the meta description, slug and tags for this blog post.",
+            deps=BlogPostMetadataContext(title=self.title, content=content),
+            function_name="agenerate_content_metadata",
+            model_name="BlogPostTitleSuggestion",
+        )
+        if result is not None:
+            return result.output
+
+        return BlogPostMetadata(
+            description=self.suggested_meta_description or self.description,
+            slug=slugify(self.title),
+            tags=", ".join(self.target_keywords or []),
+        )
+
+    def stream_content(self, content_type=ContentType.SHARING):
+        """
+        Generate content like `generate_content`, yielding events as the model writes it.
+
+        Yields ("content", markdown_delta) while the article streams in, then either
+        ("done", GeneratedBlogPost) or ("error", None). ("ping", None) is yielded while
+        waiting on the model so callers can keep idle connections alive.
+
+        The article is generated as plain text so it can be streamed, its description, slug
+        and tags are written by a second, small call once it is complete.
+
+        The run lives on the agent event loop rather than in the caller, so the post is
+        still saved if the caller stops iterating, e.g. when the client disconnects.
+        """
+        from core.agents.generate_content_agent import generate_content_text_agents
+
+        deps = self.get_blog_post_generation_context(content_type)
+        events = queue.Queue()
+
+        async def generate():
+            try:
+                result = await run_agent_streamed(
+                    generate_content_text_agents[content_type],
+                    "Please generate an article based on the project details and title suggestions.",  # noqa: E501
+                    deps=deps,
+                    on_text_delta=lambda text_delta: events.put(("content", text_delta)),
+                    function_name="stream_content",
+                    model_name="BlogPostTitleSuggestion",
+                )
+                if result is None:
+                    events.put(("error", None))
+                    return
+
+                content = result.output
+                metadata = await self.agenerate_content_metadata(content)
+                blog_post = await GeneratedBlogPost.objects.acreate(
+                    project_id=self.project_id,
+                    title=self,
+                    description=metadata.description,
+                    slug=metadata.slug,
+                    tags=metadata.tags,
+                    content=content,
+                )
+                events.put(("done", blog_post))
+            except Exception as e:
+                logger.error(
+                    "[Stream Content] Failed to save generated blog post",
+                    error=str(e),
+                    exc_info=True,
+                    suggestion_id=self.id,
+                )
+                events.put(("error", None))
+
+        schedule_on_agent_loop(generate())
+
+        while True:
+            try:
+                event = events.get(timeout=15)
+            except queue.Empty:
+                yield "ping", None
+                continue
+
+            yield event
+            if event[0] in ("done", "error"):
+                return
+
 
 class AutoSubmissionSetting(BaseModel):
     project = models.ForeignKey(
@@ -878,6 +1143,41 @@ class AutoSubmissionSetting(BaseModel):
     def __str__(self):
         return f"{self.project.name}"
 
+    @staticmethod
+    def next_post_at(earliest, preferred_time=None, preferred_timezone=None):
+        """
+        The first time at or after `earliest` that falls on `preferred_time` in
+        `preferred_timezone` (UTC when missing or unknown). Without a preferred time
+        that is `earliest` itself.
+        """
+        if preferred_time is None:
+            return earliest
+
+        try:
+            tz = ZoneInfo(preferred_timezone or "UTC")
+        except (ZoneInfoNotFoundError, ValueError):
+            tz = ZoneInfo("UTC")
+
+        earliest = earliest.astimezone(tz)
+        post_at = datetime.combine(earliest.date(), preferred_time, tzinfo=tz)
+        if post_at < earliest:
+            post_at = datetime.combine(
+                earliest.date() + timedelta(days=1), preferred_time, tzinfo=tz
+            )
+        return post_at
+
+
+class GeneratedBlogPostQuerySet(models.QuerySet):
+    def overview(self):
+        """Posts without their (large) content, with a `has_content` flag instead."""
+        return (
+            self.only("id", "project_id", "title_id", "posted")
+            .annotate(
+                has_content=ExpressionWrapper(~Q(content=""), output_field=models.BooleanField())
+            )
+            .order_by("id")
+        )
+
 
 class GeneratedBlogPost(BaseModel):
     project = models.ForeignKey(
@@ -904,6 +1204,11 @@ class GeneratedBlogPost(BaseModel):
     posted = models.BooleanField(default=False)
     date_posted = models.DateTimeField(null=True, blank=True)
 
+    objects = GeneratedBlogPostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["title", "posted"])]
+
     def __str__(self):
         return f"{self.project.name}: {self.title.title}"
 
@@ -937,16 +1242,13 @@ class GeneratedBlogPost(BaseModel):
         )
 
         try:
-            session = requests.Session()
-            session.cookies.clear()
-
             if headers is None:
                 headers = {}
 
             if "content-type" not in headers and "Content-Type" not in headers:
                 headers["Content-Type"] = "application/json"
 
-            response = session.post(url, json=body, headers=headers, timeout=15)
+            response = get_http_client("blog_post_submission").post(url, json=body, headers=headers)
             response.raise_for_status()
             return True
 
@@ -994,12 +1296,14 @@ class ProjectPage(BaseModel):
             markdown_content=self.markdown_content,
         )
 
-    def get_page_content(self):
+    def get_page_content(self, page_content=None):
         """
         Fetch page content using Jina Reader API and update the project.
         Returns the content if successful, raises ValueError otherwise.
+
+        `page_content` takes an already fetched (title, description, markdown) tuple.
         """
-        title, description, markdown_content = get_markdown_content(self.url)
+        title, description, markdown_content = page_content or get_markdown_content(self.url)
 
         if not title or not description or not markdown_content:
             return False
@@ -1025,40 +1329,38 @@ class ProjectPage(BaseModel):
         Analyze the page content using Claude via PydanticAI and update project details.
         Should be called after get_page_content().
         """
-        agent = Agent(
-            "google-gla:gemini-2.5-flash",
-            output_type=ProjectPageDetails,
-            deps_type=WebPageContent,
-            system_prompt=(
-                "You are an expert content analyzer. Based on the web page content provided, "
-                "extract and infer the requested information. Make reasonable inferences based "
-                "on available content, context, and industry knowledge."
-            ),
-            retries=2,
-        )
+        result = run_agent_synchronously(**self.get_analysis_agent_run(get_html_summary(self.url)))
+        return self.save_analysis(result)
 
-        @agent.system_prompt
-        def add_webpage_content(ctx: RunContext[WebPageContent]) -> str:
-            return (
-                "Web page content:"
-                f"Title: {ctx.deps.title}"
-                f"Description: {ctx.deps.description}"
-                f"Content: {ctx.deps.markdown_content}"
-            )
+    def get_analysis_agent_run(self, html_content):
+        """Keyword arguments of `run_agent` for analyzing this page."""
+        from core.agents.analyze_project_page_agent import analyze_project_page_agent
 
-        html_content = get_html_content(self.url)
-        result = run_agent_synchronously(
-            agent,
-            "Please analyze this web page.",
-            deps=WebPageContent(
-                title=self.title,
-                description=self.description,
-                markdown_content=self.markdown_content,
-                html_content=html_content,
-            ),
-            function_name="analyze_content",
-            model_name="ProjectPage",
-        )
+        prompt = "Please analyze this web page."
+        deps = WebPageContent(
+            title=self.title,
+            description=self.description,
+            markdown_content=self.markdown_content,
+            html_content=html_content,
+        )
+        return {
+            "agent": analyze_project_page_agent,
+            "input_string": prompt,
+            "deps": deps,
+            "function_name": "analyze_content",
+            "model_name": "ProjectPage",
+            "cache_key": get_agent_run_cache_key(
+                "ProjectPage.analyze_content",
+                analyze_project_page_agent,
+                prompt,
+                deps,
+                system_prompt=ANALYZE_PROJECT_PAGE_SYSTEM_PROMPT,
+            ),
+        }
+
+    def save_analysis(self, result):
+        if not result:
+            return False
 
         self.date_analyzed = timezone.now()
 
@@ -1078,6 +1380,51 @@ class ProjectPage(BaseModel):
 
         return True
 
+    @staticmethod
+    def analyze_pages_concurrently(pages):
+        """
+        Fetch and analyze several pages at once. The fetches run in threads and the agent
+        runs share the agent event loop, so a batch takes about as long as its slowest page.
+        Database writes stay on the calling thread. Returns the number of pages analyzed.
+        """
+
+        def fetch(page):
+            try:
+                return get_markdown_content(page.url), get_html_summary(page.url)
+            except Exception as e:
+                logger.error(
+                    "[Analyze Pages] Failed to fetch page",
+                    error=str(e),
+                    exc_info=True,
+                    project_id=page.project_id,
+                    url=page.url,
+                )
+                return None
+
+        if not pages:
+            return 0
+
+        # Copied contexts keep the usage attribution inside the threads
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            fetched = list(
+                executor.map(lambda page: contextvars.copy_context().run(fetch, page), pages)
+            )
+
+        fetched_pages = []
+        agent_runs = []
+        for page, page_fetch in zip(pages, fetched, strict=True):
+            if page_fetch is None:
+                continue
+            page_content, html_content = page_fetch
+            if page.get_page_content(page_content=page_content):
+                fetched_pages.append(page)
+                agent_runs.append(page.get_analysis_agent_run(html_content))
+
+        results = run_agents_concurrently(agent_runs)
+        return sum(
+            page.save_analysis(result) for page, result in zip(fetched_pages, results, strict=True)
+        )
+
 
 class Competitor(BaseModel):
     project = models.ForeignKey(
@@ -1117,12 +1464,14 @@ class Competitor(BaseModel):
             description=self.description,
         )
 
-    def get_page_content(self):
+    def get_page_content(self, force_refresh=False):
         """
         Fetch page content using Jina Reader API and update the project.
         Returns the content if successful, raises ValueError otherwise.
         """
-        homepage_title, homepage_description, markdown_content = get_markdown_content(self.url)
+        homepage_title, homepage_description, markdown_content = get_markdown_content(
+            self.url, force_refresh=force_refresh
+        )
 
         if not homepage_title or not homepage_description or not markdown_content:
             return False
@@ -1144,38 +1493,34 @@ class Competitor(BaseModel):
         return True
 
     def populate_name_description(self):
-        agent = Agent(
-            "google-gla:gemini-2.5-flash",
-            output_type=CompetitorDetails,
-            deps_type=WebPageContent,
-            system_prompt=(
-                """
-                You are an expert marketer.
-                Based on the competitor details and homepage content provided,
-                extract and infer the requested information. Make reasonable inferences based
-                on available content, context, and industry knowledge.
-                """
-            ),
-            retries=2,
+        from core.agents.populate_competitor_details_agent import (
+            populate_competitor_details_agent,
         )
 
-        @agent.system_prompt
-        def add_webpage_content(ctx: RunContext[WebPageContent]) -> str:
-            return f"Web page content:Content: {ctx.deps.markdown_content}"
-
         deps = WebPageContent(
             title=self.homepage_title,
             description=self.homepage_description,
             markdown_content=self.markdown_content,
         )
+        prompt = "Please analyze this competitor and extract the key information."
         result = run_agent_synchronously(
-            agent,
-            "Please analyze this competitor and extract the key information.",
+            populate_competitor_details_agent,
+            prompt,
             deps=deps,
             function_name="populate_name_description",
             model_name="Competitor",
+            cache_key=get_agent_run_cache_key(
+                "Competitor.populate_name_description",
+                populate_competitor_details_agent,
+                prompt,
+                deps,
+                system_prompt=POPULATE_COMPETITOR_DETAILS_SYSTEM_PROMPT,
+            ),
         )
 
+        if not result:
+            return False
+
         self.name = result.data.name
         self.description = result.data.description
         self.save(update_fields=["name", "description"])
@@ -1183,52 +1528,7 @@ class Competitor(BaseModel):
         return True
 
     def analyze_competitor(self):
-        agent = Agent(
-            "google-gla:gemini-2.5-flash",
-            output_type=CompetitorAnalysis,
-            deps_type=CompetitorAnalysisContext,
-            system_prompt=(
-                """
-                You are an expert marketer.
-                Based on the competitor details and homepage content provided,
-                extract and infer the requested information. Make reasonable inferences based
-                on available content, context, and industry knowledge.
-                """
-            ),
-            retries=2,
-            model_settings={"temperature": 0.8},
-        )
-
-        @agent.system_prompt
-        def add_todays_date() -> str:
-            return f"Today's Date: {timezone.now().strftime('%Y-%m-%d')}"
-
-        @agent.system_prompt
-        def my_project_details(ctx: RunContext[CompetitorAnalysisContext]) -> str:
-            project = ctx.deps.project_details
-            return f"""
-                Project Details:
-                - Project Name: {project.name}
-                - Project Type: {project.type}
-                - Project Summary: {project.summary}
-                - Blog Theme: {project.blog_theme}
-                - Founders: {project.founders}
-                - Key Features: {project.key_features}
-                - Target Audience: {project.target_audience_summary}
-                - Pain Points: {project.pain_points}
-                - Product Usage: {project.product_usage}
-            """
-
-        @agent.system_prompt
-        def competitor_details(ctx: RunContext[CompetitorAnalysisContext]) -> str:
-            competitor = ctx.deps.competitor_details
-            return f"""
-                Competitor Details:
-                - Competitor Name: {competitor.name}
-                - Competitor URL: {competitor.url}
-                - Competitor Description: {competitor.description}
-                - Competitor Homepage Content: {ctx.deps.competitor_homepage_content}
-            """
+        from core.agents.analyze_competitor_agent import analyze_competitor_agent
 
         deps = CompetitorAnalysisContext(
             project_details=self.project.project_details,
@@ -1236,13 +1536,16 @@ class Competitor(BaseModel):
             competitor_homepage_content=self.markdown_content,
         )
         result = run_agent_synchronously(
-            agent,
+            analyze_competitor_agent,
             "Please analyze this competitor and extract the key information.",
             deps=deps,
             function_name="analyze_competitor",
             model_name="Competitor",
         )
 
+        if not result:
+            return False
+
         self.competitor_analysis = result.data.competitor_analysis
         self.key_differences = result.data.key_differences
         self.strengths = result.data.strengths
@@ -1260,6 +1563,41 @@ class Competitor(BaseModel):
         return True
 
 
+class KeywordQuerySet(models.QuerySet):
+    def due_for_refresh(self):
+        """
+        Keywords whose metrics are older than their tier allows, most important first.
+
+        Tier 1: used for content by some project, or high volume.
+        Tier 2: shared by several projects, or moderate volume.
+        Tier 3: everything else that still belongs to a project.
+        Keywords that were never fetched are always due.
+        """
+        now = timezone.now()
+        keywords = (
+            self.annotate(
+                project_count=Count("keyword_projects"),
+                in_use=Exists(ProjectKeyword.objects.filter(keyword=OuterRef("pk"), use=True)),
+            )
+            .filter(project_count__gt=0)
+            .annotate(
+                refresh_tier=Case(
+                    When(Q(in_use=True) | Q(volume__gte=10000), then=Value(1)),
+                    When(Q(project_count__gte=2) | Q(volume__gte=1000), then=Value(2)),
+                    default=Value(3),
+                )
+            )
+        )
+
+        is_due = Q(last_fetched_at__isnull=True)
+        for tier, max_age in KEYWORD_REFRESH_MAX_AGE_BY_TIER.items():
+            is_due |= Q(refresh_tier=tier, last_fetched_at__lt=now - max_age)
+
+        return keywords.filter(is_due).order_by(
+            "refresh_tier", F("last_fetched_at").asc(nulls_first=True)
+        )
+
+
 class Keyword(BaseModel):
     keyword_text = models.CharField(max_length=255, help_text="The keyword string")
     volume = models.IntegerField(
@@ -1288,10 +1626,20 @@ class Keyword(BaseModel):
         help_text="The data source for the keyword metrics",
     )
     last_fetched_at = models.DateTimeField(
-        auto_now=True, help_text="Timestamp of when the data was last fetched"
+        null=True, blank=True, help_text="Timestamp of when the metrics were last requested"
     )
     got_related_keywords = models.BooleanField(default=False)
     got_people_also_search_for_keywords = models.BooleanField(default=False)
+    trend_series = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Search volume for the most recent trend months, oldest first",
+    )
+    trend_series_start = models.DateField(
+        null=True, blank=True, help_text="First month of the trend series"
+    )
+
+    objects = KeywordQuerySet.as_manager()
 
     class Meta:
         unique_together = ("keyword_text", "country", "data_source")
@@ -1301,110 +1649,111 @@ class Keyword(BaseModel):
     def __str__(self):
         return f"{self.keyword_text} ({self.country or 'global'} - {self.data_source or 'N/A'})"
 
-    def fetch_and_update_metrics(self, currency="usd"):  # noqa: C901
-        if not hasattr(settings, "KEYWORDS_EVERYWHERE_API_KEY"):
-            logger.error("[KeywordFetch] KEYWORDS_EVERYWHERE_API_KEY not found in settings.")
-            return False
-
-        api_key = settings.KEYWORDS_EVERYWHERE_API_KEY
-        api_url = "https://api.keywordseverywhere.com/v1/get_keyword_data"
-
-        payload = {
-            "kw[]": [self.keyword_text],
-            "country": self.country,
-            "currency": currency,
-            "dataSource": self.data_source,
-        }
-        headers = {"Accept": "application/json", "Authorization": f"Bearer {api_key}"}
-
-        try:
-            response = requests.post(api_url, data=payload, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            response_data = response.json()
+    @property
+    def trend_data(self):
+        """The trend series as month/year/value points, oldest first."""
+        if not self.trend_series_start:
+            return []
+
+        start = self.trend_series_start.year * 12 + self.trend_series_start.month - 1
+        return [
+            {
+                "month": calendar.month_name[(start + offset) % 12 + 1],
+                "year": (start + offset) // 12,
+                "value": value,
+            }
+            for offset, value in enumerate(self.trend_series)
+        ]
 
-            if (
-                not response_data.get("data")
-                or not isinstance(response_data["data"], list)
-                or not response_data["data"][0]
-            ):
-                logger.warning(
-                    "[KeywordFetch] No data found in API response for keyword.",
-                    keyword_id=self.id,
-                    keyword_text=self.keyword_text,
-                    response_status=response.status_code,
-                    response_content=response.text[:500],
-                )
-                return False
+    def fetch_and_update_metrics(self, currency="usd"):
+        updated_keywords, _ = Keyword.fetch_and_update_metrics_in_bulk([self], currency=currency)
+        return self in updated_keywords
 
-            keyword_api_data = response_data["data"][0]
+    @classmethod
+    def fetch_and_update_metrics_in_bulk(cls, keywords, currency="usd"):
+        """
+        Fetch Keywords Everywhere metrics for many keywords at once.
 
-            self.volume = keyword_api_data.get("vol")
+        The API takes up to 100 keywords per call but only one country/data source, so
+        keywords are grouped by those first. Keywords are updated in place and saved with a
+        single bulk_update.
 
-            cpc_data = keyword_api_data.get("cpc", {})
-            self.cpc_currency = cpc_data.get("currency", "")
-            try:
-                self.cpc_value = Decimal(str(cpc_data.get("value", "0.00")))
-            except InvalidOperation:
-                logger.warning(
-                    "[KeywordFetch] Invalid CPC value for keyword.",
-                    keyword_text=self.keyword_text,
-                    keyword_id=self.id,
-                    cpc_value_raw=cpc_data.get("value"),
+        Returns the keywords that received metrics and the API credits consumed.
+        """
+        if not hasattr(settings, "KEYWORDS_EVERYWHERE_API_KEY"):
+            logger.error("[KeywordFetch] KEYWORDS_EVERYWHERE_API_KEY not found in settings.")
+            return [], 0
+
+        keywords_by_market = defaultdict(list)
+        for keyword in keywords:
+            keywords_by_market[(keyword.country, keyword.data_source)].append(keyword)
+
+        updated_keywords = []
+        credits_used = 0
+        for (country, data_source), market_keywords in keywords_by_market.items():
+            for start in range(0, len(market_keywords), KEYWORDS_EVERYWHERE_BATCH_SIZE):
+                batch = market_keywords[start : start + KEYWORDS_EVERYWHERE_BATCH_SIZE]
+                metrics_by_keyword, batch_credits_used = cls._request_keyword_metrics(
+                    batch, country, data_source, currency
                 )
-                self.cpc_value = Decimal("0.00")
+                credits_used += batch_credits_used
 
-            self.competition = keyword_api_data.get("competition")
-            self.last_fetched_at = timezone.now()
+                for keyword, keyword_api_data in metrics_by_keyword:
+                    keyword.apply_keyword_metrics(keyword_api_data)
+                    updated_keywords.append(keyword)
 
-            # Save keyword instance before handling trends to ensure FK exists
-            self.save(
-                update_fields=[
+        if updated_keywords:
+            Keyword.objects.bulk_update(
+                updated_keywords,
+                [
                     "volume",
                     "cpc_currency",
                     "cpc_value",
                     "competition",
                     "last_fetched_at",
-                ]
+                    "trend_series",
+                    "trend_series_start",
+                ],
             )
 
-            trend_data = keyword_api_data.get("trend", [])
-            if isinstance(trend_data, list):
-                with transaction.atomic():
-                    # Get a set of existing (month, year) tuples for efficient lookup
-                    existing_trends_tuples = set(self.trends.values_list("month", "year"))
-
-                    trends_to_create = []
-                    for trend_item in trend_data:
-                        if (
-                            isinstance(trend_item, dict)
-                            and "month" in trend_item
-                            and "year" in trend_item
-                            and "value" in trend_item
-                        ):
-                            month_str = str(trend_item["month"])
-                            year_int = int(trend_item["year"])
-
-                            # Check if this month/year combo already exists
-                            if (month_str, year_int) not in existing_trends_tuples:
-                                trends_to_create.append(
-                                    KeywordTrend(
-                                        keyword=self,
-                                        month=month_str,
-                                        year=year_int,
-                                        value=int(trend_item["value"]),
-                                    )
-                                )
-                    if trends_to_create:
-                        KeywordTrend.objects.bulk_create(trends_to_create)
+        logger.info(
+            "[KeywordFetch] Fetched keyword metrics in bulk",
+            requested=len(keywords),
+            updated=len(updated_keywords),
+            credits_used=credits_used,
+        )
 
-            return True
+        return updated_keywords, credits_used
+
+    @staticmethod
+    def _request_keyword_metrics(keywords, country, data_source, currency):
+        """
+        Returns (keyword, api data) pairs for the keywords the API had data for and the
+        credits the request consumed.
+        """
+        api_key = settings.KEYWORDS_EVERYWHERE_API_KEY
+        api_url = "https://api.keywordseverywhere.com/v1/get_keyword_data"
 
+        payload = {
+            "kw[]": [keyword.keyword_text for keyword in keywords],
+            "country": country,
+            "currency": currency,
+            "dataSource": data_source,
+        }
+        headers = {"Accept": "application/json", "Authorization": f"Bearer {api_key}"}
+        keyword_texts = [keyword.keyword_text for keyword in keywords]
+
+        try:
+            response = get_http_client("keywords_everywhere").post(
+                api_url, data=payload, headers=headers
+            )
+            response.raise_for_status()
+
+            response_data = response.json()
         except requests.exceptions.HTTPError as e:
             logger.error(
                 "[KeywordFetch] HTTP error occurred.",
-                keyword_id=self.id,
-                keyword_text=self.keyword_text,
+                keyword_texts=keyword_texts,
                 error=str(e),
                 exc_info=True,
                 status_code=e.response.status_code if e.response else None,
@@ -1418,25 +1767,83 @@ class Keyword(BaseModel):
                     logger.error("[KeywordFetch] Insufficient credits or invalid subscription.")
                 elif e.response.status_code == 400:
                     logger.error("[KeywordFetch] Submitted request data is invalid.")
-            return False
+            return [], 0
         except requests.exceptions.RequestException as e:
             logger.error(
                 "[KeywordFetch] Request exception occurred.",
-                keyword_id=self.id,
-                keyword_text=self.keyword_text,
+                keyword_texts=keyword_texts,
                 error=str(e),
                 exc_info=True,
             )
-            return False
-        except Exception as e:
+            return [], 0
+        except ValueError as e:
             logger.error(
-                "[KeywordFetch] An unexpected error occurred.",
-                keyword_id=self.id,
-                keyword_text=self.keyword_text,
+                "[KeywordFetch] Could not decode API response.",
+                keyword_texts=keyword_texts,
                 error=str(e),
                 exc_info=True,
             )
-            return False
+            return [], 0
+
+        keyword_api_data_list = response_data.get("data")
+        if not keyword_api_data_list or not isinstance(keyword_api_data_list, list):
+            logger.warning(
+                "[KeywordFetch] No data found in API response for keywords.",
+                keyword_texts=keyword_texts,
+                response_status=response.status_code,
+                response_content=response.text[:500],
+            )
+            return [], 0
+
+        keywords_by_text = {keyword.keyword_text.lower(): keyword for keyword in keywords}
+        metrics_by_keyword = []
+        for index, keyword_api_data in enumerate(keyword_api_data_list):
+            if not isinstance(keyword_api_data, dict) or not keyword_api_data:
+                continue
+
+            # Items carry their keyword text; fall back to request order if it is missing
+            if "keyword" in keyword_api_data:
+                keyword = keywords_by_text.get(str(keyword_api_data["keyword"]).lower())
+            else:
+                keyword = keywords[index] if index < len(keywords) else None
+
+            if keyword is not None:
+                metrics_by_keyword.append((keyword, keyword_api_data))
+
+        return metrics_by_keyword, response_data.get("credits_consumed", 0)
+
+    def apply_keyword_metrics(self, keyword_api_data):
+        """Copy one Keywords Everywhere result onto this keyword without saving it."""
+        self.volume = keyword_api_data.get("vol")
+
+        cpc_data = keyword_api_data.get("cpc", {})
+        self.cpc_currency = cpc_data.get("currency", "")
+        try:
+            self.cpc_value = Decimal(str(cpc_data.get("value", "0.00")))
+        except InvalidOperation:
+            logger.warning(
+                "[KeywordFetch] Invalid CPC value for keyword.",
+                keyword_text=self.keyword_text,
+                keyword_id=self.id,
+                cpc_value_raw=cpc_data.get("value"),
+            )
+            self.cpc_value = Decimal("0.00")
+
+        self.competition = keyword_api_data.get("competition")
+        self.last_fetched_at = timezone.now()
+
+        trend_data = keyword_api_data.get("trend", [])
+        if not isinstance(trend_data, list):
+            return
+
+        self.trend_series_start, self.trend_series = build_trend_series(
+            [
+                (trend_item["year"], trend_item.get("month", ""), trend_item["value"])
+                for trend_item in trend_data
+                if isinstance(trend_item, dict) and "year" in trend_item and "value" in trend_item
+            ],
+            KEYWORD_TREND_SERIES_LENGTH,
+        )
 
 
 class ProjectKeyword(BaseModel):
@@ -1456,20 +1863,554 @@ class ProjectKeyword(BaseModel):
         return f"{self.project.name} - {self.keyword.keyword_text}"
 
 
-class KeywordTrend(BaseModel):
-    keyword = models.ForeignKey(Keyword, on_delete=models.CASCADE, related_name="trends")
-    month = models.CharField(max_length=10, help_text="The month of this volume (e.g., May)")
-    year = models.IntegerField(help_text="The year of this volume (e.g., 2019)")
-    value = models.IntegerField(help_text="The search volume of the keyword for the given month")
+class KeywordMetricsRefresh(BaseModel):
+    """One run of the scheduled keyword metrics refresh and the credits it spent."""
+
+    keywords_requested = models.PositiveIntegerField(default=0)
+    keywords_updated = models.PositiveIntegerField(default=0)
+    credits_used = models.PositiveIntegerField(default=0)
+    credit_budget = models.PositiveIntegerField(
+        default=0, help_text="Credits that were left for the day when the run started"
+    )
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M}: {self.keywords_updated} keywords"
+
+    @classmethod
+    def credits_used_today(cls):
+        today = timezone.localdate()
+        return (
+            cls.objects.filter(created_at__date=today).aggregate(total=Sum("credits_used"))["total"]
+            or 0
+        )
+
+
+class Workflow(BaseModel):
+    """
+    A set of django-q tasks run for a project, one WorkflowNode each.
+
+    Nodes run on the "onboarding" queue. At most `max_concurrency` nodes of a workflow are
+    queued or running at once, so a large project can't take over the queue, and free slots
+    go to the profile with the fewest nodes in flight for its `max_concurrency`.
+    The workflow finishes once every node has finished.
+    """
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="workflows")
+    kind = models.CharField(max_length=50, choices=WorkflowKind.choices)
+    status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.RUNNING)
+    max_concurrency = models.PositiveSmallIntegerField(default=2)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.project}: {self.status}"
+
+    @classmethod
+    def start_onboarding(cls, project):
+        """
+        Run everything that follows the first analysis of a project. A project that is
+        already onboarding keeps its running workflow rather than getting a second one.
+        """
+        running = cls.objects.filter(
+            project=project, kind=WorkflowKind.ONBOARDING, finished_at__isnull=True
+        ).first()
+        if running:
+            logger.info(
+                "[Workflow] Onboarding already running",
+                workflow_id=running.id,
+                project_id=project.id,
+            )
+            return running
+
+        workflow = cls.objects.create(
+            project=project,
+            kind=WorkflowKind.ONBOARDING,
+            max_concurrency=(
+                settings.WORKFLOW_MAX_CONCURRENCY_SUBSCRIBED
+                if project.profile.has_active_subscription
+                else settings.WORKFLOW_MAX_CONCURRENCY
+            ),
+        )
+        workflow.add_node(
+            "title_suggestions", "core.tasks.generate_blog_post_suggestions", project.id
+        )
+        workflow.add_node(
+            "keywords", "core.tasks.process_project_keywords", project.id, workflow_id=workflow.id
+        )
+        workflow.add_node(
+            "pages",
+            "core.tasks.schedule_project_page_analysis",
+            project.id,
+            workflow_id=workflow.id,
+        )
+        workflow.add_node(
+            "competitors",
+            "core.tasks.schedule_project_competitor_analysis",
+            project.id,
+            workflow_id=workflow.id,
+            timeout=180,
+        )
+        cls.dispatch([workflow.id])
+
+        return workflow
+
+    def add_node(self, key, func, *args, timeout=None, **kwargs):
+        """
+        Add a task to the workflow, identified by `key`. It is queued by `dispatch` once a
+        slot is free. Adding an existing key is a no-op.
+
+        Returns the node and whether it was added.
+        """
+        return WorkflowNode.objects.get_or_create(
+            workflow=self,
+            key=key[:500],
+            defaults={
+                "func": func,
+                "args": list(args),
+                "kwargs": kwargs,
+                "timeout": timeout,
+            },
+        )
+
+    @classmethod
+    def dispatch(cls, workflow_ids=()):
+        """
+        Queue pending nodes, up to WORKFLOW_QUEUE_CAPACITY across all workflows and
+        `max_concurrency` within each one, and finish the workflows in `workflow_ids` that
+        have no node left to run.
+
+        Nodes wait here rather than in the broker, which runs tasks in the order they came in.
+        Each free slot goes to the profile with the lowest share of nodes in flight, weighted
+        by `max_concurrency`, so a burst from one project only delays that project.
+
+        Only `workflow_ids` are waited on. The other workflows given a slot are locked with
+        SKIP LOCKED, one that a concurrent dispatch holds is left to that dispatch.
+        """
+        workflow_ids = set(workflow_ids) | WorkflowNode.fail_expired_leases()
+
+        with transaction.atomic():
+            owned = list(
+                cls.objects.select_for_update(of=("self",))
+                .filter(id__in=workflow_ids, finished_at__isnull=True)
+                .select_related("project")
+                .order_by("id")
+            )
+
+            in_flight = Counter()
+            profile_in_flight = Counter()
+            for workflow_id, profile_id, count in (
+                WorkflowNode.objects.filter(
+                    workflow__finished_at__isnull=True,
+                    status__in=[WorkflowNodeStatus.QUEUED, WorkflowNodeStatus.RUNNING],
+                )
+                .values_list("workflow_id", "workflow__project__profile_id")
+                .annotate(count=Count("id"))
+                .order_by()
+            ):
+                in_flight[workflow_id] += count
+                profile_in_flight[profile_id] += count
+
+            pending = Counter(
+                dict(
+                    cls.objects.filter(finished_at__isnull=True)
+                    .annotate(
+                        pending=Count("nodes", filter=Q(nodes__status=WorkflowNodeStatus.PENDING))
+                    )
+                    .filter(pending__gt=0)
+                    .values_list("id", "pending")
+                )
+            )
+
+            for workflow in owned:
+                if not in_flight[workflow.id] and not pending[workflow.id]:
+                    workflow.finish()
+
+            capacity = settings.WORKFLOW_QUEUE_CAPACITY - sum(in_flight.values())
+            if capacity <= 0 or not pending:
+                return
+
+            candidates = list(
+                cls.objects.filter(id__in=pending)
+                .values_list("id", "max_concurrency", "project__profile_id")
+                .order_by("id")
+            )
+            slots = Counter()
+            while capacity > 0:
+                ready = [
+                    (workflow_id, max_concurrency, profile_id)
+                    for workflow_id, max_concurrency, profile_id in candidates
+                    if slots[workflow_id] < pending[workflow_id]
+                    and in_flight[workflow_id] + slots[workflow_id] < max_concurrency
+                ]
+                if not ready:
+                    break
+
+                workflow_id, _, profile_id = min(
+                    ready,
+                    key=lambda candidate: profile_in_flight[candidate[2]] / candidate[1],
+                )
+                slots[workflow_id] += 1
+                profile_in_flight[profile_id] += 1
+                capacity -= 1
+
+            owned_ids = {workflow.id for workflow in owned}
+            locked_ids = owned_ids.intersection(slots) | set(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(id__in=set(slots) - owned_ids)
+                .values_list("id", flat=True)
+            )
+
+            now = timezone.now()
+            to_queue = []
+            for workflow_id in sorted(locked_ids):
+                nodes = list(
+                    WorkflowNode.objects.filter(
+                        workflow_id=workflow_id, status=WorkflowNodeStatus.PENDING
+                    )
+                    .only("id", "workflow_id", "timeout")
+                    .order_by("id")[: slots[workflow_id]]
+                )
+                for node in nodes:
+                    node.status = WorkflowNodeStatus.QUEUED
+                    node.lease_expires_at = node.get_lease_expiry(now)
+                    node.updated_at = now
+                to_queue.extend(nodes)
+
+            if to_queue:
+                WorkflowNode.objects.bulk_update(
+                    to_queue, ["status", "lease_expires_at", "updated_at"]
+                )
+                transaction.on_commit(lambda: WorkflowNode.enqueue(to_queue))
+
+    def finish(self):
+        node_counts = self.nodes.aggregate(
+            total=Count("id"), failed=Count("id", filter=Q(status=WorkflowNodeStatus.ERROR))
+        )
+        self.status = JobStatus.ERROR if node_counts["failed"] else JobStatus.SUCCESS
+        self.finished_at = timezone.now()
+        self.save(update_fields=["status", "finished_at", "updated_at"])
+
+        logger.info(
+            "[Workflow] Finished",
+            workflow_id=self.id,
+            kind=self.kind,
+            project_id=self.project_id,
+            status=self.status,
+            nodes=node_counts["total"],
+        )
+
+        if self.kind == WorkflowKind.ONBOARDING:
+            transaction.on_commit(
+                lambda: async_task(
+                    "core.tasks.track_event",
+                    profile_id=self.project.profile_id,
+                    event_name="project_ready",
+                    properties={
+                        "project_id": self.project_id,
+                        "failed_steps": node_counts["failed"],
+                    },
+                    source_function="Workflow - finish",
+                    group="Track Event",
+                )
+            )
+
+
+class WorkflowNode(BaseModel):
+    workflow = models.ForeignKey(Workflow, on_delete=models.CASCADE, related_name="nodes")
+    key = models.CharField(max_length=500)
+    func = models.CharField(max_length=255, help_text="Dotted path of the task function")
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    timeout = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(
+        max_length=20, choices=WorkflowNodeStatus.choices, default=WorkflowNodeStatus.PENDING
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="A queued or running node still unfinished by then is presumed lost",
+    )
+    message = models.TextField(blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["workflow", "key"], name="unique_workflow_node_key")
+        ]
+        indexes = [models.Index(fields=["status", "lease_expires_at"])]
+
+    def __str__(self):
+        return f"{self.key}: {self.status}"
+
+    @property
+    def is_finished(self):
+        return self.status in (WorkflowNodeStatus.SUCCESS, WorkflowNodeStatus.ERROR)
+
+    def get_lease_expiry(self, now):
+        timeout = self.timeout or settings.WORKFLOW_NODE_DEFAULT_TIMEOUT
+        return now + timedelta(seconds=timeout + settings.WORKFLOW_NODE_LEASE_GRACE_SECONDS)
+
+    @staticmethod
+    def fail_expired_leases():
+        """
+        Fail the queued or running nodes whose lease ran out, e.g. because their worker died
+        before reporting back, so they stop holding a slot. Returns their workflow ids.
+        """
+        expired = WorkflowNode.objects.filter(
+            status__in=[WorkflowNodeStatus.QUEUED, WorkflowNodeStatus.RUNNING],
+            lease_expires_at__lt=timezone.now(),
+        )
+        workflow_ids = set(expired.values_list("workflow_id", flat=True))
+        if not workflow_ids:
+            return workflow_ids
+
+        failed_count = expired.update(
+            status=WorkflowNodeStatus.ERROR,
+            finished_at=timezone.now(),
+            message="Lease expired before the task reported back",
+            updated_at=timezone.now(),
+        )
+        logger.warning(
+            "[Workflow] Failed nodes with an expired lease",
+            failed_count=failed_count,
+            workflow_ids=sorted(workflow_ids),
+        )
+
+        return workflow_ids
+
+    @staticmethod
+    def enqueue(nodes):
+        for node in nodes:
+            options = {"timeout": node.timeout} if node.timeout else {}
+            async_task(
+                "core.tasks.run_workflow_node",
+                node.id,
+                hook="core.tasks.finish_failed_workflow_node",
+                group=f"Workflow {node.workflow_id}",
+                cluster="onboarding",
+                **options,
+            )
+
+    def finish(self, succeeded, message=""):
+        """Record the outcome of a queued or running node and move its workflow on."""
+        finished = WorkflowNode.objects.filter(
+            id=self.id, status__in=[WorkflowNodeStatus.QUEUED, WorkflowNodeStatus.RUNNING]
+        ).update(
+            status=WorkflowNodeStatus.SUCCESS if succeeded else WorkflowNodeStatus.ERROR,
+            finished_at=timezone.now(),
+            message=message[:1000],
+            updated_at=timezone.now(),
+        )
+        if finished:
+            Workflow.dispatch([self.workflow_id])
+
+
+class UpstreamUsage(models.Model):
+    """Calls made to one upstream API during one hour, by one task or view, for one project."""
+
+    bucket_start = models.DateTimeField(help_text="Start of the hour the calls were made in")
+    upstream = models.CharField(
+        max_length=100, help_text="HTTP client name, or llm:<model> for agent runs"
+    )
+    source = models.CharField(
+        max_length=255, blank=True, default="", help_text="Task or view that made the calls"
+    )
+    project = models.ForeignKey(
+        Project, null=True, blank=True, on_delete=models.CASCADE, related_name="upstream_usage"
+    )
+    profile = models.ForeignKey(
+        Profile, null=True, blank=True, on_delete=models.CASCADE, related_name="upstream_usage"
+    )
+    calls = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    total_latency_ms = models.PositiveBigIntegerField(default=0)
+    latency_histogram = models.JSONField(
+        default=list, help_text="Call counts per UPSTREAM_LATENCY_BOUNDS_MS bucket"
+    )
+    credits_used = models.PositiveIntegerField(default=0)
+    input_tokens = models.PositiveBigIntegerField(default=0)
+    output_tokens = models.PositiveBigIntegerField(default=0)
 
     class Meta:
-        unique_together = ("keyword", "month", "year")
-        verbose_name = "Keyword Trend"
-        verbose_name_plural = "Keyword Trends"
-        ordering = ["keyword", "year", "month"]
+        ordering = ["-bucket_start", "upstream"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket_start", "upstream", "source", "project", "profile"],
+                name="unique_upstream_usage_bucket",
+                nulls_distinct=False,
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.upstream} {self.bucket_start:%Y-%m-%d %H:00}: {self.calls} calls"
+
+    @property
+    def error_rate(self):
+        return self.errors / self.calls if self.calls else 0
+
+    @property
+    def average_latency_ms(self):
+        return self.total_latency_ms // self.calls if self.calls else None
+
+    @property
+    def latency_p50_ms(self):
+        return estimate_latency_percentile(self.latency_histogram, 50)
+
+    @property
+    def latency_p95_ms(self):
+        return estimate_latency_percentile(self.latency_histogram, 95)
+
+    @classmethod
+    def save_buffered(cls):
+        """
+        Add the calls counted in this process since the last save to their hourly rows.
+
+        Runs after every request and django-q task and when the process exits, so the hot
+        paths that call upstreams never wait on these writes.
+        """
+        buffered_usage = pop_buffered_upstream_usage()
+
+        for key, counts in buffered_usage.items():
+            bucket_start, upstream, source, project_id, profile_id = key
+            try:
+                with transaction.atomic():
+                    usage, _ = cls.objects.select_for_update().get_or_create(
+                        bucket_start=bucket_start,
+                        upstream=upstream,
+                        source=source,
+                        project_id=project_id,
+                        profile_id=profile_id,
+                    )
+                    usage.calls += counts["calls"]
+                    usage.errors += counts["errors"]
+                    usage.total_latency_ms += counts["total_latency_ms"]
+                    usage.credits_used += counts["credits_used"]
+                    usage.input_tokens += counts["input_tokens"]
+                    usage.output_tokens += counts["output_tokens"]
+                    histogram = usage.latency_histogram or [0] * (
+                        len(UPSTREAM_LATENCY_BOUNDS_MS) + 1
+                    )
+                    usage.latency_histogram = [
+                        saved + new
+                        for saved, new in zip(histogram, counts["latency_histogram"], strict=True)
+                    ]
+                    usage.save()
+            except DatabaseError as e:
+                logger.warning(
+                    "[Upstream Usage] Failed to save usage",
+                    error=str(e),
+                    upstream=upstream,
+                    source=source,
+                    project_id=project_id,
+                    calls=counts["calls"],
+                )
+
+
+class AgentRun(models.Model):
+    """One pydantic_ai agent run with the tokens it used and what they cost."""
+
+    created_at = models.DateTimeField(default=timezone.now)
+    profile = models.ForeignKey(
+        Profile, null=True, blank=True, on_delete=models.SET_NULL, related_name="agent_runs"
+    )
+    project = models.ForeignKey(
+        Project, null=True, blank=True, on_delete=models.SET_NULL, related_name="agent_runs"
+    )
+    function_name = models.CharField(max_length=255, blank=True, default="")
+    model_name = models.CharField(
+        max_length=255, blank=True, default="", help_text="Model the agent was run for"
+    )
+    llm_model = models.CharField(max_length=255)
+    request_tokens = models.PositiveIntegerField(default=0)
+    response_tokens = models.PositiveIntegerField(default=0)
+    total_tokens = models.PositiveIntegerField(default=0)
+    cost = models.DecimalField(max_digits=12, decimal_places=6, default=0, help_text="USD")
+    duration_ms = models.PositiveIntegerField(default=0)
+    succeeded = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["project", "created_at"])]
+
+    def __str__(self):
+        return f"{self.model_name}.{self.function_name} ({self.llm_model}): {self.total_tokens}"
+
+    @staticmethod
+    def calculate_cost(llm_model, request_tokens, response_tokens):
+        prices = settings.AGENT_MODEL_PRICES.get(llm_model)
+        if not prices:
+            return Decimal(0)
+
+        return (
+            Decimal(prices["input"]) * request_tokens + Decimal(prices["output"]) * response_tokens
+        ) / 1_000_000
+
+    @classmethod
+    def save_buffered(cls):
+        """
+        Save the agent runs recorded in this process since the last save and add them to the
+        monthly usage of their profiles.
+        """
+        agent_runs = [
+            cls(
+                **agent_run,
+                cost=cls.calculate_cost(
+                    agent_run["llm_model"],
+                    agent_run["request_tokens"],
+                    agent_run["response_tokens"],
+                ),
+            )
+            for agent_run in pop_buffered_agent_runs()
+        ]
+        if not agent_runs:
+            return
+
+        monthly_usage = defaultdict(
+            lambda: {"runs": 0, "request_tokens": 0, "response_tokens": 0, "cost": Decimal(0)}
+        )
+        for agent_run in agent_runs:
+            if not agent_run.profile_id:
+                continue
+
+            month = timezone.localdate(agent_run.created_at).replace(day=1)
+            usage = monthly_usage[(agent_run.profile_id, month)]
+            usage["runs"] += 1
+            usage["request_tokens"] += agent_run.request_tokens
+            usage["response_tokens"] += agent_run.response_tokens
+            usage["cost"] += agent_run.cost
+
+        try:
+            with transaction.atomic():
+                cls.objects.bulk_create(agent_runs)
+                for (profile_id, month), usage in monthly_usage.items():
+                    ProfileAgentUsage.objects.get_or_create(profile_id=profile_id, month=month)
+                    ProfileAgentUsage.objects.filter(profile_id=profile_id, month=month).update(
+                        **{field: F(field) + value for field, value in usage.items()}
+                    )
+        except DatabaseError as e:
+            logger.warning(
+                "[Agent Run] Failed to save agent runs", error=str(e), runs=len(agent_runs)
+            )
+
+
+class ProfileAgentUsage(models.Model):
+    """Agent runs of a profile rolled up per calendar month, updated as runs are saved."""
+
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="agent_usage")
+    month = models.DateField(help_text="First day of the month")
+    runs = models.PositiveIntegerField(default=0)
+    request_tokens = models.PositiveBigIntegerField(default=0)
+    response_tokens = models.PositiveBigIntegerField(default=0)
+    cost = models.DecimalField(max_digits=12, decimal_places=6, default=0, help_text="USD")
+
+    class Meta:
+        ordering = ["-month"]
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "month"], name="unique_profile_agent_month")
+        ]
 
     def __str__(self):
-        return f"{self.keyword.keyword_text} - {self.month} {self.year}: {self.value}"
+        return f"{self.profile} {self.month:%Y-%m}: ${self.cost:.2f}"
 
 
 class Feedback(BaseModel):
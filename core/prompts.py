@@ -226,3 +226,33 @@ PRICING_PAGE_STRATEGY_SYSTEM_PROMPT = {
     This approach emphasizes maximizing customer lifetime value through strategic pricing rather than competing on lowest price in the market.
   """
 }
+
+
+ANALYZE_PROJECT_SYSTEM_PROMPT = (
+    "You are an expert content analyzer. Based on the content provided, "
+    "extract and infer the requested information. Make reasonable inferences based "
+    "on available content, context, and industry knowledge."
+)
+
+ANALYZE_PROJECT_PAGE_SYSTEM_PROMPT = (
+    "You are an expert content analyzer. Based on the web page content provided, "
+    "extract and infer the requested information. Make reasonable inferences based "
+    "on available content, context, and industry knowledge."
+)
+
+EXTRACT_LINKS_SYSTEM_PROMPT = """
+        You are an expert link extractor.
+        Extract all the links from the text provided.
+    """
+
+EXTRACT_COMPETITORS_SYSTEM_PROMPT = """
+        You are an expert data extractor.
+        Extract all the data from the text provided.
+    """
+
+POPULATE_COMPETITOR_DETAILS_SYSTEM_PROMPT = """
+        You are an expert marketer.
+        Based on the competitor details and homepage content provided,
+        extract and infer the requested information. Make reasonable inferences based
+        on available content, context, and industry knowledge.
+        """
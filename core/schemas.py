@@ -11,7 +11,7 @@ class WebPageContent(BaseModel):
     description: str
     markdown_content: str
     html_content: str = Field(
-        description="HTML content of the web page",
+        description="Meta tags, headings, navigation links and structured data of the page",
         default="",
     )
 
@@ -187,7 +187,7 @@ class BlogPostGenerationContext(BaseModel):
     content_type: str = Field(description="Type of content to generate (SEO or SHARING)")
 
 
-class BlogPostContent(BaseModel):
+class BlogPostMetadata(BaseModel):
     description: str = Field(
         description="Meta description (150-160 characters) optimized for search engines"
     )
@@ -195,6 +195,14 @@ class BlogPostContent(BaseModel):
         description="URL-friendly format using lowercase letters, numbers, and hyphens"
     )
     tags: str = Field(description="5-8 relevant keywords as comma-separated values")
+
+
+class BlogPostMetadataContext(BaseModel):
+    title: str
+    content: str = Field(description="Blog post content in Markdown format")
+
+
+class BlogPostContent(BlogPostMetadata):
     content: str = Field(
         description="Full blog post content in Markdown format with proper structure and formatting"
     )
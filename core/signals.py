@@ -1,10 +1,25 @@
+import atexit
+
 from allauth.account.signals import email_confirmed, user_signed_up
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from django_q.signals import post_execute, pre_execute
 from django_q.tasks import async_task
+from django_q.utils import get_func_repr
 
-from core.models import Profile, ProfileStates
+from core.model_utils import set_usage_source
+from core.models import (
+    AgentRun,
+    AutoSubmissionSetting,
+    BlogPostTitleSuggestion,
+    GeneratedBlogPost,
+    Profile,
+    ProfileStates,
+    Project,
+    UpstreamUsage,
+)
 from core.tasks import add_email_to_buttondown
 from tuxseo.utils import get_tuxseo_logger
 
@@ -30,6 +45,47 @@ def save_user_profile(sender, instance, **kwargs):
         instance.profile.save()
 
 
+@receiver(post_save, sender=GeneratedBlogPost)
+def increment_generated_blog_posts_count(sender, instance, created, **kwargs):
+    if created and instance.project_id:
+        Profile.update_usage_counters(instance.project_id, generated_blog_posts_count=1)
+
+
+# Decrements run on pre_delete: when a project is deleted its row goes before the cascaded
+# children, so the owning profile can no longer be resolved once they are gone.
+@receiver(pre_delete, sender=GeneratedBlogPost)
+def decrement_generated_blog_posts_count(sender, instance, **kwargs):
+    if instance.project_id:
+        Profile.update_usage_counters(instance.project_id, generated_blog_posts_count=-1)
+
+
+# The next automatic post is worked out from the settings and the last posted post, so the
+# calendar is cleared whenever either changes and refilled by the scheduler.
+@receiver(post_save, sender=AutoSubmissionSetting)
+@receiver(post_delete, sender=AutoSubmissionSetting)
+def clear_auto_post_calendar_on_settings_change(sender, instance, **kwargs):
+    Project.clear_auto_post_calendar(instance.project_id)
+
+
+@receiver(post_save, sender=GeneratedBlogPost)
+def clear_auto_post_calendar_on_post(sender, instance, update_fields=None, **kwargs):
+    posted_changed = update_fields is None or "posted" in update_fields
+    if instance.project_id and instance.posted and posted_changed:
+        Project.clear_auto_post_calendar(instance.project_id)
+
+
+@receiver(post_save, sender=BlogPostTitleSuggestion)
+def increment_title_suggestions_count(sender, instance, created, **kwargs):
+    if created and instance.project_id:
+        Profile.update_usage_counters(instance.project_id, title_suggestions_count=1)
+
+
+@receiver(pre_delete, sender=BlogPostTitleSuggestion)
+def decrement_title_suggestions_count(sender, instance, **kwargs):
+    if instance.project_id:
+        Profile.update_usage_counters(instance.project_id, title_suggestions_count=-1)
+
+
 @receiver(email_confirmed)
 def add_email_to_buttondown_on_confirm(sender, **kwargs):
     logger.info(
@@ -51,3 +107,30 @@ def email_confirmation_callback(sender, request, user, **kwargs):
         email = kwargs["sociallogin"].user.email
         if email:
             async_task(add_email_to_buttondown, email, tag="user")
+
+
+# Upstream calls and agent runs are counted in memory and saved outside the code paths that
+# make them: after each request, after each task and when the process exits.
+@atexit.register
+def save_buffered_usage():
+    UpstreamUsage.save_buffered()
+    AgentRun.save_buffered()
+
+
+@receiver(request_finished)
+def save_upstream_usage_after_request(sender, **kwargs):
+    save_buffered_usage()
+
+
+@receiver(post_execute)
+def save_upstream_usage_after_task(sender, **kwargs):
+    save_buffered_usage()
+
+
+# django-q sends post_execute from the cluster's monitor process, while usage is buffered in
+# the worker that ran the task, so workers also save what their previous task left behind
+# before they start the next one.
+@receiver(pre_execute)
+def set_usage_source_before_task(sender, func, **kwargs):
+    save_buffered_usage()
+    set_usage_source(get_func_repr(func) or "")
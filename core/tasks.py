@@ -1,25 +1,46 @@
-import calendar
+import contextvars
 import json
 import random
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import unquote
 
 import posthog
-import requests
 from django.conf import settings
 from django.utils import timezone
-from django_q.tasks import async_task
-
-from core.choices import ContentType
+from django.utils.module_loading import import_string
+from django_q.utils import get_func_repr
+
+from core.choices import ContentType, JobStatus, WorkflowNodeStatus
+from core.model_utils import (
+    get_html_summary,
+    get_http_client,
+    get_markdown_content,
+    set_usage_source,
+)
 from core.models import (
+    KEYWORDS_EVERYWHERE_BATCH_SIZE,
     BlogPostTitleSuggestion,
     Competitor,
     GeneratedBlogPost,
+    Keyword,
+    KeywordMetricsRefresh,
     Profile,
     Project,
-    ProjectKeyword,
     ProjectPage,
+    Workflow,
+    WorkflowNode,
+)
+from core.utils import (
+    PASF_KEYWORDS_SOURCE,
+    RELATED_KEYWORDS_SOURCE,
+    attribute_upstream_usage,
+    enqueue_once,
+    expand_project_keywords,
+    job_step,
+    release_task_lock,
+    save_keywords,
+    update_job,
 )
-from core.utils import save_keyword
 from tuxseo.utils import get_tuxseo_logger
 
 logger = get_tuxseo_logger(__name__)
@@ -37,7 +58,7 @@ def add_email_to_buttondown(email, tag):
         "subscriber_type": "regular",
     }
 
-    r = requests.post(
+    r = get_http_client("buttondown").post(
         "https://api.buttondown.email/v1/subscribers",
         headers={"Authorization": f"Token {settings.BUTTONDOWN_API_KEY}"},
         json=data,
@@ -46,55 +67,357 @@ def add_email_to_buttondown(email, tag):
     return r.json()
 
 
-def analyze_project_page(project_id: int, link: str):
+def scan_project(project_id: int, job_id: str):
+    """
+    Onboarding pipeline behind /api/scan.
+
+    The Jina Reader markdown and the raw HTML do not depend on each other, so both are fetched
+    at the same time before the project is analyzed. Progress is reported through the job.
+    """
     project = Project.objects.get(id=project_id)
-    project_page, created = ProjectPage.objects.get_or_create(project=project, url=link)
+    with attribute_upstream_usage(project):
+        try:
+            update_job(job_id, status=JobStatus.RUNNING, stage="fetching_content")
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Copied contexts keep the usage attribution inside the threads
+                # Scans are asked for by the user, so cached copies are revalidated
+                # whatever their age
+                markdown_future = executor.submit(
+                    contextvars.copy_context().run,
+                    get_markdown_content,
+                    project.url,
+                    force_refresh=True,
+                )
+                html_future = executor.submit(
+                    contextvars.copy_context().run,
+                    get_html_summary,
+                    project.url,
+                    force_refresh=True,
+                )
 
-    if created:
-        project_page.get_page_content()
-        project_page.analyze_content()
+                html_content = html_future.result()
+                try:
+                    page_content = markdown_future.result()
+                except Exception as e:
+                    logger.error(
+                        "[Scan Project] Failed to fetch page content",
+                        error=str(e),
+                        exc_info=True,
+                        project_id=project_id,
+                        url=project.url,
+                    )
+                    page_content = None
+
+            if not page_content or not project.get_page_content(page_content=page_content):
+                project.delete()
+                update_job(job_id, status=JobStatus.ERROR, message="Failed to get page content")
+                return f"Failed to get page content for {project.url}"
+
+            update_job(job_id, stage="analyzing_content")
+
+            if not project.analyze_content(html_content=html_content):
+                logger.error(
+                    "[Scan Project] Failed to analyze project",
+                    project_id=project_id,
+                    url=project.url,
+                )
+                project.delete()
+                update_job(job_id, status=JobStatus.ERROR, message="Failed to analyze project")
+                return f"Failed to analyze {project.url}"
+
+            update_job(
+                job_id,
+                status=JobStatus.SUCCESS,
+                stage="done",
+                result={
+                    "project_id": project.id,
+                    "name": project.name,
+                    "type": project.get_type_display(),
+                    "url": project.url,
+                    "summary": project.summary,
+                },
+            )
 
-    return f"Analyzed {link} for {project.name}"
+            return f"Scanned {project.url}"
+        except Exception as e:
+            # The job would otherwise be reported as running until it expires
+            logger.error(
+                "[Scan Project] Scan failed",
+                error=str(e),
+                exc_info=True,
+                project_id=project_id,
+                url=project.url,
+            )
+            project.delete()
+            update_job(
+                job_id,
+                status=JobStatus.ERROR,
+                message="An unexpected error occurred. Please try again later.",
+            )
+            raise
 
 
-def schedule_project_page_analysis(project_id):
+def analyze_project_pages(project_id: int, links: list[str]):
+    """Fetch and analyze a batch of a project's pages at once, skipping known pages."""
     project = Project.objects.get(id=project_id)
-    project_links = project.get_a_list_of_links()
+    with attribute_upstream_usage(project):
+        new_pages = []
+        for link in links:
+            project_page, created = ProjectPage.objects.get_or_create(project=project, url=link)
+            if created:
+                new_pages.append(project_page)
 
-    count = 0
-    for link in project_links:
-        async_task(
-            analyze_project_page,
-            project_id,
-            link,
+        analyzed_count = ProjectPage.analyze_pages_concurrently(new_pages)
+
+        return f"Analyzed {analyzed_count} of {len(links)} links for {project.name}"
+
+
+# Kept for tasks queued before pages were analyzed in batches
+def analyze_project_page(project_id: int, link: str):
+    return analyze_project_pages(project_id, [link])
+
+
+def run_once(dedup_key: str, func, *args, **kwargs):
+    """Run a task queued by enqueue_once, then let the same task be queued again."""
+    try:
+        if isinstance(func, str):
+            func = import_string(func)
+        # Usage is attributed to the task that was queued rather than to this wrapper
+        set_usage_source(get_func_repr(func))
+        return func(*args, **kwargs)
+    finally:
+        release_task_lock(dedup_key)
+
+
+def enqueue_follow_up(workflow_id, key, func, *args, group=None):
+    """
+    Queue a follow-up task, as a node of the caller's workflow when it runs in one so it
+    counts towards the workflow's completion and concurrency limit. Otherwise the caller is
+    a backfill, and so is the follow-up.
+
+    Returns False when the same task is already part of the workflow, or already queued or
+    running outside of one.
+    """
+    if workflow_id:
+        _, added = Workflow.objects.get(id=workflow_id).add_node(key, func, *args)
+        return added
+
+    dedup_key = ":".join([func, *map(str, args)])
+    return enqueue_once(dedup_key, func, *args, group=group, cluster="backfill")
+
+
+def run_workflow_node(node_id: int):
+    node = WorkflowNode.objects.select_related("workflow").get(id=node_id)
+    if node.is_finished:
+        return f"Skipped {node.key}, already finished"
+
+    # A node whose lease already expired was failed to free its slot and must not run
+    started = WorkflowNode.objects.filter(
+        id=node.id, status__in=[WorkflowNodeStatus.QUEUED, WorkflowNodeStatus.RUNNING]
+    ).update(
+        status=WorkflowNodeStatus.RUNNING,
+        started_at=timezone.now(),
+        lease_expires_at=node.get_lease_expiry(timezone.now()),
+        updated_at=timezone.now(),
+    )
+    if not started:
+        return f"Skipped {node.key}, no longer queued"
+
+    try:
+        result = import_string(node.func)(*node.args, **node.kwargs)
+    except Exception as e:
+        logger.error(
+            "[Run Workflow Node] Node failed",
+            error=str(e),
+            exc_info=True,
+            workflow_id=node.workflow_id,
+            key=node.key,
         )
-        count += 1
+        node.finish(succeeded=False, message=str(e))
+        return f"Failed {node.key}"
+
+    node.finish(succeeded=True, message=str(result or ""))
+    return f"Finished {node.key}"
+
+
+def finish_failed_workflow_node(task):
+    """
+    Hook of run_workflow_node. Errors inside nodes are handled by the task itself, so this
+    only catches runs django-q gave up on, such as timeouts.
+    """
+    if task.success:
+        return
+
+    node = WorkflowNode.objects.select_related("workflow").filter(id=task.args[0]).first()
+    if node:
+        node.finish(succeeded=False, message=str(task.result))
+
 
-    return f"Scheduled analysis for {count} links"
+def dispatch_workflows():
+    """
+    Scheduled sweep for workflows nothing else will wake up.
+
+    Dispatch normally runs when a node finishes, so a workflow whose last worker died
+    without reporting back would wait forever. This fails nodes whose lease expired,
+    finishes their workflows if nothing is left and hands out the freed slots.
+    """
+    Workflow.dispatch()
 
 
-def schedule_project_competitor_analysis(project_id):
+def schedule_project_page_analysis(project_id, workflow_id=None):
     project = Project.objects.get(id=project_id)
-    competitors = project.find_competitors()
-    if competitors:
-        competitors = project.get_and_save_list_of_competitors()
-        for competitor in competitors:
-            async_task(analyze_project_competitor, competitor.id)
+    with attribute_upstream_usage(project):
+        project_links = project.get_a_list_of_links()
 
-    return f"Saved Competitors for {project.name}"
+    # Pages are analyzed in batches, so each task overlaps the fetches and agent runs of
+    # several pages instead of holding a worker for one page at a time
+    count = 0
+    coalesced = 0
+    batch_size = settings.PAGE_ANALYSIS_BATCH_SIZE
+    for start in range(0, len(project_links), batch_size):
+        links = project_links[start : start + batch_size]
+        if enqueue_follow_up(
+            workflow_id, f"pages:{links[0]}", "core.tasks.analyze_project_pages", project_id, links
+        ):
+            count += len(links)
+        else:
+            coalesced += len(links)
+
+    return f"Scheduled analysis for {count} links, {coalesced} already scheduled"
+
+
+def schedule_project_competitor_analysis(project_id, workflow_id=None):
+    project = Project.objects.get(id=project_id)
+    with attribute_upstream_usage(project):
+        coalesced = 0
+        competitors = project.find_competitors()
+        if competitors:
+            competitors = project.get_and_save_list_of_competitors()
+            for competitor in competitors:
+                if not enqueue_follow_up(
+                    workflow_id,
+                    f"competitor:{competitor.id}",
+                    "core.tasks.analyze_project_competitor",
+                    competitor.id,
+                ):
+                    coalesced += 1
+
+        return f"Saved Competitors for {project.name}, {coalesced} already being analyzed"
 
 
 def analyze_project_competitor(competitor_id):
     competitor = Competitor.objects.get(id=competitor_id)
-    got_content = competitor.get_page_content()
+    with attribute_upstream_usage(competitor.project):
+        got_content = competitor.get_page_content()
 
-    if got_content:
-        competitor.analyze_competitor()
+        if got_content:
+            competitor.analyze_competitor()
 
-    return f"Analyzed Competitor for {competitor.name}"
+        return f"Analyzed Competitor for {competitor.name}"
 
 
-def process_project_keywords(project_id: int):
+@job_step("fetching_content")
+def fetch_added_competitor_content(competitor_id: int, job_id: str):
+    competitor = Competitor.objects.get(id=competitor_id)
+
+    with attribute_upstream_usage(competitor.project):
+        if not competitor.get_page_content(force_refresh=True):
+            competitor.delete()
+            update_job(
+                job_id,
+                status=JobStatus.ERROR,
+                message="Failed to get page content for this competitor URL",
+            )
+            return f"Failed to get page content for {competitor.url}"
+
+        return f"Got page content for {competitor.url}"
+
+
+@job_step("populating_details")
+def populate_added_competitor_details(competitor_id: int, job_id: str):
+    competitor = Competitor.objects.get(id=competitor_id)
+
+    with attribute_upstream_usage(competitor.project):
+        if not competitor.populate_name_description():
+            competitor.delete()
+            update_job(
+                job_id,
+                status=JobStatus.ERROR,
+                message="Failed to get page content for this competitor URL",
+            )
+            return f"Failed to populate details for {competitor.url}"
+
+        return f"Populated details for {competitor.name}"
+
+
+@job_step("analyzing_competitor")
+def analyze_added_competitor(competitor_id: int, job_id: str):
+    competitor = Competitor.objects.get(id=competitor_id)
+
+    with attribute_upstream_usage(competitor.project):
+        if not competitor.analyze_competitor():
+            competitor.delete()
+            update_job(job_id, status=JobStatus.ERROR, message="Failed to analyze this competitor")
+            return f"Failed to analyze {competitor.url}"
+
+        update_job(
+            job_id,
+            status=JobStatus.SUCCESS,
+            stage="done",
+            result={
+                "competitor_id": competitor.id,
+                "name": competitor.name,
+                "url": competitor.url,
+                "description": competitor.description,
+                "summary": competitor.summary,
+                "competitor_analysis": competitor.competitor_analysis,
+                "key_differences": competitor.key_differences,
+                "strengths": competitor.strengths,
+                "weaknesses": competitor.weaknesses,
+                "opportunities": competitor.opportunities,
+                "threats": competitor.threats,
+                "key_features": competitor.key_features,
+                "key_benefits": competitor.key_benefits,
+                "key_drawbacks": competitor.key_drawbacks,
+            },
+        )
+
+        return f"Analyzed Competitor for {competitor.name}"
+
+
+@job_step("fetching_content")
+def fetch_added_project_page_content(project_page_id: int, job_id: str):
+    project_page = ProjectPage.objects.get(id=project_page_id)
+
+    with attribute_upstream_usage(project_page.project):
+        if not project_page.get_page_content():
+            update_job(job_id, status=JobStatus.ERROR, message="Failed to get page content")
+            return f"Failed to get page content for {project_page.url}"
+
+        return f"Got page content for {project_page.url}"
+
+
+@job_step("analyzing_content")
+def analyze_added_project_page(project_page_id: int, job_id: str):
+    project_page = ProjectPage.objects.get(id=project_page_id)
+
+    with attribute_upstream_usage(project_page.project):
+        if not project_page.analyze_content():
+            update_job(job_id, status=JobStatus.ERROR, message="Failed to analyze this page")
+            return f"Failed to analyze {project_page.url}"
+
+        update_job(
+            job_id,
+            status=JobStatus.SUCCESS,
+            stage="done",
+            result={"project_page_id": project_page.id, "url": project_page.url},
+        )
+
+        return f"Analyzed {project_page.url}"
+
+
+def process_project_keywords(project_id: int, workflow_id: int | None = None):
     """
     Processes proposed keywords for a project:
     1. Saves them to the Keyword model.
@@ -113,35 +436,48 @@ def process_project_keywords(project_id: int):
         )
         return f"No proposed keywords for project {project.name}."
 
-    keyword_strings = [kw.strip() for kw in project.proposed_keywords.split(",") if kw.strip()]
-    processed_count = 0
-    failed_count = 0
+    with attribute_upstream_usage(project):
+        keyword_strings = [kw.strip() for kw in project.proposed_keywords.split(",") if kw.strip()]
+        processed_count = 0
+        failed_count = 0
 
-    for keyword_str in keyword_strings:
         try:
-            save_keyword(keyword_str, project)
-            processed_count += 1
+            keywords, created_keywords = save_keywords(keyword_strings, project)
+            processed_count = len(keywords)
+            Keyword.fetch_and_update_metrics_in_bulk(created_keywords)
         except Exception as e:
-            failed_count += 1
+            failed_count = len(keyword_strings)
             logger.error(
-                "[KeywordProcessing] Error processing keyword",
+                "[KeywordProcessing] Error processing keywords",
                 error=str(e),
                 project_id=project.id,
-                keyword_text=keyword_str,
+                keyword_texts=keyword_strings,
             )
 
-    logger.info(
-        "Keyword Processing Complete",
-        project_id=project.id,
-        project_name=project.name,
-        processed_count=processed_count,
-        failed_count=failed_count,
-    )
+        logger.info(
+            "Keyword Processing Complete",
+            project_id=project.id,
+            project_name=project.name,
+            processed_count=processed_count,
+            failed_count=failed_count,
+        )
 
-    async_task(get_and_save_related_keywords, project_id, group="Get Related Keywords")
-    async_task(get_and_save_pasf_keywords, project_id, group="Get PASF Keywords")
+        enqueue_follow_up(
+            workflow_id,
+            "related_keywords",
+            "core.tasks.get_and_save_related_keywords",
+            project_id,
+            group="Get Related Keywords",
+        )
+        enqueue_follow_up(
+            workflow_id,
+            "pasf_keywords",
+            "core.tasks.get_and_save_pasf_keywords",
+            project_id,
+            group="Get PASF Keywords",
+        )
 
-    return f"""
+        return f"""
     Keyword processing for project {project.name} (ID: {project.id})
     Processed {processed_count} keywords
     Failed: {failed_count}
@@ -150,9 +486,11 @@ def process_project_keywords(project_id: int):
 
 def generate_blog_post_suggestions(project_id: int):
     project = Project.objects.get(id=project_id)
-    project.generate_title_suggestions(content_type=ContentType.SHARING, num_titles=3)
-    project.generate_title_suggestions(content_type=ContentType.SEO, num_titles=3)
-    return "Blog post suggestions generated"
+    with attribute_upstream_usage(project):
+        project.generate_title_suggestions_concurrently(
+            [ContentType.SHARING, ContentType.SEO], num_titles=3
+        )
+        return "Blog post suggestions generated"
 
 
 def try_create_posthog_alias(profile_id: int, cookies: dict, source_function: str = None) -> str:
@@ -256,118 +594,193 @@ def track_state_change(
         )
         profile.state = to_state
         profile.save(update_fields=["state"])
+        profile.refresh_entitlement()
 
     return f"Tracked state change from {from_state} to {to_state} for profile {profile_id}"
 
 
-def schedule_blog_post_posting():
-    now = timezone.now()
-    projects = Project.objects.filter(enable_automatic_post_submission=True)
+def refresh_stale_keyword_metrics():
+    """
+    Re-fetch metrics for keywords that are due per their refresh tier, most important first,
+    without spending more Keywords Everywhere credits per day than KEYWORD_REFRESH_DAILY_CREDITS.
+    Runs daily from a django-q schedule on the periodic cluster (see migration 0041).
+    """
+    credit_budget = (
+        settings.KEYWORD_REFRESH_DAILY_CREDITS - KeywordMetricsRefresh.credits_used_today()
+    )
+    if credit_budget <= 0:
+        return "Daily keyword refresh credits already used"
+
+    # Every keyword looked up costs one credit
+    keywords = list(Keyword.objects.due_for_refresh()[:credit_budget])
+    if not keywords:
+        return "No keywords due for a refresh"
+
+    keywords_requested = 0
+    keywords_updated = 0
+    credits_used = 0
+    for start in range(0, len(keywords), KEYWORDS_EVERYWHERE_BATCH_SIZE):
+        if credits_used >= credit_budget:
+            break
+
+        batch = keywords[start : start + KEYWORDS_EVERYWHERE_BATCH_SIZE]
+        updated_keywords, batch_credits = Keyword.fetch_and_update_metrics_in_bulk(batch)
+        keywords_requested += len(batch)
+        keywords_updated += len(updated_keywords)
+        credits_used += batch_credits
+
+        if batch_credits:
+            # Keywords the API had no data for wait for their next tier window as well
+            updated_ids = {keyword.id for keyword in updated_keywords}
+            Keyword.objects.filter(
+                id__in=[keyword.id for keyword in batch if keyword.id not in updated_ids]
+            ).update(last_fetched_at=timezone.now())
+
+    KeywordMetricsRefresh.objects.create(
+        keywords_requested=keywords_requested,
+        keywords_updated=keywords_updated,
+        credits_used=credits_used,
+        credit_budget=credit_budget,
+    )
 
-    scheduled_posts = 0
-    for project in projects:
-        if not project.has_auto_submission_setting or not project.profile.experimental_features:
-            continue
+    logger.info(
+        "[Refresh Keyword Metrics] Refreshed stale keywords",
+        keywords_requested=keywords_requested,
+        keywords_updated=keywords_updated,
+        credits_used=credits_used,
+        credit_budget=credit_budget,
+    )
 
-        if not project.last_posted_blog_post:
-            async_task(
-                "core.tasks.generate_and_post_blog_post", project.id, group="Submit Blog Post"
-            )
-            scheduled_posts += 1
-            continue
+    return (
+        f"Refreshed {keywords_updated}/{keywords_requested} keywords using {credits_used} credits"
+    )
 
-        last_post_date = project.last_posted_blog_post.date_posted
-        time_since_last_post_in_seconds = (now - last_post_date).total_seconds()
 
-        days_in_month = calendar.monthrange(now.year, now.month)[1]
-        time_between_posts_in_seconds = int(
-            days_in_month
-            * (24 * 60 * 60)
-            / project.auto_submission_settings.latest("created_at").posts_per_month
-        )
+def schedule_blog_post_posting():
+    """
+    Queue the automatic posts whose slot has come, and the generation of posts whose slot
+    is coming up, from the calendar kept on the projects.
+    """
+    now = timezone.now()
+    Project.fill_auto_post_calendar()
 
-        if time_since_last_post_in_seconds > time_between_posts_in_seconds:
-            logger.info(
-                "[Schedule Blog Post Posting] Scheduling blog post for {project.name}",
-                project_id=project.id,
-                project_name=project.name,
-            )
-            async_task(
-                "core.tasks.generate_and_post_blog_post", project.id, group="Submit Blog Post"
-            )
+    scheduled_posts = 0
+    pregenerated_posts = 0
+    coalesced_posts = 0
+    for project in Project.objects.due_for_auto_post(now):
+        pregenerate = project.next_auto_post_at > now
+        logger.info(
+            "[Schedule Blog Post Posting] Scheduling blog post for {project.name}",
+            project_id=project.id,
+            project_name=project.name,
+            next_auto_post_at=project.next_auto_post_at,
+            pregenerate=pregenerate,
+        )
+        if not queue_blog_post_posting(project, pregenerate=pregenerate):
+            coalesced_posts += 1
+        elif pregenerate:
+            pregenerated_posts += 1
+        else:
             scheduled_posts += 1
 
-    return f"Scheduled {scheduled_posts} blog posts"
+    return (
+        f"Scheduled {scheduled_posts} blog posts, {pregenerated_posts} generations ahead of "
+        f"posting, {coalesced_posts} still in progress"
+    )
 
 
-def generate_and_post_blog_post(project_id: int):
-    project = Project.objects.get(id=project_id)
-    blog_post_to_post = None
-
-    logger.info(
-        "[Generate and Post Blog Post] Generating blog post for {project.name}",
-        project_id=project_id,
-        project_name=project.name,
+def queue_blog_post_posting(project: Project, pregenerate: bool = False) -> bool:
+    """
+    Queue generate_and_post_blog_post, or pregenerate_blog_post ahead of the post's slot,
+    unless the project already has either in progress.
+    """
+    return enqueue_once(
+        f"auto_post:{project.id}",
+        "core.tasks.pregenerate_blog_post"
+        if pregenerate
+        else "core.tasks.generate_and_post_blog_post",
+        project.id,
+        group="Submit Blog Post",
+        cluster="periodic",
     )
 
-    # first see if there are generated blog posts that are not posted yet
-    blog_posts_to_post = GeneratedBlogPost.objects.filter(project=project, posted=False)
 
-    if blog_posts_to_post.exists():
+def get_or_generate_blog_post_to_post(project: Project):
+    # first see if there are generated blog posts that are not posted yet
+    blog_post_to_post = GeneratedBlogPost.objects.filter(project=project, posted=False).first()
+    if blog_post_to_post:
         logger.info(
             "[Generate and Post Blog Post] Found BlogPost to posts for {project.name}",
-            project_id=project_id,
+            project_id=project.id,
             project_name=project.name,
         )
-        blog_post_to_post = blog_posts_to_post.first()
+        return blog_post_to_post
 
     # then see if there are blog post title suggestions without generated blog posts
-    if not blog_post_to_post:
-        ungenerated_blog_post_suggestions = BlogPostTitleSuggestion.objects.filter(
-            project=project, generated_blog_posts__isnull=True
-        )
-        if ungenerated_blog_post_suggestions.exists():
-            logger.info(
-                "[Generate and Post Blog Post] Found BlogPostTitleSuggestion to generate and post for {project.name}",  # noqa: E501
-                project_id=project_id,
-                project_name=project.name,
-            )
-            ungenerated_blog_post_suggestion = ungenerated_blog_post_suggestions.first()
-            blog_post_to_post = ungenerated_blog_post_suggestion.generate_content(
-                content_type=ungenerated_blog_post_suggestion.content_type
-            )
-
-    # if neither, create a new blog post title suggestion, generate the blog post
-    if not blog_post_to_post:
+    ungenerated_blog_post_suggestion = BlogPostTitleSuggestion.objects.filter(
+        project=project, generated_blog_posts__isnull=True
+    ).first()
+    if ungenerated_blog_post_suggestion:
         logger.info(
-            "[Generate and Post Blog Post] No BlogPost or BlogPostTitleSuggestion found for {project.name}, so generatin both.",  # noqa: E501
-            project_id=project_id,
+            "[Generate and Post Blog Post] Found BlogPostTitleSuggestion to generate and post for {project.name}",  # noqa: E501
+            project_id=project.id,
             project_name=project.name,
         )
-        content_type = random.choice([choice[0] for choice in ContentType.choices])
-        suggestions = project.generate_title_suggestions(content_type=content_type, num_titles=1)
-        blog_post_to_post = suggestions[0].generate_content(
-            content_type=suggestions[0].content_type
+        return ungenerated_blog_post_suggestion.generate_content(
+            content_type=ungenerated_blog_post_suggestion.content_type
         )
 
-    # once you have the generated blog post, submit it to the endpoint
-    if blog_post_to_post:
+    # if neither, create a new blog post title suggestion, generate the blog post
+    logger.info(
+        "[Generate and Post Blog Post] No BlogPost or BlogPostTitleSuggestion found for {project.name}, so generatin both.",  # noqa: E501
+        project_id=project.id,
+        project_name=project.name,
+    )
+    content_type = random.choice([choice[0] for choice in ContentType.choices])
+    suggestions = project.generate_title_suggestions(content_type=content_type, num_titles=1)
+    return suggestions[0].generate_content(content_type=suggestions[0].content_type)
+
+
+def pregenerate_blog_post(project_id: int):
+    """Generate the next automatic post ahead of its slot, so posting it is just a submission."""
+    project = Project.objects.get(id=project_id)
+    with attribute_upstream_usage(project):
+        blog_post = get_or_generate_blog_post_to_post(project)
+
+    if not blog_post:
+        return f"No blog post generated for {project.name}."
+    return f"Generated blog post for {project.name} ahead of posting"
+
+
+def generate_and_post_blog_post(project_id: int):
+    project = Project.objects.get(id=project_id)
+    with attribute_upstream_usage(project):
         logger.info(
-            "[Generate and Post Blog Post] Submitting blog post to endpoint for {project.name}",
+            "[Generate and Post Blog Post] Generating blog post for {project.name}",
             project_id=project_id,
             project_name=project.name,
-            blog_post_title=blog_post_to_post.title,
         )
-        result = blog_post_to_post.submit_blog_post_to_endpoint()
-        if result is True:
-            blog_post_to_post.posted = True
-            blog_post_to_post.date_posted = timezone.now()
-            blog_post_to_post.save(update_fields=["posted", "date_posted"])
-            return f"Posted blog post for {project.name}"
+
+        blog_post_to_post = get_or_generate_blog_post_to_post(project)
+
+        # once you have the generated blog post, submit it to the endpoint
+        if blog_post_to_post:
+            logger.info(
+                "[Generate and Post Blog Post] Submitting blog post to endpoint for {project.name}",
+                project_id=project_id,
+                project_name=project.name,
+                blog_post_title=blog_post_to_post.title,
+            )
+            result = blog_post_to_post.submit_blog_post_to_endpoint()
+            if result is True:
+                blog_post_to_post.posted = True
+                blog_post_to_post.date_posted = timezone.now()
+                blog_post_to_post.save(update_fields=["posted", "date_posted"])
+                return f"Posted blog post for {project.name}"
+            else:
+                return f"Failed to post blog post for {project.name}."
         else:
-            return f"Failed to post blog post for {project.name}."
-    else:
-        return f"No blog post to post for {project.name}."
+            return f"No blog post to post for {project.name}."
 
 
 def get_and_save_related_keywords(
@@ -381,9 +794,9 @@ def get_and_save_related_keywords(
 
     Process:
     1. Finds high-volume keywords (>volume_threshold) that haven't been processed yet
-    2. For each keyword, calls Keywords Everywhere API to get related keywords
-    3. Saves each related keyword to database with metrics and project association
-    4. Marks parent keyword as processed to avoid duplicate API calls
+    2. Looks up related keywords for all of them concurrently
+    3. Saves the related keywords with their metrics and project association
+    4. Marks parent keywords as processed to avoid duplicate API calls
 
     Args:
         project_id: ID of the project to process keywords for
@@ -400,103 +813,23 @@ def get_and_save_related_keywords(
         logger.error(f"[GetRelatedKeywords] Project {project_id} not found.")
         return f"Project {project_id} not found."
 
-    keywords_to_process = ProjectKeyword.objects.filter(
-        project=project,
-        keyword__volume__gt=volume_threshold,
-        keyword__volume__isnull=False,
-        keyword__got_related_keywords=False,
-    ).select_related("keyword")[:limit]
-
-    if not keywords_to_process.exists():
-        return f"No unprocessed high-volume keywords found for {project.name}."
-
-    stats = {
-        "processed": 0,
-        "failed": 0,
-        "total": keywords_to_process.count(),
-        "credits_used": 0,
-        "related_found": 0,
-        "related_saved": 0,
-    }
-
-    logger.info(f"[GetRelatedKeywords] Processing {stats['total']} keywords for {project.name}")
-
-    api_url = "https://api.keywordseverywhere.com/v1/get_related_keywords"
-    headers = {
-        "Accept": "application/json",
-        "Authorization": f"Bearer {settings.KEYWORDS_EVERYWHERE_API_KEY}",
-    }
-
-    for project_keyword in keywords_to_process:
-        keyword = project_keyword.keyword
-
-        try:
-            response = requests.post(
-                api_url,
-                data={"keyword": keyword.keyword_text, "num": num_related_keywords},
-                headers=headers,
-                timeout=30,
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                related_keywords = data.get("data", [])
-                stats["credits_used"] += data.get("credits_consumed", 0)
-                stats["related_found"] += len(related_keywords)
-                stats["processed"] += 1
-
-                for keyword_text in related_keywords:
-                    if keyword_text and keyword_text.strip():
-                        try:
-                            save_keyword(keyword_text.strip(), project)
-                            stats["related_saved"] += 1
-                        except Exception as e:
-                            logger.error(
-                                "[GetRelatedKeywords] Failed to save keyword",
-                                keyword_text=keyword_text,
-                                error=str(e),
-                                exc_info=True,
-                            )
-
-                keyword.got_related_keywords = True
-                keyword.save(update_fields=["got_related_keywords"])
-
-            else:
-                stats["failed"] += 1
-                logger.warning(
-                    "[GetRelatedKeywords] API error for Keyword",
-                    keyword_text=keyword.keyword_text,
-                    response_status_code=response.status_code,
-                    exc_info=True,
-                )
-
-        except Exception as e:
-            stats["failed"] += 1
-            logger.error(
-                "[GetRelatedKeywords] Error processing Keyword",
-                keyword_text=keyword.keyword_text,
-                error=str(e),
-                exc_info=True,
-            )
-
-    logger.info(
-        "[GetRelatedKeywords] Completed",
-        project_id=project_id,
-        project_name=project.name,
-        processed=stats["processed"],
-        total=stats["total"],
-        failed=stats["failed"],
-        credits_used=stats["credits_used"],
-        related_found=stats["related_found"],
-        related_saved=stats["related_saved"],
-    )
+    with attribute_upstream_usage(project):
+        stats = expand_project_keywords(
+            project,
+            RELATED_KEYWORDS_SOURCE,
+            limit=limit,
+            num_keywords=num_related_keywords,
+            volume_threshold=volume_threshold,
+        )
+        if not stats["total"]:
+            return f"No unprocessed high-volume keywords found for {project.name}."
 
-    return f"""Related Keywords Processing Results for {project.name}:
+        return f"""Related Keywords Processing Results for {project.name}:
     Keywords processed: {stats["processed"]}/{stats["total"]}
     Failed: {stats["failed"]}
     API credits used: {stats["credits_used"]}
-    Related keywords found: {stats["related_found"]}
-    Related keywords saved: {stats["related_saved"]}"""
+    Related keywords found: {stats["found"]}
+    Related keywords saved: {stats["saved"]}"""
 
 
 def get_and_save_pasf_keywords(
@@ -511,9 +844,9 @@ def get_and_save_pasf_keywords(
 
     Process:
     1. Finds high-volume keywords (>volume_threshold) that haven't been processed for PASF yet
-    2. For each keyword, calls Keywords Everywhere PASF API to get related search queries
-    3. Saves each PASF keyword to database with metrics and project association
-    4. Marks parent keyword as processed to avoid duplicate API calls
+    2. Looks up PASF keywords for all of them concurrently
+    3. Saves the PASF keywords with their metrics and project association
+    4. Marks parent keywords as processed to avoid duplicate API calls
 
     Args:
         project_id: ID of the project to process keywords for
@@ -530,95 +863,22 @@ def get_and_save_pasf_keywords(
         logger.error(f"[GetPASFKeywords] Project {project_id} not found.")
         return f"Project {project_id} not found."
 
-    keywords_to_process = ProjectKeyword.objects.filter(
-        project=project,
-        keyword__volume__gt=volume_threshold,
-        keyword__volume__isnull=False,
-        keyword__got_people_also_search_for_keywords=False,
-    ).select_related("keyword")[:limit]
-
-    if not keywords_to_process.exists():
-        return f"No unprocessed high-volume keywords found for PASF processing in {project.name}."
-
-    stats = {
-        "processed": 0,
-        "failed": 0,
-        "total": keywords_to_process.count(),
-        "credits_used": 0,
-        "pasf_found": 0,
-        "pasf_saved": 0,
-    }
-
-    logger.info(f"[GetPASFKeywords] Processing {stats['total']} keywords for {project.name}")
-
-    api_url = "https://api.keywordseverywhere.com/v1/get_pasf_keywords"
-    headers = {
-        "Accept": "application/json",
-        "Authorization": f"Bearer {settings.KEYWORDS_EVERYWHERE_API_KEY}",
-    }
-
-    for project_keyword in keywords_to_process:
-        keyword = project_keyword.keyword
-
-        try:
-            response = requests.post(
-                api_url,
-                data={"keyword": keyword.keyword_text, "num": num_pasf_keywords},
-                headers=headers,
-                timeout=30,
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                pasf_keywords = data.get("data", [])
-                stats["credits_used"] += data.get("credits_consumed", 0)
-                stats["pasf_found"] += len(pasf_keywords)
-                stats["processed"] += 1
-
-                for keyword_text in pasf_keywords:
-                    if keyword_text and keyword_text.strip():
-                        try:
-                            save_keyword(keyword_text.strip(), project)
-                            stats["pasf_saved"] += 1
-                        except Exception as e:
-                            logger.error(
-                                "[GetPASFKeywords] Failed to save keyword",
-                                keyword_text=keyword_text,
-                                error=str(e),
-                                exc_info=True,
-                            )
-
-                keyword.got_people_also_search_for_keywords = True
-                keyword.save(update_fields=["got_people_also_search_for_keywords"])
-
-            else:
-                stats["failed"] += 1
-                logger.warning(
-                    "[GetPASFKeywords] API error for Keyword",
-                    keyword_text=keyword.keyword_text,
-                    response_status_code=response.status_code,
-                    response_content=response.content.decode("utf-8")
-                    if response.content
-                    else "No content",
-                    exc_info=True,
-                )
-
-        except Exception as e:
-            stats["failed"] += 1
-            logger.error(
-                "[GetPASFKeywords] Error processing Keyword",
-                keyword_text=keyword.keyword_text,
-                error=str(e),
-                exc_info=True,
+    with attribute_upstream_usage(project):
+        stats = expand_project_keywords(
+            project,
+            PASF_KEYWORDS_SOURCE,
+            limit=limit,
+            num_keywords=num_pasf_keywords,
+            volume_threshold=volume_threshold,
+        )
+        if not stats["total"]:
+            return (
+                f"No unprocessed high-volume keywords found for PASF processing in {project.name}."
             )
 
-    logger.info(
-        f"[GetPASFKeywords] Completed: {stats['processed']}/{stats['total']} keywords processed"
-    )
-
-    return f"""PASF Keywords Processing Results for {project.name}:
+        return f"""PASF Keywords Processing Results for {project.name}:
     Keywords processed: {stats["processed"]}/{stats["total"]}
     Failed: {stats["failed"]}
     API credits used: {stats["credits_used"]}
-    PASF keywords found: {stats["pasf_found"]}
-    PASF keywords saved: {stats["pasf_saved"]}"""
+    PASF keywords found: {stats["found"]}
+    PASF keywords saved: {stats["saved"]}"""
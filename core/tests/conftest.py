@@ -1,5 +1,33 @@
+import pytest
 from django.conf import settings
+from django.contrib.auth.models import User
+
+from core.models import Project
 
 
 def pytest_configure(config):
-    settings.STORAGES["staticfiles"]["BACKEND"] = "django.contrib.staticfiles.storage.StaticFilesStorage"
+    settings.STORAGES["staticfiles"]["BACKEND"] = (
+        "django.contrib.staticfiles.storage.StaticFilesStorage"
+    )
+    for cache_alias in [
+        "agent_results",
+        "scraped_pages",
+        "jobs",
+        "entitlements",
+        "rate_limits",
+        "task_locks",
+    ]:
+        settings.CACHES[cache_alias] = {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 1000},
+        }
+
+
+@pytest.fixture
+def profile(db):
+    return User.objects.create_user(username="owner", email="owner@example.com").profile
+
+
+@pytest.fixture
+def project(profile):
+    return Project.objects.create(profile=profile, url="https://example.com", name="Example")
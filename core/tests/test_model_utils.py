@@ -0,0 +1,55 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core import model_utils
+from core.model_utils import HTTPClient, acquire_rate_limit
+
+
+@pytest.fixture
+def flaky_server():
+    """Local server answering 503 to the first two requests and 200 afterwards."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            self.send_response(503 if len(requests_seen) <= 2 else 200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", requests_seen
+    server.shutdown()
+
+
+def test_rate_limit_spreads_requests_over_the_second():
+    started_at = time.monotonic()
+    for _ in range(8):
+        acquire_rate_limit("test-spread", 4)
+
+    # 4 tokens are available straight away, the next 4 refill at one every 0.25s
+    assert time.monotonic() - started_at >= 0.9
+
+
+def test_every_retry_takes_a_rate_limit_token(flaky_server, monkeypatch):
+    url, requests_seen = flaky_server
+    tokens_taken = []
+    monkeypatch.setattr(
+        model_utils,
+        "acquire_rate_limit",
+        lambda upstream, requests_per_second: tokens_taken.append(upstream),
+    )
+    client = HTTPClient(upstream="test-retry", retries=2, rate_limit=100)
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert len(requests_seen) == 3
+    assert tokens_taken == ["test-retry"] * 3
@@ -0,0 +1,276 @@
+from datetime import UTC, date, datetime, time, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django_q.models import Schedule
+
+from core.choices import JobStatus, WorkflowKind, WorkflowNodeStatus
+from core.model_utils import AgentRunOutput
+from core.models import (
+    AutoSubmissionSetting,
+    BlogPostTitleSuggestion,
+    GeneratedBlogPost,
+    Keyword,
+    Profile,
+    Project,
+    Workflow,
+)
+from core.schemas import TitleSuggestion, TitleSuggestions
+
+
+def make_title_suggestions_result(count):
+    return AgentRunOutput(
+        output=TitleSuggestions(
+            titles=[
+                TitleSuggestion(
+                    title=f"Title {i}",
+                    category="General",
+                    target_keywords=["seo"],
+                    description="Description",
+                    suggested_meta_description="Meta description",
+                )
+                for i in range(count)
+            ]
+        )
+    )
+
+
+def get_usage_counters(profile):
+    profile.refresh_from_db(fields=["generated_blog_posts_count", "title_suggestions_count"])
+    return profile.generated_blog_posts_count, profile.title_suggestions_count
+
+
+@pytest.mark.django_db
+class TestUsageCounters:
+    def test_counts_created_and_deleted_rows(self, profile, project):
+        suggestion = BlogPostTitleSuggestion.objects.create(project=project, title="Title")
+        post = GeneratedBlogPost.objects.create(project=project, title=suggestion, content="Body")
+
+        assert get_usage_counters(profile) == (1, 1)
+
+        post.delete()
+        suggestion.delete()
+
+        assert get_usage_counters(profile) == (0, 0)
+
+    def test_counts_bulk_created_title_suggestions(self, profile, project):
+        project.save_title_suggestions(make_title_suggestions_result(3), content_type="SHARING")
+
+        assert get_usage_counters(profile) == (0, 3)
+        assert profile.number_of_title_suggestions == 3
+
+    def test_counts_queryset_and_cascaded_deletes(self, profile, project):
+        project.save_title_suggestions(make_title_suggestions_result(3), content_type="SHARING")
+        suggestion = BlogPostTitleSuggestion.objects.filter(project=project).first()
+        GeneratedBlogPost.objects.create(project=project, title=suggestion, content="Body")
+
+        BlogPostTitleSuggestion.objects.filter(project=project).exclude(id=suggestion.id).delete()
+        assert get_usage_counters(profile) == (1, 1)
+
+        project.delete()
+        assert get_usage_counters(profile) == (0, 0)
+
+    def test_reconcile_fixes_drift(self, profile, project):
+        # Rows inserted without going through signals or save_title_suggestions
+        BlogPostTitleSuggestion.objects.bulk_create(
+            [BlogPostTitleSuggestion(project=project, title=f"Title {i}") for i in range(2)]
+        )
+        assert get_usage_counters(profile) == (0, 0)
+
+        assert Profile.reconcile_usage_counters() == 1
+        assert get_usage_counters(profile) == (0, 2)
+        assert Profile.reconcile_usage_counters() == 0
+
+
+def get_node_statuses(workflow):
+    return list(workflow.nodes.order_by("id").values_list("status", flat=True))
+
+
+@pytest.mark.django_db
+class TestWorkflowDispatch:
+    @pytest.fixture
+    def workflows(self, settings, project):
+        settings.WORKFLOW_QUEUE_CAPACITY = 3
+        other_user = User.objects.create_user(username="other", email="other@example.com")
+        other_project = Project.objects.create(
+            profile=other_user.profile, url="https://example.org", name="Other"
+        )
+
+        workflows = []
+        for workflow_project in [project, other_project]:
+            workflow = Workflow.objects.create(
+                project=workflow_project, kind=WorkflowKind.ONBOARDING, max_concurrency=2
+            )
+            for i in range(3):
+                workflow.add_node(f"node:{i}", "core.tasks.track_event")
+            workflows.append(workflow)
+
+        return workflows
+
+    def test_fills_capacity_within_each_workflows_concurrency(self, workflows):
+        Workflow.dispatch([workflows[0].id])
+
+        assert get_node_statuses(workflows[0]).count(WorkflowNodeStatus.QUEUED) == 2
+        assert get_node_statuses(workflows[1]).count(WorkflowNodeStatus.QUEUED) == 1
+
+    def test_finished_node_frees_its_slot(self, workflows):
+        Workflow.dispatch([workflows[0].id])
+        node = workflows[0].nodes.filter(status=WorkflowNodeStatus.QUEUED).first()
+
+        node.finish(succeeded=True)
+
+        # Both profiles have one node in flight for the same weight, the tie goes to the oldest
+        assert get_node_statuses(workflows[0]) == [
+            WorkflowNodeStatus.SUCCESS,
+            WorkflowNodeStatus.QUEUED,
+            WorkflowNodeStatus.QUEUED,
+        ]
+        assert get_node_statuses(workflows[1]).count(WorkflowNodeStatus.QUEUED) == 1
+
+    def test_expired_lease_frees_its_slot(self, workflows):
+        Workflow.dispatch([workflows[0].id])
+        workflows[1].nodes.filter(status=WorkflowNodeStatus.QUEUED).update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        Workflow.dispatch()
+
+        assert get_node_statuses(workflows[1]) == [
+            WorkflowNodeStatus.ERROR,
+            WorkflowNodeStatus.QUEUED,
+            WorkflowNodeStatus.PENDING,
+        ]
+
+    def test_scheduled_dispatch_recovers_a_workflow_with_no_other_activity(self, workflows):
+        workflow = workflows[0]
+        Workflow.dispatch([workflow.id])
+        queued = list(workflow.nodes.filter(status=WorkflowNodeStatus.QUEUED))
+        queued[0].finish(succeeded=True)
+        workflow.nodes.exclude(status=WorkflowNodeStatus.SUCCESS).update(
+            status=WorkflowNodeStatus.RUNNING,
+            lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        schedule = Schedule.objects.get(func="core.tasks.dispatch_workflows")
+
+        import_string(schedule.func)()
+
+        workflow.refresh_from_db()
+        assert schedule.cluster == "periodic"
+        assert workflow.finished_at is not None
+        assert workflow.status == JobStatus.ERROR
+
+    def test_finishes_workflow_once_every_node_finished(self, workflows):
+        workflow = workflows[0]
+        for _ in range(3):
+            Workflow.dispatch([workflow.id])
+            for node in workflow.nodes.filter(status=WorkflowNodeStatus.QUEUED):
+                node.finish(succeeded=node.key != "node:0")
+
+        workflow.refresh_from_db()
+        assert workflow.finished_at is not None
+        assert workflow.status == JobStatus.ERROR
+
+
+class TestNextPostAt:
+    earliest = datetime(2026, 3, 10, 8, 0, tzinfo=UTC)
+
+    def test_without_preferred_time(self):
+        assert AutoSubmissionSetting.next_post_at(self.earliest) == self.earliest
+
+    def test_later_the_same_day(self):
+        post_at = AutoSubmissionSetting.next_post_at(self.earliest, time(9, 30), "Europe/Berlin")
+
+        assert post_at == datetime(2026, 3, 10, 8, 30, tzinfo=UTC)
+
+    def test_already_passed_moves_to_the_next_day(self):
+        post_at = AutoSubmissionSetting.next_post_at(self.earliest, time(7, 0), "UTC")
+
+        assert post_at == datetime(2026, 3, 11, 7, 0, tzinfo=UTC)
+
+    def test_unknown_timezone_falls_back_to_utc(self):
+        post_at = AutoSubmissionSetting.next_post_at(self.earliest, time(9, 0), "Mars/Olympus")
+
+        assert post_at == datetime(2026, 3, 10, 9, 0, tzinfo=UTC)
+
+
+@pytest.mark.django_db
+class TestAutoPostCalendar:
+    @pytest.fixture
+    def auto_posting_project(self, profile, project):
+        profile.experimental_features = True
+        profile.save()
+        project.enable_automatic_post_submission = True
+        project.save()
+        AutoSubmissionSetting.objects.create(
+            project=project, endpoint_url="https://example.com/posts", posts_per_month=4
+        )
+        return project
+
+    def get_due_project_ids(self, now):
+        return list(Project.objects.due_for_auto_post(now).values_list("id", flat=True))
+
+    def test_fills_the_calendar_once(self, settings, auto_posting_project):
+        settings.AUTO_POST_PREGENERATION_HOURS = 12
+        setting = auto_posting_project.auto_submission_settings.get()
+
+        assert Project.fill_auto_post_calendar() == 1
+        assert Project.fill_auto_post_calendar() == 0
+
+        auto_posting_project.refresh_from_db()
+        post_at = auto_posting_project.next_auto_post_at
+        generate_at = auto_posting_project.next_auto_post_generate_at
+        assert post_at == setting.created_at
+        assert post_at - timedelta(hours=12) <= generate_at <= post_at - timedelta(hours=1)
+
+    def test_skips_projects_without_automatic_submission(self, auto_posting_project):
+        Project.objects.filter(id=auto_posting_project.id).update(
+            enable_automatic_post_submission=False
+        )
+
+        assert Project.fill_auto_post_calendar() == 0
+
+    def test_due_to_generate_then_to_post(self, auto_posting_project):
+        post_at = timezone.now() + timedelta(hours=6)
+        Project.objects.filter(id=auto_posting_project.id).update(
+            next_auto_post_at=post_at, next_auto_post_generate_at=post_at - timedelta(hours=8)
+        )
+
+        assert self.get_due_project_ids(post_at - timedelta(hours=10)) == []
+        assert self.get_due_project_ids(post_at - timedelta(hours=4)) == [auto_posting_project.id]
+
+        # Once a post is generated it waits for its slot
+        GeneratedBlogPost.objects.create(project=auto_posting_project, content="Body")
+        assert self.get_due_project_ids(post_at - timedelta(hours=4)) == []
+        assert self.get_due_project_ids(post_at) == [auto_posting_project.id]
+
+    def test_settings_change_clears_the_calendar(self, auto_posting_project):
+        Project.fill_auto_post_calendar()
+
+        setting = auto_posting_project.auto_submission_settings.get()
+        setting.posts_per_month = 8
+        setting.save()
+
+        auto_posting_project.refresh_from_db()
+        assert auto_posting_project.next_auto_post_at is None
+        assert auto_posting_project.next_auto_post_generate_at is None
+
+
+def test_apply_keyword_metrics_builds_trend_series():
+    keyword = Keyword(keyword_text="django seo")
+
+    keyword.apply_keyword_metrics(
+        {
+            "vol": 90,
+            "trend": [
+                {"month": "March", "year": 2025, "value": 30},
+                {"month": "Jan", "year": 2025, "value": 10},
+                {"month": "Smarch", "year": 2025, "value": 99},
+            ],
+        }
+    )
+
+    assert keyword.volume == 90
+    assert keyword.trend_series_start == date(2025, 1, 1)
+    assert keyword.trend_series == [10, 0, 30]
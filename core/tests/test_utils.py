@@ -0,0 +1,75 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.utils import timezone
+
+from core.models import Keyword, ProjectKeyword
+from core.utils import normalize_keyword_text, save_keywords
+
+
+def test_normalize_keyword_text():
+    assert normalize_keyword_text("  Django   SEO\tTools ") == "django seo tools"
+
+
+@pytest.mark.django_db
+class TestSaveKeywords:
+    def test_normalizes_and_deduplicates(self, project):
+        keywords, created = save_keywords(
+            ["Django SEO", "django  seo", " DJANGO SEO ", "", "   ", "blog ideas"], project
+        )
+
+        assert sorted(keyword.keyword_text for keyword in keywords) == ["blog ideas", "django seo"]
+        assert len(created) == 2
+        assert Keyword.objects.count() == 2
+        assert ProjectKeyword.objects.filter(project=project).count() == 2
+
+    def test_reuses_existing_keywords(self, project):
+        Keyword.objects.create(keyword_text="django seo", country="us")
+
+        keywords, created = save_keywords(["Django SEO", "blog ideas"], project)
+
+        assert len(keywords) == 2
+        assert [keyword.keyword_text for keyword in created] == ["blog ideas"]
+        assert Keyword.objects.count() == 2
+
+    def test_saving_again_creates_nothing(self, project):
+        save_keywords(["django seo"], project)
+
+        keywords, created = save_keywords(["Django SEO"], project)
+
+        assert len(keywords) == 1
+        assert created == []
+        assert ProjectKeyword.objects.filter(project=project).count() == 1
+
+    def test_empty_input(self, project):
+        assert save_keywords(["", "  "], project) == ([], [])
+
+
+@pytest.mark.django_db
+def test_mixed_case_keywords_are_merged(project, profile):
+    merge_keyword_case_duplicates = import_module(
+        "core.migrations.0044_merge_keyword_case_duplicates"
+    ).merge_keyword_case_duplicates
+    other_project = profile.projects.create(url="https://other.example.com")
+    mixed_case = Keyword.objects.create(
+        keyword_text="Email  Marketing", country="us", volume=900, last_fetched_at=timezone.now()
+    )
+    lowercase = Keyword.objects.create(keyword_text="email marketing", country="us")
+    ProjectKeyword.objects.create(project=project, keyword=mixed_case, use=True)
+    ProjectKeyword.objects.create(project=project, keyword=lowercase)
+    ProjectKeyword.objects.create(project=other_project, keyword=lowercase)
+
+    merge_keyword_case_duplicates(apps, None)
+
+    keyword = Keyword.objects.get()
+    assert keyword.id == mixed_case.id
+    assert keyword.keyword_text == "email marketing"
+    assert keyword.volume == 900
+    assert ProjectKeyword.objects.get(project=project, keyword=keyword).use
+    assert ProjectKeyword.objects.filter(project=other_project, keyword=keyword).exists()
+
+    keywords, created = save_keywords(["Email Marketing"], project)
+
+    assert keywords == [keyword]
+    assert created == []
@@ -1,6 +1,11 @@
+import threading
+
 import pytest
 from django.urls import reverse
 
+from core.api import views
+from core.models import BlogPostTitleSuggestion
+
 
 @pytest.mark.django_db
 class TestHomeView:
@@ -13,3 +18,40 @@ class TestHomeView:
         url = reverse("home")
         response = client.get(url)
         assert "pages/home.html" in [t.name for t in response.templates]
+
+
+@pytest.mark.django_db
+class TestStreamBlogContent:
+    @pytest.fixture
+    def suggestion(self, project):
+        return project.blog_post_title_suggestions.create(title="Hello", description="World")
+
+    @pytest.fixture
+    def url(self, suggestion):
+        return f"/api/generate-blog-content/{suggestion.id}/stream"
+
+    def test_rejects_streams_over_the_cap(self, client, profile, url, monkeypatch):
+        monkeypatch.setattr(views, "blog_content_stream_slots", threading.BoundedSemaphore(1))
+        views.blog_content_stream_slots.acquire()
+        client.force_login(profile.user)
+
+        response = client.post(url)
+
+        assert response.status_code == 429
+        assert response.json()["status"] == "error"
+
+    def test_frees_its_slot_when_closed(self, client, profile, url, monkeypatch):
+        monkeypatch.setattr(views, "blog_content_stream_slots", threading.BoundedSemaphore(1))
+        monkeypatch.setattr(
+            BlogPostTitleSuggestion,
+            "stream_content",
+            lambda self, content_type: iter([("content", "Hi"), ("error", None)]),
+        )
+        client.force_login(profile.user)
+
+        first = client.post(url)
+        first.close()
+        second = client.post(url)
+
+        assert second.status_code == 200
+        assert b"event: content" in b"".join(second.streaming_content)
@@ -1,9 +1,25 @@
+import contextvars
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from uuid import uuid4
+
 import posthog
 from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.utils import ErrorList
+from django_q.tasks import async_task
+from redis.exceptions import RedisError
 
-from core.choices import KeywordDataSource
-from core.models import Keyword, Profile, Project, ProjectKeyword
+from core.choices import JobStatus, KeywordDataSource
+from core.model_utils import get_http_client, reset_usage_attribution, set_usage_attribution
+from core.models import AgentRun, Keyword, Profile, Project, ProjectKeyword, UpstreamUsage
 from tuxseo.utils import get_tuxseo_logger
 
 logger = get_tuxseo_logger(__name__)
@@ -87,23 +103,356 @@ def get_or_create_project(profile_id, url, source=None):
     return project
 
 
-def save_keyword(keyword_text: str, project: Project):
-    """Helper function to save a related keyword with metrics and project association."""
-    keyword_obj, created = Keyword.objects.get_or_create(
-        keyword_text=keyword_text,
-        country="us",
-        data_source=KeywordDataSource.GOOGLE_KEYWORD_PLANNER,
+def normalize_keyword_text(keyword_text: str) -> str:
+    return " ".join(keyword_text.split()).lower()
+
+
+def save_keywords(keyword_texts: list[str], project: Project):
+    """
+    Save keywords and associate them with a project using a constant number of queries.
+
+    Keyword texts are normalized and de-duplicated, existing rows are resolved with a single
+    IN query and the missing Keyword/ProjectKeyword rows are bulk inserted, skipping rows
+    another worker created in the meantime.
+
+    Returns a tuple of (all keywords, keywords created by this call). Only the created ones
+    need their metrics fetched.
+    """
+    normalized_texts = list(
+        dict.fromkeys(
+            normalize_keyword_text(keyword_text)
+            for keyword_text in keyword_texts
+            if keyword_text and keyword_text.strip()
+        )
     )
+    if not normalized_texts:
+        return [], []
 
-    # Fetch metrics if newly created
-    if created:
-        metrics_fetched = keyword_obj.fetch_and_update_metrics()
-        if not metrics_fetched:
-            logger.warning(
-                "[Save Keyword] Failed to fetch metrics for keyword",
-                keyword_id=keyword_obj.id,
-                keyword_text=keyword_text,
+    keyword_lookup = {
+        "keyword_text__in": normalized_texts,
+        "country": "us",
+        "data_source": KeywordDataSource.GOOGLE_KEYWORD_PLANNER,
+    }
+
+    existing_texts = set(
+        Keyword.objects.filter(**keyword_lookup).values_list("keyword_text", flat=True)
+    )
+    missing_texts = [text for text in normalized_texts if text not in existing_texts]
+
+    if missing_texts:
+        Keyword.objects.bulk_create(
+            [
+                Keyword(
+                    keyword_text=text,
+                    country="us",
+                    data_source=KeywordDataSource.GOOGLE_KEYWORD_PLANNER,
+                )
+                for text in missing_texts
+            ],
+            ignore_conflicts=True,
+        )
+
+    # ignore_conflicts leaves pks unset, so read the rows back to get them
+    keywords = list(Keyword.objects.filter(**keyword_lookup))
+
+    ProjectKeyword.objects.bulk_create(
+        [ProjectKeyword(project=project, keyword=keyword) for keyword in keywords],
+        ignore_conflicts=True,
+    )
+
+    missing_texts = set(missing_texts)
+    created_keywords = [keyword for keyword in keywords if keyword.keyword_text in missing_texts]
+
+    logger.info(
+        "[Save Keywords] Saved keywords for project",
+        project_id=project.id,
+        requested=len(keyword_texts),
+        unique=len(normalized_texts),
+        created=len(created_keywords),
+    )
+
+    return keywords, created_keywords
+
+
+def encode_page_cursor(position) -> str:
+    """Opaque, url-safe cursor for a (sort value, id) page position."""
+    return urlsafe_b64encode(json.dumps(position, cls=DjangoJSONEncoder).encode()).decode()
+
+
+def decode_page_cursor(cursor: str):
+    """Inverse of `encode_page_cursor`, raises ValueError for malformed cursors."""
+    try:
+        sort_value, object_id = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page cursor: {cursor}") from e
+    return sort_value, int(object_id)
+
+
+def create_job(profile_id: int, kind: str, stage: str = "") -> str:
+    """
+    Register a background job and return its id.
+
+    Job state lives in the "jobs" cache so the web process can report the progress of work
+    done by django-q workers without a database round trip per poll.
+    """
+    job_id = uuid4().hex
+    caches["jobs"].set(
+        job_id,
+        {
+            "id": job_id,
+            "kind": kind,
+            "profile_id": profile_id,
+            "status": JobStatus.PENDING,
+            "stage": stage,
+            "message": "",
+            "result": {},
+        },
+    )
+    return job_id
+
+
+def update_job(job_id: str, **fields):
+    job = caches["jobs"].get(job_id)
+    if job is None:
+        logger.warning("[Update Job] Job not found", job_id=job_id, **fields)
+        return None
+
+    job.update(fields)
+    caches["jobs"].set(job_id, job)
+    return job
+
+
+def get_job(job_id: str, profile_id: int | None = None):
+    job = caches["jobs"].get(job_id)
+    if job is None or (profile_id is not None and job["profile_id"] != profile_id):
+        return None
+    return job
+
+
+def job_step(stage: str):
+    """
+    Wrap one step of a job that runs as a django-q chain.
+
+    Steps take (object_id, job_id). django-q enqueues the next task of a chain even when the
+    previous one failed, so steps of a job that already failed are skipped, and unexpected
+    errors mark the job as failed before being re-raised.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(object_id, job_id):
+            job = get_job(job_id)
+            if job and job["status"] == JobStatus.ERROR:
+                return f"Skipped {func.__name__}, job {job_id} already failed"
+
+            update_job(job_id, status=JobStatus.RUNNING, stage=stage)
+            try:
+                return func(object_id, job_id)
+            except Exception:
+                update_job(
+                    job_id,
+                    status=JobStatus.ERROR,
+                    message="An unexpected error occurred. Please try again later.",
+                )
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+def _task_lock_key(dedup_key: str) -> str:
+    return hashlib.sha256(dedup_key.encode()).hexdigest()
+
+
+def enqueue_once(dedup_key: str, func, *args, lock_timeout=DEFAULT_TIMEOUT, **kwargs) -> bool:
+    """
+    Queue `func` like async_task, unless a task with the same `dedup_key` is already queued
+    or running, and return whether it was queued.
+
+    The key is held in the "task_locks" cache until `core.tasks.run_once` has run the task,
+    or for `lock_timeout` seconds (TASK_LOCK_TIMEOUT by default) if its worker dies first.
+    If the cache is unreachable the task is queued anyway.
+    """
+    try:
+        acquired = caches["task_locks"].add(
+            _task_lock_key(dedup_key), dedup_key, timeout=lock_timeout
+        )
+    except RedisError as e:
+        logger.warning("[Enqueue Once] Cache unavailable, not deduplicating", error=str(e))
+        acquired = True
+
+    if not acquired:
+        logger.info("[Enqueue Once] Task already queued or running", dedup_key=dedup_key)
+        return False
+
+    async_task("core.tasks.run_once", dedup_key, func, *args, **kwargs)
+    return True
+
+
+def release_task_lock(dedup_key: str):
+    try:
+        caches["task_locks"].delete(_task_lock_key(dedup_key))
+    except RedisError as e:
+        logger.warning("[Release Task Lock] Cache unavailable", error=str(e), dedup_key=dedup_key)
+
+
+@contextmanager
+def attribute_upstream_usage(project: Project):
+    """
+    Attribute upstream API calls and agent runs made inside the block to a project and its
+    profile, then save the usage this process has counted so far.
+    """
+    token = set_usage_attribution(project.id, project.profile_id)
+    try:
+        yield
+    finally:
+        reset_usage_attribution(token)
+        UpstreamUsage.save_buffered()
+        AgentRun.save_buffered()
+
+
+@dataclass(frozen=True)
+class KeywordExpansionSource:
+    """A Keywords Everywhere endpoint that suggests new keywords for a parent keyword."""
+
+    label: str
+    log_prefix: str
+    api_url: str
+    # Keyword flag marking parents already expanded with this source
+    processed_field: str
+
+
+RELATED_KEYWORDS_SOURCE = KeywordExpansionSource(
+    label="Related",
+    log_prefix="[GetRelatedKeywords]",
+    api_url="https://api.keywordseverywhere.com/v1/get_related_keywords",
+    processed_field="got_related_keywords",
+)
+
+PASF_KEYWORDS_SOURCE = KeywordExpansionSource(
+    label="PASF",
+    log_prefix="[GetPASFKeywords]",
+    api_url="https://api.keywordseverywhere.com/v1/get_pasf_keywords",
+    processed_field="got_people_also_search_for_keywords",
+)
+
+
+def _fetch_expansion_keywords(source: KeywordExpansionSource, keyword_text: str, num: int):
+    """Returns (keyword texts, credits consumed), or None when the API call failed."""
+    response = get_http_client("keywords_everywhere").post(
+        source.api_url,
+        data={"keyword": keyword_text, "num": num},
+        headers={
+            "Accept": "application/json",
+            "Authorization": f"Bearer {settings.KEYWORDS_EVERYWHERE_API_KEY}",
+        },
+    )
+
+    if response.status_code != 200:
+        logger.warning(
+            f"{source.log_prefix} API error for Keyword",
+            keyword_text=keyword_text,
+            response_status_code=response.status_code,
+            response_content=response.text[:500] if response.content else "No content",
+        )
+        return None
+
+    data = response.json()
+    return data.get("data", []), data.get("credits_consumed", 0)
+
+
+def expand_project_keywords(
+    project: Project,
+    source: KeywordExpansionSource,
+    limit: int,
+    num_keywords: int,
+    volume_threshold: int,
+):
+    """
+    Find new keywords for a project's high-volume keywords with one expansion source.
+
+    Parent lookups run concurrently (the Keywords Everywhere client enforces the shared rate
+    limit), then everything found is saved with one `save_keywords` call and the new
+    keywords get their metrics in one batched lookup.
+
+    Returns the processing stats.
+    """
+    parents = list(
+        Keyword.objects.filter(
+            keyword_projects__project=project,
+            volume__gt=volume_threshold,
+            **{source.processed_field: False},
+        )[:limit]
+    )
+
+    stats = {
+        "processed": 0,
+        "failed": 0,
+        "total": len(parents),
+        "credits_used": 0,
+        "found": 0,
+        "saved": 0,
+    }
+    if not parents:
+        return stats
+
+    logger.info(f"{source.log_prefix} Processing {stats['total']} keywords for {project.name}")
+
+    def fetch(parent):
+        try:
+            return _fetch_expansion_keywords(source, parent.keyword_text, num_keywords)
+        except Exception as e:
+            logger.error(
+                f"{source.log_prefix} Error processing Keyword",
+                keyword_text=parent.keyword_text,
+                error=str(e),
+                exc_info=True,
             )
+            return None
+
+    # Only HTTP happens in the threads, all database work stays on this one. Each lookup runs
+    # in a copy of this context so its usage is attributed to the project.
+    with ThreadPoolExecutor(max_workers=settings.KEYWORD_EXPANSION_WORKERS) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch, parent) for parent in parents
+        ]
+        results = [future.result() for future in futures]
+
+    found_texts = []
+    expanded_parent_ids = []
+    for parent, result in zip(parents, results, strict=True):
+        if result is None:
+            stats["failed"] += 1
+            continue
+
+        keyword_texts, credits_used = result
+        found_texts.extend(keyword_texts)
+        expanded_parent_ids.append(parent.id)
+        stats["processed"] += 1
+        stats["credits_used"] += credits_used
+        stats["found"] += len(keyword_texts)
+
+    created_keywords = []
+    try:
+        saved_keywords, created_keywords = save_keywords(found_texts, project)
+        stats["saved"] = len(saved_keywords)
+    except Exception as e:
+        logger.error(
+            f"{source.log_prefix} Failed to save keywords",
+            keyword_texts=found_texts,
+            error=str(e),
+            exc_info=True,
+        )
+
+    Keyword.objects.filter(id__in=expanded_parent_ids).update(**{source.processed_field: True})
+    Keyword.fetch_and_update_metrics_in_bulk(created_keywords)
+
+    logger.info(
+        f"{source.log_prefix} Completed",
+        project_id=project.id,
+        project_name=project.name,
+        **stats,
+    )
 
-    # Associate with project
-    ProjectKeyword.objects.get_or_create(project=project, keyword=keyword_obj)
+    return stats
@@ -9,22 +9,23 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import Count, Prefetch, Q
+from django.db.models import Count, Exists, OuterRef, Q
 from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
 from django.views.generic import DetailView, ListView, TemplateView, UpdateView
 from django_q.tasks import async_task
 from djstripe import models as djstripe_models
 
-from core.choices import BlogPostStatus, Language, ProfileStates
+from core.choices import BlogPostStatus, Language, ProfileStates, ProjectPageType
 from core.forms import AutoSubmissionSettingForm, ProfileUpdateForm, ProjectScanForm
 from core.models import (
     AutoSubmissionSetting,
     BlogPost,
+    BlogPostTitleSuggestion,
     GeneratedBlogPost,
-    KeywordTrend,
     Profile,
     Project,
+    ProjectPage,
 )
 from core.tasks import track_event, try_create_posthog_alias
 from tuxseo.utils import get_tuxseo_logger
@@ -246,43 +247,35 @@ class ProjectDetailView(LoginRequiredMixin, DetailView):
 
     def get_queryset(self):
         # Ensure users can only see their own projects
-        return Project.objects.filter(profile=self.request.user.profile)
+        return Project.objects.filter(profile=self.request.user.profile).annotate(
+            pricing_page_exists=Exists(
+                ProjectPage.objects.filter(project=OuterRef("pk"), type=ProjectPageType.PRICING)
+            ),
+            auto_submission_setting_exists=Exists(
+                AutoSubmissionSetting.objects.filter(project=OuterRef("pk"))
+            ),
+            suggestions_exist=Exists(
+                BlogPostTitleSuggestion.objects.filter(project=OuterRef("pk"))
+            ),
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         project = self.object
+        has_active_subscription = self.request.user.profile.has_active_subscription
 
-        context["has_content_access"] = self.request.user.profile.has_active_subscription
-        context["has_pricing_page"] = project.has_pricing_page
-
-        # Use a single query with annotation to count posted blog posts
-        all_suggestions = project.blog_post_title_suggestions.annotate(
-            posted_count=Count("generated_blog_posts", filter=Q(generated_blog_posts__posted=True))
-        ).prefetch_related("generated_blog_posts")
-
-        # Categorize suggestions based on the annotated posted_count
-        posted_suggestions = []
-        archived_suggestions = []
-        active_suggestions = []
-
-        for suggestion in all_suggestions:
-            has_posted = suggestion.posted_count > 0
+        context["has_content_access"] = has_active_subscription
+        context["has_pricing_page"] = project.pricing_page_exists
 
-            if has_posted:
-                posted_suggestions.append(suggestion)
-            elif suggestion.archived:
-                archived_suggestions.append(suggestion)
-            else:
-                active_suggestions.append(suggestion)
-
-        context["posted_suggestions"] = posted_suggestions
-        context["archived_suggestions"] = archived_suggestions
+        # Only the first page of active ideas is rendered, the posted and archived lists
+        # (and further pages) are loaded from the API when they are opened.
+        active_suggestions, next_active_suggestion_id = project.get_title_suggestions_page("active")
         context["active_suggestions"] = active_suggestions
+        context["next_active_suggestion_id"] = next_active_suggestion_id
+        context["has_suggestions"] = project.suggestions_exist
 
-        context["has_pro_subscription"] = self.request.user.profile.has_active_subscription
-        context["has_auto_submission_setting"] = AutoSubmissionSetting.objects.filter(
-            project=project
-        ).exists()
+        context["has_pro_subscription"] = has_active_subscription
+        context["has_auto_submission_setting"] = project.auto_submission_setting_exists
 
         return context
 
@@ -343,53 +336,14 @@ class ProjectKeywordsView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         project = self.object
 
-        # Get all keywords associated with this project with their metrics
-        project_keywords = (
-            project.project_keywords.select_related("keyword")
-            .prefetch_related(
-                Prefetch("keyword__trends", queryset=KeywordTrend.objects.order_by("year", "month"))
-            )
-            .order_by("-keyword__volume", "keyword__keyword_text")
+        # Rows are loaded page by page from the keywords API, only the counts are needed here
+        keyword_counts = project.project_keywords.aggregate(
+            total=Count("id"), used=Count("id", filter=Q(use=True))
         )
 
-        # Prepare keywords with trend data for the template and calculate counts
-        keywords_with_trends = []
-        total_keywords_count = 0
-        used_keywords_count = 0
-
-        for project_keyword in project_keywords:
-            keyword = project_keyword.keyword
-
-            # Get trend data for this keyword
-            trend_data = [
-                {"month": trend.month, "year": trend.year, "value": trend.value}
-                for trend in keyword.trends.all()
-            ]
-
-            # Create keyword object with all necessary data
-            keyword_data = {
-                "id": keyword.id,
-                "keyword_text": keyword.keyword_text,
-                "volume": keyword.volume,
-                "cpc_value": keyword.cpc_value,
-                "cpc_currency": keyword.cpc_currency,
-                "competition": keyword.competition,
-                "created_at": project_keyword.created_at,
-                "use": project_keyword.use,
-                "trend_data": trend_data,
-                "project_keyword_id": project_keyword.id,
-            }
-            keywords_with_trends.append(keyword_data)
-
-            # Count keywords while we're iterating
-            total_keywords_count += 1
-            if project_keyword.use:
-                used_keywords_count += 1
-
-        context["keywords"] = keywords_with_trends
-        context["total_keywords_count"] = total_keywords_count
-        context["used_keywords_count"] = used_keywords_count
-        context["available_keywords_count"] = total_keywords_count - used_keywords_count
+        context["total_keywords_count"] = keyword_counts["total"]
+        context["used_keywords_count"] = keyword_counts["used"]
+        context["available_keywords_count"] = keyword_counts["total"] - keyword_counts["used"]
 
         return context
 
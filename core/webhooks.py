@@ -23,6 +23,7 @@ def handle_created_subscription(**kwargs):
     profile.subscription = subscription
     profile.product = product
     profile.save(update_fields=["subscription", "product"])
+    profile.refresh_entitlement()
 
     profile.track_state_change(
         to_state=ProfileStates.SUBSCRIBED,
@@ -97,6 +98,7 @@ def handle_updated_subscription(**kwargs):
 
         profile.subscription = subscription
         profile.save(update_fields=["subscription"])
+        profile.refresh_entitlement()
 
     except (Customer.DoesNotExist, Subscription.DoesNotExist, Profile.DoesNotExist) as e:
         logger.error(
@@ -141,6 +143,7 @@ def handle_deleted_subscription(**kwargs):
 
         profile.subscription = None
         profile.save(update_fields=["subscription"])
+        profile.refresh_entitlement()
 
         logger.info(
             "Subscription deleted for profile.",
@@ -243,6 +246,7 @@ def handle_checkout_completed(**kwargs):
 
             if update_fields:
                 profile.save(update_fields=update_fields)
+            profile.refresh_entitlement()
 
             profile.track_state_change(
                 to_state=ProfileStates.SUBSCRIBED,
@@ -1,4 +1,4 @@
-#!/bin/sh
+#!/bin/bash
 
 # Default to server command if no arguments provided
 if [ $# -eq 0 ]; then
@@ -11,7 +11,10 @@ fi
 export PROJECT_NAME=tuxseo
 export DJANGO_SETTINGS_MODULE="${PROJECT_NAME}.settings"
 
-while getopts ":sw" option; do
+# Task queues served by a worker, see Q_CLUSTER in settings.py
+queues="interactive onboarding backfill periodic"
+
+while getopts ":swq:" option; do
     case "${option}" in
         s)  # Run server
             server=true
@@ -19,6 +22,9 @@ while getopts ":sw" option; do
         w)  # Run worker
             server=false
             ;;
+        q)  # Comma separated queues for the worker, e.g. -q interactive,periodic
+            queues=$(echo "${OPTARG}" | tr ',' ' ')
+            ;;
         *)  # Invalid option
             echo "Invalid option: -$OPTARG" >&2
             ;;
@@ -31,5 +37,27 @@ if [ "$server" = true ]; then
     python manage.py migrate
     gunicorn ${PROJECT_NAME}.wsgi:application --bind 0.0.0.0:80 --workers 3 --threads 2
 else
-    python manage.py qcluster
+    # One pool per queue, so long onboarding or backfill tasks can't hold up interactive ones
+    for queue in $queues; do
+        if [ "$queue" = "interactive" ]; then
+            python manage.py qcluster &
+        else
+            Q_CLUSTER_NAME="$queue" python manage.py qcluster &
+        fi
+    done
+    trap 'stopping=true; kill $(jobs -p) 2>/dev/null' INT TERM
+
+    # A dead pool would leave its queue unserved while the container looks healthy, so stop
+    # the others and exit non-zero to get the container restarted
+    wait -n
+    status=$?
+    if [ "$stopping" != true ]; then
+        echo "A worker pool exited with status $status, stopping the others." >&2
+        kill $(jobs -p) 2>/dev/null
+    fi
+    wait
+    if [ "$stopping" = true ]; then
+        exit 0
+    fi
+    exit $((status == 0 ? 1 : status))
 fi
@@ -1,8 +1,15 @@
 import { Controller } from "@hotwired/stimulus";
+import { showMessage } from "../utils/messages";
 
 export default class extends Controller {
-  static targets = ["list", "icon"];
-  static values = { name: String };
+  static targets = ["list", "icon", "items", "loadMore"];
+  static values = {
+    name: String,
+    // Optional: lists with a url are filled from the API, a page at a time
+    url: String,
+    afterId: Number,
+    loaded: Boolean,
+  };
 
   connect() {
     this.boundMove = this.move.bind(this);
@@ -26,15 +33,70 @@ export default class extends Controller {
         this.iconTarget.classList.add("rotate-180");
       }
     }
+
+    // Lazy lists fetch their first page the first time they are opened
+    if (this.urlValue && !this.loadedValue && !this.listTarget.classList.contains("hidden")) {
+      this.loadMore();
+    }
+  }
+
+  get container() {
+    return this.hasItemsTarget ? this.itemsTarget : this.listTarget;
+  }
+
+  async loadMore() {
+    if (this.loading) return;
+    this.loading = true;
+
+    const params = new URLSearchParams({ status: this.nameValue, after_id: this.afterIdValue });
+
+    try {
+      const response = await fetch(`${this.urlValue}?${params}`);
+      if (!response.ok) {
+        throw new Error("Failed to load suggestions");
+      }
+
+      const data = await response.json();
+      if (data.status === "error") {
+        throw new Error(data.message);
+      }
+
+      const template = document.createElement("template");
+      template.innerHTML = data.html;
+      template.content.querySelectorAll("[data-archive-suggestion-suggestion-id-value]").forEach((card) => {
+        // Skip cards that were already moved or generated into the page
+        const id = card.dataset.archiveSuggestionSuggestionIdValue;
+        if (!document.querySelector(`[data-archive-suggestion-suggestion-id-value="${id}"]`)) {
+          this.container.appendChild(card);
+        }
+      });
+
+      this.loadedValue = true;
+      this.afterIdValue = data.next_after_id || 0;
+      if (this.hasLoadMoreTarget) {
+        this.loadMoreTarget.classList.toggle("hidden", !data.next_after_id);
+      }
+
+      window.dispatchEvent(new CustomEvent("suggestions:loaded"));
+    } catch (error) {
+      showMessage(error.message || "Failed to load suggestions", "error");
+    } finally {
+      this.loading = false;
+    }
   }
 
   add(element) {
-    this.listTarget.appendChild(element);
+    this.container.appendChild(element);
   }
 
   move(event) {
     const { element, destination } = event.detail;
-    if (this.nameValue === destination) {
+    if (this.nameValue !== destination) return;
+
+    if (this.urlValue && !this.loadedValue) {
+      // The card comes back with the rest of the list once it is opened
+      element.remove();
+    } else {
       this.add(element);
     }
   }
@@ -1,4 +1,5 @@
 import { Controller } from "@hotwired/stimulus";
+import { waitForJob } from "../utils/jobs";
 
 export default class extends Controller {
     static targets = ["dialog", "url", "form", "submitButton", "spinner", "errorMessage"];
@@ -87,12 +88,17 @@ export default class extends Controller {
                 throw new Error(errorMsg);
             }
 
-            const result = await response.json();
+            let result = await response.json();
 
             if (result.status === "error") {
                 throw new Error(result.message || "Failed to analyze competitor");
             }
 
+            // The competitor is scraped and analyzed in the background
+            if (result.job_id) {
+                result = await waitForJob(result.job_id);
+            }
+
             // Handle successful response
             this.handleSuccess(result);
         } catch (error) {
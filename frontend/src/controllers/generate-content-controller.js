@@ -1,5 +1,6 @@
 import { Controller } from "@hotwired/stimulus";
 import { showMessage } from "../utils/messages";
+import { readEventStream } from "../utils/sse";
 export default class extends Controller {
   static values = {
     url: String,
@@ -63,9 +64,10 @@ export default class extends Controller {
         `;
       }
 
-      const response = await fetch(`/api/generate-blog-content/${this.suggestionIdValue}`, {
+      const response = await fetch(`/api/generate-blog-content/${this.suggestionIdValue}/stream`, {
         method: "POST",
         headers: {
+          "Accept": "text/event-stream",
           "X-CSRFToken": document.querySelector("[name=csrfmiddlewaretoken]").value
         }
       });
@@ -75,7 +77,9 @@ export default class extends Controller {
         throw new Error(error.message || "Generation failed");
       }
 
-      const data = await response.json();
+      // Errors raised before generation starts (e.g. limits) come back as plain JSON
+      const isStream = (response.headers.get("Content-Type") || "").includes("text/event-stream");
+      const data = isStream ? await this._readContentStream(response) : await response.json();
 
       // Check if the response indicates an error
       if (data.status === "error") {
@@ -134,6 +138,33 @@ export default class extends Controller {
     }
   }
 
+  async _readContentStream(response) {
+    let preview = null;
+    if (this.hasContentTarget) {
+      preview = document.createElement("pre");
+      preview.className = "overflow-y-auto p-4 max-h-96 text-sm text-gray-700 whitespace-pre-wrap bg-gray-50 rounded-md";
+      this.contentTarget.replaceChildren(preview);
+      this.dropdownTarget.classList.remove("hidden");
+    }
+
+    let result = { status: "error", message: "Generation was interrupted" };
+    await readEventStream(response, (event, data) => {
+      if (event === "content" && preview) {
+        preview.textContent += data.content;
+        preview.scrollTop = preview.scrollHeight;
+      } else if (event === "done" || event === "error") {
+        result = data;
+      }
+    });
+
+    if (preview) {
+      this.dropdownTarget.classList.add("hidden");
+      this.contentTarget.replaceChildren();
+    }
+
+    return result;
+  }
+
   _appendPostButton(container, generatedPostId) {
     container.innerHTML = '';
 
@@ -4,41 +4,90 @@ import { showMessage } from "../utils/messages";
 
 // Controller to handle rendering of D3 trend graphs for keywords
 export default class extends Controller {
-  static targets = [ "graph", "formMessage", "search", "list", "addButton", "modal", "modalInput" ];
+  static targets = [ "graph", "formMessage", "search", "list", "addButton", "modal", "modalInput", "loadMore" ];
+  static values = { url: String };
 
   connect() {
-    this.renderAllGraphs();
     // Default sort state
     this.currentSort = { column: "volume", direction: "desc" };
+    this.requestIds = {};
     this.updateColumnHeaders();
-    this.sortByCurrentState();
+    this.reloadKeywords();
   }
 
-  renderAllGraphs() {
-    this.graphTargets.forEach(graphElement => {
-      this.renderGraph(graphElement);
+  // Rows are sorted, filtered and paginated by the API, each table is one volume segment
+  reloadKeywords() {
+    this.listTargets.forEach(list => {
+      list.innerHTML = "";
+      this.fetchKeywords(list, "");
     });
   }
 
-  renderGraph(graphElement) {
-    const trendDataId = graphElement.dataset.trendDataId;
-    const trendScriptElement = document.getElementById(trendDataId);
+  loadMore(event) {
+    const segment = event.currentTarget.dataset.keywordSegment;
+    const list = this.listTargets.find(target => target.dataset.keywordSegment === segment);
+    if (list) {
+      this.fetchKeywords(list, list.dataset.cursor);
+    }
+  }
 
-    if (!trendScriptElement) {
-      graphElement.innerHTML = "<div class=\"flex items-center justify-center h-full text-xs text-gray-400\">No data</div>";
-      return;
+  async fetchKeywords(list, cursor) {
+    const segment = list.dataset.keywordSegment;
+    const params = new URLSearchParams({
+      sort: this.currentSort.column,
+      direction: this.currentSort.direction,
+      segment: segment,
+      search: this.hasSearchTarget ? this.searchTarget.value.trim() : "",
+    });
+    if (cursor) {
+      params.set("cursor", cursor);
     }
 
-    let trendDataObjects;
+    // Responses for an older sort or search are dropped
+    const requestId = (this.requestIds[segment] || 0) + 1;
+    this.requestIds[segment] = requestId;
+
     try {
-      trendDataObjects = JSON.parse(trendScriptElement.textContent);
+      const response = await fetch(`${this.urlValue}?${params}`);
+      const data = await response.json();
+      if (requestId !== this.requestIds[segment]) return;
+
+      if (data.status !== "success") {
+        showMessage(data.message || "Failed to load keywords.", "error");
+        return;
+      }
+
+      const template = document.createElement("template");
+      template.innerHTML = data.html;
+      const rows = Array.from(template.content.querySelectorAll("tr"));
+      list.append(...rows);
+      rows.forEach(row => row.querySelectorAll("[data-keyword-target='graph']").forEach(graph => this.renderGraph(graph)));
+
+      list.dataset.cursor = data.next_cursor || "";
+      const loadMoreButton = this.loadMoreTargets.find(target => target.dataset.keywordSegment === segment);
+      if (loadMoreButton) {
+        loadMoreButton.classList.toggle("hidden", !data.next_cursor);
+      }
     } catch (e) {
-      graphElement.innerHTML = "<div class=\"flex items-center justify-center h-full text-xs text-gray-400\">Error</div>";
-      console.error("Error parsing trend data JSON:", e);
-      return;
+      showMessage("An error occurred while loading keywords.", "error");
     }
+  }
+
+  renderGraph(graphElement) {
+    const values = (graphElement.dataset.trendSeries || "").split(",").filter(value => value !== "").map(Number);
+    const [startYear, startMonth] = (graphElement.dataset.trendStart || "").split("-").map(Number);
+
+    // The series holds consecutive months starting at trendStart
+    const trendDataObjects = values.map((value, index) => {
+      const date = new Date(startYear, startMonth - 1 + index, 1);
+      return {
+        month: date.toLocaleString("default", { month: "long" }),
+        year: date.getFullYear(),
+        value: value,
+      };
+    });
 
-    if (!trendDataObjects || trendDataObjects.length === 0) {
+    if (trendDataObjects.length === 0 || !startYear) {
       graphElement.innerHTML = "<div class=\"flex items-center justify-center h-full text-xs text-gray-400\">No data</div>";
       return;
     }
@@ -320,21 +369,8 @@ export default class extends Controller {
 
   filterKeywords() {
     if (!this.hasSearchTarget || !this.hasListTarget) return;
-    const searchValue = this.searchTarget.value.trim().toLowerCase();
-    const rows = this.listTarget.querySelectorAll("tr");
-    rows.forEach(row => {
-      const keywordTextElem = row.querySelector(".text-sm.font-medium");
-      if (!keywordTextElem) {
-        row.style.display = "";
-        return;
-      }
-      const keywordText = keywordTextElem.textContent.trim().toLowerCase();
-      if (keywordText.includes(searchValue)) {
-        row.style.display = "";
-      } else {
-        row.style.display = "none";
-      }
-    });
+    clearTimeout(this.searchTimeout);
+    this.searchTimeout = setTimeout(() => this.reloadKeywords(), 300);
   }
 
   sortByColumn(event) {
@@ -351,7 +387,7 @@ export default class extends Controller {
     }
 
     this.updateColumnHeaders();
-    this.sortByCurrentState();
+    this.reloadKeywords();
   }
 
     updateColumnHeaders() {
@@ -391,60 +427,6 @@ export default class extends Controller {
     });
   }
 
-  sortByCurrentState() {
-    if (!this.hasListTarget) return;
-
-    // Get all table bodies (both main table and zero volume table)
-    const tableBodies = this.element.querySelectorAll("tbody[data-keyword-target='list'], tbody.bg-white.divide-y.divide-gray-200");
-
-    tableBodies.forEach(tbody => {
-      const rows = Array.from(tbody.querySelectorAll("tr"));
-      let getSortValue;
-
-      switch (this.currentSort.column) {
-        case "keyword":
-          getSortValue = row => {
-            const keywordElem = row.querySelector(".text-sm.font-medium");
-            return keywordElem ? keywordElem.textContent.trim().toLowerCase() : "";
-          };
-          break;
-        case "volume":
-          getSortValue = row => parseInt(row.getAttribute("data-volume")) || 0;
-          break;
-        case "competition":
-          getSortValue = row => parseFloat(row.getAttribute("data-competition")) || 0;
-          break;
-        case "cpc":
-          getSortValue = row => parseFloat(row.getAttribute("data-cpc-value")) || 0;
-          break;
-        default:
-          getSortValue = row => parseInt(row.getAttribute("data-volume")) || 0;
-      }
-
-      const direction = this.currentSort.direction === "asc" ? 1 : -1;
-
-      rows.sort((a, b) => {
-        const aVal = getSortValue(a);
-        const bVal = getSortValue(b);
-
-        if (this.currentSort.column === "keyword") {
-          // String comparison for keywords
-          if (aVal < bVal) return -1 * direction;
-          if (aVal > bVal) return 1 * direction;
-          return 0;
-        } else {
-          // Numerical comparison
-          if (aVal < bVal) return -1 * direction;
-          if (aVal > bVal) return 1 * direction;
-          return 0;
-        }
-      });
-
-      // Remove all rows and re-append in sorted order
-      rows.forEach(row => tbody.appendChild(row));
-    });
-  }
-
   showModal() {
     if (this.hasModalTarget) {
       this.modalTarget.classList.remove("hidden");
@@ -488,6 +470,7 @@ export default class extends Controller {
   }
 
   disconnect() {
+    clearTimeout(this.searchTimeout);
     // Clean up escape key listener if modal is open
     if (this.escapeKeyHandler) {
       document.removeEventListener("keydown", this.escapeKeyHandler);
@@ -1,5 +1,6 @@
 import { Controller } from "@hotwired/stimulus";
 import { showMessage } from "../utils/messages";
+import { waitForJob } from "../utils/jobs";
 
 export default class extends Controller {
   static targets = ["form", "url", "submitButton"];
@@ -41,6 +42,11 @@ export default class extends Controller {
         throw new Error(data.message || "Network response was not ok");
       }
 
+      // The page is fetched and analyzed in the background
+      if (data.job_id) {
+        await waitForJob(data.job_id);
+      }
+
       // Replace form with success view and Use Agent button
       this.formTarget.innerHTML = `
         <div class="space-y-4">
@@ -1,5 +1,6 @@
 import { Controller } from "@hotwired/stimulus";
 import { showMessage } from "../utils/messages";
+import { waitForJob } from "../utils/jobs";
 
 export default class extends Controller {
   static targets = [
@@ -63,11 +64,16 @@ export default class extends Controller {
       throw new Error('Failed to scan URL');
     }
 
-    const scanData = await scanResponse.json();
+    let scanData = await scanResponse.json();
     if (scanData.status === 'error') {
       throw new Error(scanData.message);
     }
 
+    // New projects are scanned in the background, wait for the job to finish
+    if (scanData.job_id) {
+      scanData = await waitForJob(scanData.job_id);
+    }
+
     // Update UI after successful scan
     this.detailsSpinnerTarget.classList.add('hidden');
     this.detailsCheckTarget.classList.remove('hidden');
@@ -27,6 +27,14 @@ export default class extends Controller {
 
     // Filter suggestions based on initial tab
     this.filterSuggestions();
+
+    // Lazily loaded lists need the same filtering once their cards arrive
+    this.boundFilterSuggestions = this.filterSuggestions.bind(this);
+    window.addEventListener("suggestions:loaded", this.boundFilterSuggestions);
+  }
+
+  disconnect() {
+    window.removeEventListener("suggestions:loaded", this.boundFilterSuggestions);
   }
 
   switchTab(event) {
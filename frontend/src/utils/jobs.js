@@ -0,0 +1,35 @@
+// Poll a background job started by the API until it finishes or `timeout` ms have passed.
+export async function waitForJob(
+  jobId,
+  { onStage = null, interval = 1500, timeout = 5 * 60 * 1000 } = {},
+) {
+  const deadline = Date.now() + timeout;
+  let lastStage = null;
+
+  while (Date.now() < deadline) {
+    const response = await fetch(`/api/jobs/${jobId}`, {
+      headers: { 'Accept': 'application/json' },
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to get job status');
+    }
+
+    const job = await response.json();
+    if (onStage && job.stage !== lastStage) {
+      lastStage = job.stage;
+      onStage(job.stage);
+    }
+
+    if (job.status === 'success') {
+      return job.result;
+    }
+    if (job.status === 'error') {
+      throw new Error(job.message);
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, interval));
+  }
+
+  throw new Error('This is taking longer than expected. Please try again later.');
+}
@@ -0,0 +1,36 @@
+// Read a text/event-stream fetch response, calling onEvent(event, data) for each message.
+// EventSource only supports GET, so POST endpoints are consumed through fetch instead.
+export async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) {
+      break;
+    }
+
+    buffer += decoder.decode(value, { stream: true });
+    const messages = buffer.split("\n\n");
+    buffer = messages.pop();
+
+    for (const message of messages) {
+      let event = "message";
+      const dataLines = [];
+
+      for (const line of message.split("\n")) {
+        if (line.startsWith("event:")) {
+          event = line.slice(6).trim();
+        } else if (line.startsWith("data:")) {
+          dataLines.push(line.slice(5).trim());
+        }
+      }
+
+      // Comment-only messages (keep-alive pings) carry no data
+      if (dataLines.length) {
+        onEvent(event, JSON.parse(dataLines.join("\n")));
+      }
+    }
+  }
+}
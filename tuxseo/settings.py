@@ -295,11 +295,139 @@ REDIS_PASSWORD = env("REDIS_PASSWORD", default="")
 REDIS_DB = env("REDIS_DB", default="0")
 REDIS_URL = f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
+AGENT_RESULTS_CACHE_TIMEOUT = env.int("AGENT_RESULTS_CACHE_TIMEOUT", default=60 * 60 * 24 * 7)
+SCRAPE_CACHE_FRESHNESS = env.int("SCRAPE_CACHE_FRESHNESS", default=60 * 60 * 24)
+SCRAPE_CACHE_TIMEOUT = env.int("SCRAPE_CACHE_TIMEOUT", default=60 * 60 * 24 * 30)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Eviction for this cache is bounded by Redis' own maxmemory policy. Keys don't cover the
+    # agents' prompts, so bump the version whenever the prompt of a cached agent changes.
+    "agent_results": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "agent-results",
+        "TIMEOUT": AGENT_RESULTS_CACHE_TIMEOUT,
+        "VERSION": env.int("AGENT_RESULTS_CACHE_VERSION", default=1),
+    },
+    # Stale pages are kept past their freshness window so they can be revalidated
+    "scraped_pages": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "scraped-pages",
+        "TIMEOUT": SCRAPE_CACHE_TIMEOUT,
+    },
+    # Resolved subscription state per profile, refreshed on every state change
+    "entitlements": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "entitlements",
+        "TIMEOUT": 60 * 15,
+    },
+    # Per-second request budgets of rate limited upstreams, shared by all workers
+    "rate_limits": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "rate-limits",
+        "TIMEOUT": 2,
+    },
+    # Progress of background jobs, shared between web and worker processes
+    "jobs": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "jobs",
+        "TIMEOUT": 60 * 60 * 24,
+    },
+    # Dedup keys of queued or running tasks, held until the task finishes. The timeout only
+    # frees keys of tasks whose worker died.
+    "task_locks": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "task-locks",
+        "TIMEOUT": env.int("TASK_LOCK_TIMEOUT", default=60 * 60),
+    },
+}
+
+HTTP_POOL_MAXSIZE = env.int("HTTP_POOL_MAXSIZE", default=10)
+
+# Agent runs one process may have in flight on its agent event loop at once
+AGENT_MAX_IN_FLIGHT = env.int("AGENT_MAX_IN_FLIGHT", default=8)
+# Project pages a single task fetches and analyzes at the same time
+PAGE_ANALYSIS_BATCH_SIZE = env.int("PAGE_ANALYSIS_BATCH_SIZE", default=8)
+
+# Blog posts one web process streams at the same time, each one holds a request thread until it
+# finishes, so keep this below gunicorn's --threads
+BLOG_CONTENT_MAX_STREAMS = env.int("BLOG_CONTENT_MAX_STREAMS", default=1)
+
+# Parent keywords looked up at the same time when expanding a project's keywords
+KEYWORD_EXPANSION_WORKERS = env.int("KEYWORD_EXPANSION_WORKERS", default=4)
+
+# Keywords Everywhere credits the scheduled metrics refresh may spend per day
+KEYWORD_REFRESH_DAILY_CREDITS = env.int("KEYWORD_REFRESH_DAILY_CREDITS", default=1000)
+
+# Automatic posts are generated at a random time within this many hours before they're due
+AUTO_POST_PREGENERATION_HOURS = env.int("AUTO_POST_PREGENERATION_HOURS", default=12)
+
+# Keywords Everywhere lookups are POSTs billed per request, so they are only retried when the
+# API cannot have processed them: connection errors and 429s, never read errors or 5xx.
+# Blog post submissions hit user endpoints and must never be replayed.
+HTTP_CLIENTS = {
+    "default": {
+        "timeout": 30,
+        "pool_maxsize": HTTP_POOL_MAXSIZE,
+        "retries": 2,
+        "backoff_factor": 0.5,
+    },
+    "scraper": {
+        "timeout": 30,
+        "pool_connections": 50,
+        "pool_maxsize": 2,
+        "retries": 1,
+        "backoff_factor": 0.5,
+    },
+    "jina_reader": {
+        "timeout": 30,
+        "pool_maxsize": HTTP_POOL_MAXSIZE,
+        "retries": 2,
+        "backoff_factor": 1,
+        "usage_field": "data.usage.tokens",
+    },
+    "keywords_everywhere": {
+        "timeout": 30,
+        "pool_maxsize": HTTP_POOL_MAXSIZE,
+        "retries": 3,
+        "backoff_factor": 1,
+        "retry_methods": ["GET", "POST"],
+        "retry_statuses": [429],
+        "read_retries": 0,
+        "rate_limit": env.int("KEYWORDS_EVERYWHERE_REQUESTS_PER_SECOND", default=5),
+        "usage_field": "credits_consumed",
+    },
+    "buttondown": {
+        "timeout": 15,
+        "pool_maxsize": 2,
+        "retries": 2,
+        "backoff_factor": 1,
+    },
+    "blog_post_submission": {
+        "timeout": 15,
+        "pool_connections": 50,
+        "pool_maxsize": 2,
+        "retries": 0,
+    },
+}
+
+# The default cluster is the interactive queue (scans, event tracking, anything a user waits
+# on). ALT_CLUSTERS are the other queues, each served by its own pool of workers
+# (`deployment/entrypoint.sh -w -q <queue>`), so a burst in one of them can't delay the rest.
+# Scheduled tasks should target the "periodic" cluster.
 Q_CLUSTER = {
     "name": "tuxseo-q",
     "timeout": 90,
     "retry": 120,
-    "workers": 4,
+    "workers": env.int("Q_INTERACTIVE_WORKERS", default=4),
     "max_attempts": 2,
     "redis": REDIS_URL,
     "error_reporter": {
@@ -307,8 +435,32 @@ Q_CLUSTER = {
             "dsn": SENTRY_DSN,
         },
     },
+    "ALT_CLUSTERS": {
+        "onboarding": {
+            "workers": env.int("Q_ONBOARDING_WORKERS", default=4),
+            "timeout": 180,
+            "retry": 240,
+        },
+        "backfill": {"workers": env.int("Q_BACKFILL_WORKERS", default=1)},
+        "periodic": {"workers": env.int("Q_PERIODIC_WORKERS", default=2)},
+    },
 }
 
+# Tasks of one project's workflow (e.g. onboarding) that may be queued or running at once,
+# for free and paying profiles. It is also each profile's weight when the onboarding queue
+# is shared out.
+WORKFLOW_MAX_CONCURRENCY = env.int("WORKFLOW_MAX_CONCURRENCY", default=2)
+WORKFLOW_MAX_CONCURRENCY_SUBSCRIBED = env.int("WORKFLOW_MAX_CONCURRENCY_SUBSCRIBED", default=4)
+# Workflow tasks queued or running at once across all projects. Keeping it at the number of
+# onboarding workers leaves the queue empty, so whoever is next in line gets the next worker.
+WORKFLOW_QUEUE_CAPACITY = env.int(
+    "WORKFLOW_QUEUE_CAPACITY", default=Q_CLUSTER["ALT_CLUSTERS"]["onboarding"]["workers"]
+)
+# A workflow task still unfinished after its timeout plus the grace period is presumed lost,
+# e.g. with its worker, and failed so it stops holding a place in the queue.
+WORKFLOW_NODE_DEFAULT_TIMEOUT = Q_CLUSTER["ALT_CLUSTERS"]["onboarding"]["timeout"]
+WORKFLOW_NODE_LEASE_GRACE_SECONDS = env.int("WORKFLOW_NODE_LEASE_GRACE_SECONDS", default=300)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -415,4 +567,10 @@ JINA_READER_API_KEY = env("JINA_READER_API_KEY")
 GEMINI_API_KEY = env("GEMINI_API_KEY")
 PERPLEXITY_API_KEY = env("PERPLEXITY_API_KEY")
 
+# USD per million request (input) and response (output) tokens, used to price agent runs
+AGENT_MODEL_PRICES = {
+    "gemini-2.5-flash": {"input": "0.30", "output": "2.50"},
+    "sonar": {"input": "1.00", "output": "1.00"},
+}
+
 KEYWORDS_EVERYWHERE_API_KEY = env("KEYWORDS_EVERYWHERE_API_KEY")